@@ -0,0 +1,209 @@
+"""
+Batch ingestion of multi-page PDFs and ZIP archives of receipts.
+
+An upload is expanded lazily into page tasks (one per PDF page or archive
+image) which are classified and parsed in the shared OCR worker pool. PDF
+pages are rasterised inside the workers, so rendering is parallel too; each
+PDF is spooled to disk once and tasks carry only its path, never its bytes. At
+most a few tasks per worker are in flight at a time, keeping memory flat for
+long documents while the wall time scales with the number of cores.
+"""
+import os
+import tempfile
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Union
+
+from .digital_text import TEXT_EXTENSIONS, HTML_EXTENSIONS, EMAIL_EXTENSIONS, extract_text, has_text_layer
+from .ingest import SpooledUpload, UPLOAD_SPOOL_DIR
+from .parsers import document_parser
+from .pdf_document import PDF_RENDER_DPI, PdfPages, is_pdf, page_count
+
+BATCH_MAX_PAGES = int(os.environ.get('BATCH_MAX_PAGES', 200))
+BATCH_MAX_MEMBER_BYTES = int(os.environ.get('BATCH_MAX_MEMBER_BYTES', 25 * 1024 * 1024))
+
+# Page tasks submitted ahead of the results per worker
+BATCH_TASKS_PER_WORKER = 2
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp'}
+DOCUMENT_EXTENSIONS = IMAGE_EXTENSIONS | TEXT_EXTENSIONS | HTML_EXTENSIONS | EMAIL_EXTENSIONS
+ZIP_MAGIC = b'PK\x03\x04'
+
+
+class BatchError(Exception):
+    """Raised for uploads that cannot be expanded into pages."""
+    pass
+
+
+@dataclass
+class PageTask:
+    """One page to parse: an image upload or a page of a PDF."""
+    document: str
+    page: int
+    source: Union[SpooledUpload, str]  # image upload, or path of the spooled PDF
+    pdf_sha256: str = ''
+
+    @property
+    def is_pdf_page(self) -> bool:
+        return bool(self.pdf_sha256)
+
+
+def iter_page_tasks(upload: SpooledUpload, name: str, spool_dir: str) -> Iterator[PageTask]:
+    """
+    Expand an upload into page tasks without decoding any page.
+
+    PDFs without a path of their own (uploads read from the request, archive
+    members) are written to ``spool_dir``, which must outlive the tasks.
+    """
+    with upload.open() as f:
+        head = f.read(len(ZIP_MAGIC))
+
+    if is_pdf(head):
+        tasks = _pdf_tasks(name, upload, spool_dir)
+    elif head.startswith(ZIP_MAGIC):
+        tasks = _archive_tasks(upload, spool_dir)
+    else:
+        tasks = iter([PageTask(name, 1, upload)])
+
+    for count, task in enumerate(tasks, 1):
+        if count > BATCH_MAX_PAGES:
+            raise BatchError(f"Batch has more than {BATCH_MAX_PAGES} pages")
+        yield task
+
+
+def parse_page(task: PageTask) -> Dict[str, Any]:
+    """
+    Classify and parse one page; runs in an OCR pool worker.
+
+    Pages with embedded text (generated PDFs, HTML or text receipts) are
+    parsed from that text and never rasterised.
+    """
+    from .document_image import DocumentImage
+
+    if task.is_pdf_page:
+        with PdfPages(task.source) as pdf:
+            text = pdf.text(task.page - 1)
+            image = None if has_text_layer(text) else pdf.render(task.page - 1)
+        if image is None:
+            return document_parser.parse_text(text)
+        document = DocumentImage.from_image(image, f"{task.pdf_sha256}:{task.page}:{PDF_RENDER_DPI}")
+    else:
+        text = extract_text(task.source, task.document)
+        if text is not None:
+            return document_parser.parse_text(text)
+        document = DocumentImage(task.source)
+    return document_parser.parse_document(document)
+
+
+def parse_batch(upload: SpooledUpload, name: str) -> List[Dict[str, Any]]:
+    """
+    Parse every page of a batch upload and merge the results per document.
+
+    Returns one dict per document (a PDF, an archive member or the single
+    image) with its name, page count, document type and items.
+    """
+    from .ocr_backend import OCR_MAX_WORKERS, get_worker_pool, reset_worker_pool, in_worker
+
+    pages: Dict[str, List] = OrderedDict()
+
+    with tempfile.TemporaryDirectory(prefix='batch-', dir=UPLOAD_SPOOL_DIR) as spool_dir:
+        tasks = iter_page_tasks(upload, name, spool_dir)
+
+        if in_worker():
+            for task in tasks:
+                _collect(pages, task, parse_page, task)
+            return [merge_pages(document, results) for document, results in pages.items() if results]
+
+        pool = get_worker_pool()
+        window = OCR_MAX_WORKERS * BATCH_TASKS_PER_WORKER
+        futures = {}
+        try:
+            for task in tasks:
+                pages.setdefault(task.document, [])
+                if len(futures) >= window:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _collect(pages, futures.pop(future), future.result)
+                futures[pool.submit(parse_page, task)] = task
+
+            for future in wait(futures).done:
+                _collect(pages, futures[future], future.result)
+        except BrokenProcessPool:
+            reset_worker_pool()
+            raise
+
+    return [merge_pages(document, results) for document, results in pages.items() if results]
+
+
+def merge_pages(document: str, results: List) -> Dict[str, Any]:
+    """
+    Merge per-page parse results into one document.
+
+    Items are kept in page order. The document type is the one whose pages
+    produced the most items, falling back to the first page's type.
+    """
+    results = [result for _, result in sorted(results, key=lambda r: r[0])]
+    items = []
+    item_counts: Dict[str, int] = {}
+    for result in results:
+        items.extend(result['items'])
+        item_counts[result['document_type']] = item_counts.get(result['document_type'], 0) + len(result['items'])
+
+    document_type = 'grocery'
+    if results:
+        document_type = results[0]['document_type']
+        if any(item_counts.values()):
+            document_type = max(item_counts, key=item_counts.get)
+
+    return {
+        'name': document,
+        'pages': len(results),
+        'document_type': document_type,
+        'items': items,
+    }
+
+
+def _collect(pages: Dict[str, List], task: PageTask, func, *args) -> None:
+    try:
+        result = func(*args)
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        print(f"Batch page {task.document}#{task.page} failed: {e}")
+        return
+    pages.setdefault(task.document, []).append((task.page, result))
+
+
+def _pdf_tasks(name: str, upload: SpooledUpload, spool_dir: str) -> Iterator[PageTask]:
+    path = upload.path
+    if path is None:
+        path = os.path.join(spool_dir, f'{upload.sha256}.pdf')
+        upload.move_to(path)
+    for index in range(page_count(path)):
+        yield PageTask(name, index + 1, path, upload.sha256)
+
+
+def _archive_tasks(upload: SpooledUpload, spool_dir: str) -> Iterator[PageTask]:
+    try:
+        archive = zipfile.ZipFile(upload.open())
+    except zipfile.BadZipFile as e:
+        raise BatchError(f"Invalid archive: {e}")
+
+    with archive:
+        for info in sorted(archive.infolist(), key=lambda i: i.filename):
+            basename = os.path.basename(info.filename)
+            if info.is_dir() or not basename or basename.startswith('.') or info.filename.startswith('__MACOSX/'):
+                continue
+            if info.file_size > BATCH_MAX_MEMBER_BYTES:
+                print(f"Skipping archive member {info.filename}: {info.file_size} bytes")
+                continue
+
+            data = archive.read(info)
+            member = SpooledUpload(data=data)
+            if is_pdf(data):
+                yield from _pdf_tasks(info.filename, member, spool_dir)
+            elif os.path.splitext(basename)[1].lower() in DOCUMENT_EXTENSIONS:
+                yield PageTask(info.filename, 1, member)
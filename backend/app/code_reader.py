@@ -0,0 +1,210 @@
+"""
+QR-code and barcode fast path.
+
+Some receipts carry a QR code encoding their line items, and photos of
+packaged goods show EAN/UPC barcodes. Both are decoded with OpenCV's
+detectors before any OCR. Barcodes (and payload items that name one) are
+resolved by exact lookup in a local product table, which also supplies the
+emission factor, so neither tesseract nor the fuzzy matcher runs for them.
+Only QR payloads shaped like a receipt (see ``parse_payload``) and barcodes
+of known products skip OCR; other codes on a document, such as loyalty or
+link QR codes, are ignored.
+
+The stage is off unless OCR_READ_CODES=1: the shipped product table has only
+its header row, so enable it once PRODUCT_CODES_PATH points at real data.
+"""
+import csv
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Decode QR codes and barcodes before running OCR
+OCR_READ_CODES = os.environ.get('OCR_READ_CODES', '0') == '1'
+
+# Product table: code,name,qty,unit,category,co2_per_unit
+PRODUCT_CODES_PATH = os.environ.get('PRODUCT_CODES_PATH', os.path.join(BASE_DIR, 'dataset', 'product_codes.csv'))
+
+# Longest side searched for codes; detection cost grows with the pixel count
+CODE_DETECTION_SIDE = 1600
+
+
+@dataclass
+class DecodedCode:
+    kind: str       # 'qr' or 'barcode'
+    symbology: str  # e.g. 'QRCODE', 'EAN_13'
+    data: str
+
+
+class ProductCodeTable:
+    """EAN/UPC product table loaded on first lookup."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._products = None
+
+    def lookup(self, code: str) -> Optional[Dict[str, Any]]:
+        if self._products is None:
+            self._products = self._load()
+        return self._products.get(normalize_code(code))
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        products = {}
+        if not os.path.exists(self.path):
+            return products
+        try:
+            with open(self.path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    try:
+                        products[normalize_code(row['code'])] = {
+                            'name': row['name'],
+                            'qty': float(row.get('qty') or 1),
+                            'unit': row.get('unit') or 'item',
+                            'category': row.get('category') or 'food',
+                            'co2_per_unit': float(row['co2_per_unit']),
+                        }
+                    except (KeyError, ValueError) as e:
+                        print(f"Skipping product code row {row}: {e}")
+        except OSError as e:
+            print(f"Could not load product codes from {self.path}: {e}")
+        return products
+
+
+def normalize_code(code: str) -> str:
+    """Digits only, with UPC-A widened to its EAN-13 form."""
+    digits = ''.join(ch for ch in str(code) if ch.isdigit())
+    return digits.zfill(13) if len(digits) == 12 else digits
+
+
+def read_codes(gray: np.ndarray) -> List[DecodedCode]:
+    """Decode every QR code and linear barcode in a grayscale image."""
+    codes = []
+
+    scale = CODE_DETECTION_SIDE / max(gray.shape[:2])
+    if scale < 1:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    try:
+        found, payloads, _, _ = cv2.QRCodeDetector().detectAndDecodeMulti(gray)
+        if found:
+            codes.extend(DecodedCode('qr', 'QRCODE', data) for data in payloads if data)
+    except cv2.error as e:
+        print(f"QR code detection failed: {e}")
+
+    try:
+        found, payloads, symbologies, _ = cv2.barcode.BarcodeDetector().detectAndDecodeWithType(gray)
+        if found:
+            codes.extend(DecodedCode('barcode', symbology, data)
+                         for data, symbology in zip(payloads, symbologies) if data)
+    except cv2.error as e:
+        print(f"Barcode detection failed: {e}")
+
+    return codes
+
+
+def items_from_codes(codes: List[DecodedCode], table: ProductCodeTable) -> List[Dict[str, Any]]:
+    """
+    Turn decoded codes into parser items.
+
+    Items resolved through the product table carry ``matched_name`` and
+    ``co2_per_unit`` and skip fuzzy matching; QR payload items without a
+    known code keep only what the payload states and are matched as usual.
+    Repeated barcodes add up.
+    """
+    items: Dict[str, Dict[str, Any]] = {}
+
+    for code in codes:
+        if code.kind == 'barcode':
+            entries = [{'code': code.data, 'qty': 1}]
+        else:
+            entries = parse_payload(code.data)
+
+        for entry in entries:
+            product = table.lookup(entry['code']) if entry.get('code') else None
+            if product is not None:
+                key = normalize_code(entry['code'])
+                count = entry.get('qty', 1)
+                if key in items:
+                    items[key]['qty'] += product['qty'] * count
+                    continue
+                items[key] = {
+                    'name': product['name'],
+                    'matched_name': product['name'],
+                    'match_score': 100,
+                    'qty': product['qty'] * count,
+                    'unit': product['unit'],
+                    'category': product['category'],
+                    'co2_per_unit': product['co2_per_unit'],
+                    'price': entry.get('price', 0),
+                    'source': code.kind,
+                }
+            elif entry.get('name'):
+                items[f"{code.kind}:{len(items)}"] = {
+                    'name': entry['name'],
+                    'qty': entry.get('qty', 1),
+                    'unit': entry.get('unit', 'item'),
+                    'category': entry.get('category', 'food'),
+                    'price': entry.get('price', 0),
+                    'source': code.kind,
+                }
+
+    return list(items.values())
+
+
+def parse_payload(data: str) -> List[Dict[str, Any]]:
+    """
+    Line items from a structured receipt QR payload.
+
+    Accepts a JSON list of items or an object with an ``items`` list; each
+    item may give name, qty, unit, category, price and an EAN (``ean`` or
+    ``code``). The payload only counts as a receipt when every item has an
+    EAN, or a name and a price: loyalty cards, links and other payloads
+    yield no items, so the document is OCR'd as usual.
+    """
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return []
+
+    if isinstance(payload, dict):
+        payload = payload.get('items', [])
+    if not isinstance(payload, list):
+        return []
+
+    entries = []
+    for raw in payload:
+        if not isinstance(raw, dict):
+            return []
+        name = str(raw.get('name') or '').strip()
+        code = str(raw.get('ean') or raw.get('code') or '')
+        if not code and not (name and raw.get('price') is not None):
+            return []
+        try:
+            entries.append({
+                'name': name,
+                'code': code,
+                'qty': float(raw.get('qty', 1) or 1),
+                'unit': raw.get('unit') or 'item',
+                'category': raw.get('category') or 'food',
+                'price': float(raw.get('price', 0) or 0),
+            })
+        except (TypeError, ValueError):
+            return []
+    return entries
+
+
+def document_code_items(document) -> List[Dict[str, Any]]:
+    """Items from the codes visible in a DocumentImage, or [] to fall back to OCR."""
+    if not OCR_READ_CODES:
+        return []
+    codes = read_codes(document.gray)
+    return items_from_codes(codes, product_codes) if codes else []
+
+
+# Global product table
+product_codes = ProductCodeTable(PRODUCT_CODES_PATH)
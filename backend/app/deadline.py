@@ -0,0 +1,64 @@
+"""
+Per-request OCR deadline.
+
+An upload's Deadline travels with its DocumentImage through classification
+and parsing, and every tesseract call is given the time that is left as its
+timeout. Stages that could not start or did not finish in time are recorded
+instead of failing the request, so callers return the best partial result
+together with the list of skipped stages.
+"""
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Seconds an upload may spend in OCR, including time queued for a worker (0 disables)
+OCR_DEADLINE_SECONDS = float(os.environ.get('OCR_DEADLINE_SECONDS', 0))
+
+# Stages are not started with less time than this left
+MIN_STAGE_SECONDS = 0.05
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a tesseract call is stopped by its timeout."""
+    pass
+
+
+class Deadline:
+    """Time budget of one request; ``seconds`` of None or 0 means unlimited."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds or None
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds if seconds else None
+        self.skipped: List[str] = []
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining < MIN_STAGE_SECONDS
+
+    def timeout(self) -> float:
+        """Timeout for the next tesseract call; 0 means none, as in pytesseract."""
+        remaining = self.remaining()
+        return 0 if remaining is None else max(remaining, MIN_STAGE_SECONDS)
+
+    def skip(self, stage: str) -> None:
+        """Record a stage that was skipped or cut short."""
+        if stage not in self.skipped:
+            self.skipped.append(stage)
+
+    def metadata(self) -> Optional[Dict[str, Any]]:
+        """Summary for the response, or None when no limit was set."""
+        if self.seconds is None:
+            return None
+        return {
+            'deadline_seconds': self.seconds,
+            'elapsed_seconds': round(time.monotonic() - self.started_at, 3),
+            'deadline_exceeded': bool(self.skipped),
+            'skipped_stages': list(self.skipped),
+        }
@@ -0,0 +1,169 @@
+"""
+Text extraction for documents that are born digital.
+
+Generated PDFs, HTML e-receipts, e-mails and plain-text exports already carry
+their text, so it is read directly and handed to the text parsers; nothing
+is rasterised or sent to tesseract. ``extract_text`` returns None for images
+and scanned PDFs, which take the OCR path instead.
+"""
+import codecs
+import email
+import email.policy
+import os
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Union
+
+from .ingest import SpooledUpload
+from .pdf_document import PdfUnavailable, is_pdf, page_texts
+
+# A PDF page with fewer visible characters than this has no usable text layer
+DIGITAL_TEXT_MIN_CHARS = int(os.environ.get('DIGITAL_TEXT_MIN_CHARS', 20))
+
+# Bytes inspected to tell text from binary uploads
+SNIFF_BYTES = 1024
+
+TEXT_EXTENSIONS = {'.txt', '.text', '.csv'}
+HTML_EXTENSIONS = {'.html', '.htm'}
+EMAIL_EXTENSIONS = {'.eml'}
+
+_HTML_START_RE = re.compile(r'^\s*(?:<!doctype\s+html|<html|<head|<body|<table|<div)', re.IGNORECASE)
+_EMAIL_HEADER_RE = re.compile(r'^(?:from|to|subject|date|received|return-path|mime-version|message-id):', re.IGNORECASE)
+_SPACES_RE = re.compile(r'[ \t\r\f\v\xa0]+')
+
+
+class _HtmlText(HTMLParser):
+    """Collects the visible text of an HTML document, one block per line."""
+
+    BLOCK_TAGS = {'br', 'p', 'div', 'tr', 'li', 'table', 'tbody', 'thead', 'section', 'article',
+                  'header', 'footer', 'title', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+    CELL_TAGS = {'td', 'th'}
+    SKIP_TAGS = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+        elif tag in self.CELL_TAGS:
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def extract_text(upload: Union[SpooledUpload, bytes, str], filename: Optional[str] = None,
+                 content_type: Optional[str] = None) -> Optional[str]:
+    """
+    Return the embedded text of a digital document, or None if it needs OCR.
+
+    The kind of document is taken from the content, falling back to the
+    file extension and content type where the bytes are ambiguous.
+    """
+    upload = SpooledUpload.coerce(upload)
+    with upload.open() as f:
+        head = f.read(SNIFF_BYTES)
+
+    if is_pdf(head):
+        try:
+            return pdf_text(upload.path or upload.read())
+        except PdfUnavailable:
+            return None
+
+    # Uploads declared as text may use a legacy encoding
+    declared = _is_declared_text(filename, content_type)
+    head_text = _decode(head, final=len(head) < SNIFF_BYTES, fallback=declared)
+    if head_text is None:
+        return None
+
+    kind = _detect(head_text, filename, content_type)
+    text = _decode(upload.read(), fallback=declared)
+    if text is None:
+        return None
+    if kind == 'email':
+        return email_text(text)
+    if kind == 'html':
+        return html_to_text(text)
+    return _tidy(text)
+
+
+def pdf_text(source: Union[str, bytes]) -> Optional[str]:
+    """
+    Text layer of a PDF, or None when no page has one.
+
+    Pages without enough text (blank pages, a logo or a scanned insert)
+    are skipped rather than sending the whole document to OCR.
+    """
+    texts = [text for text in page_texts(source) if has_text_layer(text)]
+    if not texts:
+        return None
+    return '\n'.join(_tidy(text) for text in texts)
+
+
+def has_text_layer(text: str) -> bool:
+    return len(''.join(text.split())) >= DIGITAL_TEXT_MIN_CHARS
+
+
+def html_to_text(html: str) -> str:
+    parser = _HtmlText()
+    parser.feed(html)
+    parser.close()
+    return _tidy(''.join(parser.parts))
+
+
+def email_text(raw: str) -> str:
+    """Subject and body of an e-mail, preferring the plain-text part."""
+    message = email.message_from_string(raw, policy=email.policy.default)
+    body = message.get_body(preferencelist=('plain', 'html'))
+    text = ''
+    if body is not None:
+        text = body.get_content()
+        if body.get_content_type() == 'text/html':
+            text = html_to_text(text)
+    subject = message.get('subject', '')
+    return _tidy(f"{subject}\n{text}" if subject else text)
+
+
+def _detect(head: str, filename: Optional[str], content_type: Optional[str]) -> str:
+    extension = os.path.splitext(filename or '')[1].lower()
+    content_type = (content_type or '').split(';')[0].strip().lower()
+
+    if content_type == 'message/rfc822' or extension in EMAIL_EXTENSIONS or _EMAIL_HEADER_RE.match(head):
+        return 'email'
+    if content_type == 'text/html' or extension in HTML_EXTENSIONS or _HTML_START_RE.match(head):
+        return 'html'
+    return 'text'
+
+
+def _is_declared_text(filename: Optional[str], content_type: Optional[str]) -> bool:
+    extension = os.path.splitext(filename or '')[1].lower()
+    return (extension in TEXT_EXTENSIONS | HTML_EXTENSIONS | EMAIL_EXTENSIONS
+            or (content_type or '').startswith(('text/', 'message/')))
+
+
+def _decode(data: bytes, final: bool = True, fallback: bool = False) -> Optional[str]:
+    """Decode UTF-8 text, or None for binary data such as images."""
+    if b'\x00' in data:
+        return None
+    try:
+        # A chunk may end inside a multi-byte character
+        return codecs.getincrementaldecoder('utf-8-sig')().decode(data, final=final)
+    except UnicodeDecodeError:
+        return data.decode('cp1252', errors='replace') if fallback else None
+
+
+def _tidy(text: str) -> str:
+    lines = (_SPACES_RE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
@@ -1,8 +1,20 @@
-import pytesseract
-from PIL import Image
+import json
+import os
 import re
-import io
+from dataclasses import dataclass
 from enum import Enum
+from typing import Any, Dict, List, Tuple, Union
+
+from . import document_model
+
+# Keyword lists per document type, editable without code changes
+DOCUMENT_KEYWORDS_PATH = os.environ.get(
+    'DOCUMENT_KEYWORDS_PATH', os.path.join(os.path.dirname(__file__), 'data', 'document_keywords.json'))
+
+_CURRENCY_RE = re.compile(r'\$\d+\.?\d{0,2}|£\d+\.?\d{0,2}|€\d+\.?\d{0,2}')
+
+# One match per line containing a digit
+_DIGIT_LINE_RE = re.compile(r'^[^\n\d]*\d', re.MULTILINE)
 
 class DocumentType(Enum):
     GROCERY = "grocery"
@@ -12,105 +24,203 @@ class DocumentType(Enum):
     TRANSPORT = "transport"
     OTHER = "other"
 
-def preprocess_for_classification(image_bytes: bytes) -> str:
-    """Extract text from image for document classification."""
-    img = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+def preprocess_for_classification(image) -> str:
+    """Extract text from image for document classification.
+
+    Reads the document's shared OCR pass, which the parsers reuse afterwards.
+    """
+    from .document_image import DocumentImage
+
+    return DocumentImage.coerce(image).ocr().text.lower()
+
+@dataclass
+class DocumentScores:
+    """Keyword scores of every document type for one text."""
+    scores: Dict[str, int]  # type name -> points, in keyword file order
+    document_type: str      # winning type name
+    margin: int             # points between the winner and the runner-up
+
+    @property
+    def confidence(self) -> float:
+        """Share of the winner's points not matched by the runner-up (0.0 - 1.0)."""
+        top = self.scores.get(self.document_type, 0)
+        return self.margin / top if top else 0.0
+
+def _trie_pattern(words: List[str]) -> str:
+    """Regex matching the longest of ``words`` at a position, with shared prefixes factored out."""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional group: a longer keyword wins over one ending here
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+class KeywordScorer:
+    """
+    Scores all document types in one pass over the text.
+
+    Every keyword from the keyword file is compiled into a single regex
+    (a trie of the keywords, so a position is rejected on its first
+    character) inside a lookahead so that a match is tried at every
+    position of the text. The longest keyword starting at a
+    position contains every shorter one starting there, so each match also
+    credits the keywords it contains ("implied" keywords). The set of
+    keywords found is therefore exactly the set a substring test per
+    keyword would find, and the scores match the previous classifier.
+    """
 
-    # Use simpler preprocessing for classification
-    custom_config = r'--oem 3 --psm 6'
-    text = pytesseract.image_to_string(img, config=custom_config, lang='eng')
-    return text.lower()
+    def __init__(self, config: Dict[str, Any]):
+        self.types: List[str] = list(config['types'])
+        self.boost = config.get('structure_boost', {})
+        self.fallback = config.get('fallback', {})
+
+        # keyword -> points it gives each type (a keyword may be listed twice)
+        self.weights: Dict[str, List[int]] = {}
+        for index, name in enumerate(self.types):
+            for keyword in config['types'][name]:
+                weights = self.weights.setdefault(keyword.lower(), [0] * len(self.types))
+                weights[index] += 1
+
+        # Only the types a keyword gives points to, as (type index, points)
+        self.points: Dict[str, List[Tuple[int, int]]] = {
+            keyword: [(index, points) for index, points in enumerate(weights) if points]
+            for keyword, weights in self.weights.items()
+        }
+
+        keywords = sorted(self.weights, key=len, reverse=True)
+        self.implied: Dict[str, List[str]] = {
+            keyword: [other for other in keywords if other in keyword] for keyword in keywords
+        }
+        self.pattern = re.compile(f'(?=({_trie_pattern(keywords)}))')
+
+    @classmethod
+    def from_file(cls, path: str) -> 'KeywordScorer':
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def score(self, text: str) -> DocumentScores:
+        """Score a lowercased text; see classify_document for the rules."""
+        found = set()
+        for keyword in set(self.pattern.findall(text)):
+            found.update(self.implied[keyword])
+
+        scores = [0] * len(self.types)
+        for keyword in found:
+            for index, points in self.points[keyword]:
+                scores[index] += points
+
+        has_currency = _CURRENCY_RE.search(text) is not None
+        price_lines = len(_DIGIT_LINE_RE.findall(text))
+
+        # Boost scores based on structural patterns
+        if has_currency and price_lines > self.boost.get('min_price_lines', 3):
+            for name in self.boost.get('types', []):
+                index = self.types.index(name)
+                if scores[index] > 0:
+                    scores[index] += self.boost.get('points', 2)
+                    break
+
+        by_type = dict(zip(self.types, scores))
+        ranked = sorted(scores, reverse=True)
+        margin = ranked[0] - ranked[1] if len(ranked) > 1 else ranked[0]
+
+        # If no clear winner and we have typical receipt patterns, default to the fallback type
+        if ranked[0] == 0 and self.fallback and (
+                has_currency or price_lines > self.fallback.get('min_price_lines', 2)):
+            return DocumentScores(by_type, self.fallback['type'], 0)
+
+        # Ties go to the type listed first
+        return DocumentScores(by_type, max(by_type, key=by_type.get), margin)
+
+_scorer = None
+
+def get_keyword_scorer() -> KeywordScorer:
+    """The scorer for DOCUMENT_KEYWORDS_PATH, compiled on first use."""
+    global _scorer
+    if _scorer is None:
+        _scorer = KeywordScorer.from_file(DOCUMENT_KEYWORDS_PATH)
+    return _scorer
+
+def score_document(text: str) -> DocumentScores:
+    """Keyword scores of every document type with the winner and its margin."""
+    return get_keyword_scorer().score(text)
+
+def _document_type(name: str) -> DocumentType:
+    try:
+        return DocumentType(name)
+    except ValueError:
+        return DocumentType.OTHER
+
+def as_document_type(name: str) -> Union[DocumentType, str]:
+    """The DocumentType named ``name``, or the name itself for types added by parser plugins."""
+    try:
+        return DocumentType(name)
+    except ValueError:
+        return name
 
 def classify_document(text: str) -> DocumentType:
     """
     Classify document type based on extracted text patterns.
 
     This classifier uses keyword matching and pattern recognition to identify
-    different types of carbon footprint documents.
+    different types of carbon footprint documents. Each type scores a point
+    per keyword (from app/data/document_keywords.json) found in the text;
+    receipts with a currency amount and several lines containing digits
+    boost the first of utility, restaurant and grocery that scored. Types
+    in the keyword file without a DocumentType are reported as OTHER.
     """
+    return _document_type(score_document(text).document_type)
 
-    # Grocery receipt patterns
-    grocery_keywords = [
-        'grocery', 'supermarket', 'groceries', 'produce', 'dairy', 'bakery',
-        'meat', 'vegetables', 'fruit', 'milk', 'bread', 'eggs', 'cheese',
-        'kg', 'lb', 'lbs', 'grams', 'litre', 'liter', 'ml', 'pack', 'packet'
-    ]
-
-    # Restaurant receipt patterns
-    restaurant_keywords = [
-        'restaurant', 'cafe', 'diner', 'bistro', 'table', 'seat', 'server',
-        'tip', 'gratuity', 'service', 'dining', 'menu', 'dish', 'course',
-        'appetizer', 'entree', 'dessert', 'beverage', 'drink'
-    ]
-
-    # Utility bill patterns
-    utility_keywords = [
-        'electric', 'electricity', 'power', 'energy', 'gas', 'water', 'utility',
-        'bill', 'invoice', 'statement', 'account', 'meter', 'reading', 'usage',
-        'kwh', 'kw-h', 'therms', 'cubic', 'meter', 'gallon', 'consumption',
-        'utility company', 'electric company', 'power company'
-    ]
-
-    # Invoice patterns
-    invoice_keywords = [
-        'invoice', 'bill', 'statement', 'payment', 'due', 'amount', 'total',
-        'tax', 'vat', 'shipping', 'handling', 'discount', 'subtotal',
-        'item', 'description', 'quantity', 'unit price', 'line total'
-    ]
-
-    # Transport patterns
-    transport_keywords = [
-        'transport', 'travel', 'flight', 'train', 'bus', 'taxi', 'uber', 'lyft',
-        'ticket', 'boarding', 'passenger', 'trip', 'journey', 'distance',
-        'fuel', 'gasoline', 'diesel', 'electric vehicle', 'charging'
-    ]
-
-    # Count keyword matches for each category
-    grocery_score = sum(1 for keyword in grocery_keywords if keyword in text)
-    restaurant_score = sum(1 for keyword in restaurant_keywords if keyword in text)
-    utility_score = sum(1 for keyword in utility_keywords if keyword in text)
-    invoice_score = sum(1 for keyword in invoice_keywords if keyword in text)
-    transport_score = sum(1 for keyword in transport_keywords if keyword in text)
-
-    # Additional pattern matching for better accuracy
-
-    # Check for currency patterns (common in receipts)
-    currency_patterns = re.findall(r'\$\d+\.?\d{0,2}|£\d+\.?\d{0,2}|€\d+\.?\d{0,2}', text)
-    has_currency = len(currency_patterns) > 0
-
-    # Check for date patterns
-    date_patterns = re.findall(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', text)
-    has_dates = len(date_patterns) > 0
-
-    # Check for typical receipt structure (multiple items with prices)
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    price_lines = sum(1 for line in lines if re.search(r'\d+\.?\d{0,2}', line))
-
-    # Boost scores based on structural patterns
-    if has_currency and price_lines > 3:
-        if utility_score > 0:
-            utility_score += 2
-        elif restaurant_score > 0:
-            restaurant_score += 2
-        elif grocery_score > 0:
-            grocery_score += 2
-
-    # Determine document type based on highest score
-    scores = {
-        DocumentType.GROCERY: grocery_score,
-        DocumentType.RESTAURANT: restaurant_score,
-        DocumentType.UTILITY: utility_score,
-        DocumentType.INVOICE: invoice_score,
-        DocumentType.TRANSPORT: transport_score
-    }
-
-    # If no clear winner and we have typical receipt patterns, default to grocery
-    if max(scores.values()) == 0 and (has_currency or price_lines > 2):
-        return DocumentType.GROCERY
-
-    return max(scores, key=scores.get)
-
-def classify_document_from_image(image_bytes: bytes) -> DocumentType:
-    """Classify document directly from image bytes."""
-    text = preprocess_for_classification(image_bytes)
-    return classify_document(text)
+def predict_type_name(text: str) -> str:
+    """
+    Name of the document type, from the trained model (see document_model)
+    or the keyword scores when no model is loaded or it is not confident
+    enough. Unlike predict_document_type, types without a DocumentType
+    (added to the keyword file for a parser plugin) keep their name.
+    """
+    prediction = document_model.predict_confident(text)
+    if prediction is None:
+        return score_document(text).document_type
+    return prediction[0]
+
+def predict_document_type(text: str) -> DocumentType:
+    """predict_type_name as a DocumentType; types without one are OTHER."""
+    return _document_type(predict_type_name(text))
+
+def rank_document_types(text: str, margin: int, limit: int) -> List[str]:
+    """
+    The type name predict_type_name picks, followed by up to ``limit - 1``
+    runners-up whose keyword score is within ``margin`` points of it.
+
+    Only the winner is returned when the trained model is confident or no
+    keyword matched at all.
+    """
+    prediction = document_model.predict_confident(text)
+    if prediction is not None:
+        return [prediction[0]]
+    scores = score_document(text)
+    ranked = [scores.document_type]
+    top = scores.scores.get(scores.document_type, 0)
+    if top == 0:
+        return ranked
+    for name, points in sorted(scores.scores.items(), key=lambda item: -item[1]):
+        if len(ranked) >= limit or points == 0 or top - points > margin:
+            break
+        if name not in ranked:
+            ranked.append(name)
+    return ranked
+
+def classify_document_from_image(image) -> DocumentType:
+    """Classify document directly from image bytes or a DocumentImage."""
+    text = preprocess_for_classification(image)
+    return predict_document_type(text)
@@ -0,0 +1,222 @@
+import os
+import threading
+from functools import cached_property
+from typing import Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .deadline import Deadline, DeadlineExceeded
+from .ingest import SpooledUpload
+from .ocr_backend import get_backend
+from .ocr_result import OcrResult
+from .ocr_tiers import OCR_FAST_TIER_SIDE, TIER_FAST, TIER_FULL
+from .receipt_region import crop_receipt, find_item_band
+
+# Small photos are upscaled so tesseract sees glyphs at a usable size
+MIN_OCR_SIDE = 1200
+
+# Crop phone photos to the detected receipt outline before any OCR (off until
+# the outline heuristic is validated on real photos)
+OCR_CROP_RECEIPT = os.environ.get('OCR_CROP_RECEIPT', '0') == '1'
+
+# Decode straight to grayscale and resize with OpenCV instead of PIL
+OCR_FAST_DECODE = os.environ.get('OCR_FAST_DECODE', '0') == '1'
+
+# With OCR_FAST_DECODE, larger photos are reduced to this longest side while
+# decoding (JPEG draft mode) or right after
+OCR_MAX_DECODE_SIDE = int(os.environ.get('OCR_MAX_DECODE_SIDE', 2400))
+
+# Configuration of the shared OCR pass read by the classifier and parsers
+DEFAULT_OCR_CONFIG = '--oem 3 --psm 6'
+
+
+class DocumentImage:
+    """
+    Decoded view of one uploaded document, shared by the whole upload pipeline.
+
+    The upload is decoded once and every derived view (RGB, grayscale,
+    thresholded) is computed lazily on first access and memoized, so the
+    classifier and the parsers reuse the same arrays instead of decoding
+    and preprocessing the upload again at every stage. OCR passes are
+    memoized the same way, see ``ocr``.
+
+    With ``fast_decode`` the upload is decoded straight to grayscale (JPEG
+    photos at a reduced scale through draft mode) and every later step works
+    on that single-channel array with OpenCV; ``decoded`` and ``image`` are
+    then grayscale too.
+
+    ``deadline`` bounds the OCR spent on the document; see ``deadline``.
+    ``tier`` is the OCR quality tier (see ``ocr_tiers``); it must be set
+    before any view is computed, since the fast tier always crops to the
+    receipt and downscales to OCR_FAST_TIER_SIDE.
+    """
+
+    def __init__(self, source: Union[SpooledUpload, bytes, str], crop_receipt: Optional[bool] = None,
+                 fast_decode: Optional[bool] = None):
+        self.upload = SpooledUpload.coerce(source)
+        self.crop_receipt = OCR_CROP_RECEIPT if crop_receipt is None else crop_receipt
+        self.fast_decode = OCR_FAST_DECODE if fast_decode is None else fast_decode
+        self.deadline = Deadline()
+        self.tier = TIER_FULL
+        self._ocr_results = {}
+        self._ocr_locks = {}
+        self._locks_lock = threading.Lock()
+
+    @classmethod
+    def coerce(cls, source: Union['DocumentImage', SpooledUpload, bytes, str]) -> 'DocumentImage':
+        """Wrap an upload, raw bytes or a file path, passing existing contexts through."""
+        if isinstance(source, cls):
+            return source
+        return cls(source)
+
+    @classmethod
+    def from_image(cls, image: Image.Image, sha256: str, crop_receipt: bool = False) -> 'DocumentImage':
+        """
+        Context for an image that was rendered rather than uploaded, e.g. a PDF page.
+
+        ``sha256`` must identify the rendering (document digest, page, DPI)
+        since it addresses the OCR cache.
+        """
+        document = cls(b'', crop_receipt)
+        document.upload = None
+        document.__dict__['decoded'] = image.convert('L' if document.fast_decode else 'RGB')
+        document.__dict__['sha256'] = sha256
+        return document
+
+    @cached_property
+    def sha256(self) -> str:
+        """Hex digest of the upload, used as the content address for caching."""
+        return self.upload.sha256
+
+    @cached_property
+    def decoded(self) -> Image.Image:
+        """RGB image of the whole upload at the original resolution."""
+        # Decoded straight from the upload's stream (in memory or spooled file)
+        with self.upload.open() as f:
+            img = Image.open(f)
+            if not self.fast_decode:
+                return img.convert('RGB')
+            if img.format == 'JPEG' and max(img.size) > OCR_MAX_DECODE_SIDE:
+                # libjpeg skips the colour conversion and decodes at 1/2, 1/4 or 1/8 scale
+                scale = OCR_MAX_DECODE_SIDE / max(img.size)
+                img.draft('L', (int(img.width*scale), int(img.height*scale)))
+            return img.convert('L')
+
+    @cached_property
+    def image(self) -> Image.Image:
+        """
+        RGB image of the receipt itself at the original resolution.
+
+        With ``crop_receipt`` the receipt outline is detected, perspective
+        corrected and cropped so the table and background around it never
+        reach tesseract; the whole photo is used when no outline is found.
+        """
+        if not (self.crop_receipt or self.tier == TIER_FAST):
+            return self.decoded
+        region = crop_receipt(np.array(self.decoded))
+        return self.decoded if region is None else Image.fromarray(region)
+
+    @cached_property
+    def rgb(self) -> np.ndarray:
+        """RGB pixel array of ``image``."""
+        return np.array(self.image)
+
+    @cached_property
+    def scaled_image(self) -> Image.Image:
+        """RGB image upscaled so that its longest side is at least MIN_OCR_SIDE."""
+        if self.fast_decode:
+            return Image.fromarray(self.gray)
+        img = self.image
+        max_side = max(img.size)
+        min_side, limit = self._side_limits()
+        if max_side < min_side:
+            scale = min_side / max_side
+            img = img.resize((int(img.width*scale), int(img.height*scale)))
+        elif limit and max_side > limit:
+            scale = limit / max_side
+            img = img.resize((int(img.width*scale), int(img.height*scale)))
+        return img
+
+    @cached_property
+    def gray(self) -> np.ndarray:
+        """Grayscale array of the upscaled image."""
+        if self.fast_decode:
+            return _resize_gray(np.asarray(self.image), *self._side_limits())
+        return cv2.cvtColor(np.array(self.scaled_image), cv2.COLOR_RGB2GRAY)
+
+    @cached_property
+    def thresholded(self) -> np.ndarray:
+        """Blurred, adaptively thresholded array used as the OCR input."""
+        gray = cv2.GaussianBlur(self.gray, (3,3), 0)
+        return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
+
+    @cached_property
+    def preprocessed(self) -> Image.Image:
+        """Thresholded image wrapped for the OCR backend."""
+        return Image.fromarray(self.thresholded)
+
+    def _side_limits(self) -> Tuple[int, Optional[int]]:
+        """Smallest and largest (None: unbounded) longest side of the OCR input."""
+        if self.tier == TIER_FAST:
+            return min(MIN_OCR_SIDE, OCR_FAST_TIER_SIDE), OCR_FAST_TIER_SIDE
+        return MIN_OCR_SIDE, (OCR_MAX_DECODE_SIDE if self.fast_decode else None)
+
+    def ocr(self, config: str = DEFAULT_OCR_CONFIG, lang: str = 'eng', preprocess: bool = True) -> OcrResult:
+        """Run image_to_data once per configuration and memoize the result.
+
+        Safe to call from several threads (parsers of an ambiguous document
+        run concurrently): a configuration is OCR'd by the first caller while
+        the others wait for its result. Raises DeadlineExceeded when the
+        document's deadline ran out.
+        """
+        key = (config, lang, preprocess)
+        if key in self._ocr_results:
+            return self._ocr_results[key]
+        with self._locks_lock:
+            lock = self._ocr_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._ocr_results:
+                if self.deadline.expired():
+                    raise DeadlineExceeded("OCR deadline reached")
+                img = self.preprocessed if preprocess else self.image
+                data = get_backend().image_to_data(img, config=config, lang=lang, timeout=self.deadline.timeout())
+                self._ocr_results[key] = OcrResult.from_data(data)
+        return self._ocr_results[key]
+
+    def cached_ocr(self, config: str = DEFAULT_OCR_CONFIG, lang: str = 'eng',
+                   preprocess: bool = True) -> Optional[OcrResult]:
+        """The memoized result of ``ocr`` for a configuration, or None when it has not run."""
+        return self._ocr_results.get((config, lang, preprocess))
+
+    def item_band(self) -> Optional[Tuple[int, int]]:
+        """(top, bottom) rows of the item list in ``preprocessed``, from the shared OCR pass."""
+        return find_item_band(self.ocr())
+
+    def band_image(self, band: Tuple[int, int], preprocess: bool = True,
+                   span: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """Crop the preprocessed (or original-scale) image to an item band.
+
+        ``span`` optionally narrows the crop to (left, right) columns.
+        """
+        top, bottom = band
+        left, right = span or (0, self.preprocessed.width)
+        if preprocess:
+            return self.preprocessed.crop((left, top, right, bottom))
+        # The band was measured on the upscaled image
+        scale = self.image.height / self.scaled_image.height
+        return self.image.crop((int(left * scale), int(top * scale), int(right * scale), int(bottom * scale)))
+
+
+def _resize_gray(gray: np.ndarray, min_side: int = MIN_OCR_SIDE, max_side: int = OCR_MAX_DECODE_SIDE) -> np.ndarray:
+    """Bring a grayscale array's longest side between ``min_side`` and ``max_side`` with OpenCV."""
+    longest = max(gray.shape[:2])
+    if longest < min_side:
+        scale, interpolation = min_side / longest, cv2.INTER_CUBIC
+    elif longest > max_side:
+        scale, interpolation = max_side / longest, cv2.INTER_AREA
+    else:
+        return gray
+    size = (int(gray.shape[1]*scale), int(gray.shape[0]*scale))
+    return cv2.resize(gray, size, interpolation=interpolation)
@@ -0,0 +1,190 @@
+"""
+Trained document-type model.
+
+A multinomial naive Bayes classifier over hashed character n-grams of the
+OCR text, trained offline from a labelled corpus by
+``train_document_model.py`` and stored as a small ``.npz`` file. It is
+loaded once when the app starts; without a model file (or with
+DOCUMENT_MODEL=0) classification uses the keyword scores in
+``document_classifier`` only.
+
+N-grams are hashed with NumPy over the UTF-8 bytes of the whole text at
+once, so classifying a receipt is a handful of array operations rather
+than a Python loop over its words.
+"""
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DOCUMENT_MODEL_ENABLED = os.environ.get('DOCUMENT_MODEL', '1') == '1'
+DOCUMENT_MODEL_PATH = os.environ.get(
+    'DOCUMENT_MODEL_PATH', os.path.join(os.path.dirname(__file__), 'data', 'document_model.npz'))
+
+# Below this probability the keyword classifier decides instead
+DOCUMENT_MODEL_MIN_CONFIDENCE = float(os.environ.get('DOCUMENT_MODEL_MIN_CONFIDENCE', 0.9))
+
+# Training defaults, stored in the model file (n-gram sizes from 2 up)
+DEFAULT_NGRAMS = (2, 3, 4)
+DEFAULT_BITS = 16
+
+# Digits are folded to '0' so prices and dates share features
+_DIGITS = str.maketrans('123456789', '000000000')
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_BASE = np.uint64(257)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, fold digits and collapse whitespace, padded so words have edges."""
+    return ' ' + ' '.join(text.lower().translate(_DIGITS).split()) + ' '
+
+
+def hash_ngrams(text: str, ngrams: Sequence[int] = DEFAULT_NGRAMS, bits: int = DEFAULT_BITS) -> np.ndarray:
+    """
+    Feature bucket of every character n-gram of ``text``, one entry per occurrence.
+
+    Sizes below 1 raise ValueError.
+    """
+    if min(ngrams) < 1:
+        raise ValueError(f"n-gram sizes must be at least 1, got {sorted(ngrams)}")
+    data = np.frombuffer(normalize_text(text).encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+    shift = np.uint64(64 - bits)
+    buckets = []
+    # Polynomial hash of every window, extended by one byte per size
+    h = data
+    for n in range(1, max(ngrams) + 1):
+        if n > 1:
+            h = h[:-1] * _BASE + data[n - 1:]
+        if n in ngrams:
+            # The size is mixed in so that n-grams of different sizes don't collide
+            buckets.append(((h + np.uint64(n)) * _GOLDEN) >> shift)
+    if not buckets:
+        return np.zeros(0, dtype=np.intp)
+    return np.concatenate(buckets).astype(np.intp)
+
+
+@dataclass
+class Prediction:
+    document_type: str
+    confidence: float  # posterior probability of document_type
+    probabilities: Dict[str, float]
+
+
+class DocumentTypeModel:
+    """Multinomial naive Bayes over hashed character n-grams."""
+
+    def __init__(self, types: Sequence[str], log_prior: np.ndarray, log_likelihood: np.ndarray,
+                 ngrams: Sequence[int] = DEFAULT_NGRAMS, bits: int = DEFAULT_BITS, documents: int = 0):
+        self.types: List[str] = list(types)
+        self.log_prior = np.asarray(log_prior, dtype=np.float32)
+        # (types, 2 ** bits) log P(n-gram bucket | type)
+        self.log_likelihood = np.asarray(log_likelihood, dtype=np.float32)
+        # One contiguous row per bucket, so prediction gathers rows
+        self._by_bucket = np.ascontiguousarray(self.log_likelihood.T)
+        self.ngrams = tuple(int(n) for n in ngrams)
+        self.bits = int(bits)
+        self.documents = int(documents)
+        # Content hash of the file the model was loaded from
+        self.digest: Optional[str] = None
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], ngrams: Sequence[int] = DEFAULT_NGRAMS,
+              bits: int = DEFAULT_BITS, alpha: float = 0.1) -> 'DocumentTypeModel':
+        """Fit on labelled texts with additive smoothing ``alpha``."""
+        types = sorted(set(labels))
+        index = {name: i for i, name in enumerate(types)}
+        size = 1 << bits
+        counts = np.zeros((len(types), size), dtype=np.float64)
+        documents = np.zeros(len(types), dtype=np.float64)
+        for text, label in zip(texts, labels):
+            row = index[label]
+            counts[row] += np.bincount(hash_ngrams(text, ngrams, bits), minlength=size)
+            documents[row] += 1
+
+        smoothed = counts + alpha
+        log_likelihood = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        log_prior = np.log(documents / documents.sum())
+        return cls(types, log_prior, log_likelihood, ngrams, bits, int(documents.sum()))
+
+    def predict(self, text: str) -> Prediction:
+        """Most probable type of ``text`` with its posterior probability."""
+        features = hash_ngrams(text, self.ngrams, self.bits)
+        scores = self.log_prior + self._by_bucket.take(features, axis=0).sum(axis=0)
+        probabilities = np.exp(scores - scores.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return Prediction(
+            self.types[best],
+            float(probabilities[best]),
+            {name: float(p) for name, p in zip(self.types, probabilities)},
+        )
+
+    def save(self, path: str) -> None:
+        """Write the model as a compressed .npz file."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                types=np.array(self.types),
+                log_prior=self.log_prior,
+                log_likelihood=self.log_likelihood,
+                ngrams=np.array(self.ngrams),
+                bits=np.array(self.bits),
+                documents=np.array(self.documents),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'DocumentTypeModel':
+        with open(path, 'rb') as f:
+            raw = f.read()
+        with np.load(io.BytesIO(raw), allow_pickle=False) as data:
+            model = cls(
+                [str(name) for name in data['types']],
+                data['log_prior'],
+                data['log_likelihood'],
+                data['ngrams'].tolist(),
+                int(data['bits']),
+                int(data['documents']),
+            )
+        model.digest = hashlib.sha256(raw).hexdigest()[:16]
+        return model
+
+    def describe(self) -> Dict[str, object]:
+        """What the model was trained on, for cache keys and metrics."""
+        return {
+            'types': self.types,
+            'ngrams': list(self.ngrams),
+            'bits': self.bits,
+            'documents': self.documents,
+            'digest': self.digest,
+            'min_confidence': DOCUMENT_MODEL_MIN_CONFIDENCE,
+        }
+
+
+def load_document_model(path: str = DOCUMENT_MODEL_PATH) -> Optional[DocumentTypeModel]:
+    """The trained model at ``path``, or None when disabled, missing or unreadable."""
+    if not DOCUMENT_MODEL_ENABLED or not os.path.exists(path):
+        return None
+    try:
+        return DocumentTypeModel.load(path)
+    except Exception as e:
+        print(f"Could not load document model {path}: {e}")
+        return None
+
+
+# Loaded once per process; None falls back to keyword classification
+document_model = load_document_model()
+
+
+def predict_confident(text: str, min_confidence: float = DOCUMENT_MODEL_MIN_CONFIDENCE) -> Optional[Tuple[str, float]]:
+    """Model prediction as (type, confidence) when it reaches ``min_confidence``, else None."""
+    if document_model is None or not text.strip():
+        return None
+    prediction = document_model.predict(text)
+    if prediction.confidence < min_confidence:
+        return None
+    return prediction.document_type, prediction.confidence
@@ -0,0 +1,189 @@
+"""
+Size-bounded upload ingestion.
+
+Starlette's multipart parser has already stored the request body by the
+time an endpoint runs: in memory for small files, in a temporary file on
+disk past its spool size. Uploads are checked against the size limit and
+hashed in chunks straight from that file, and every later stage reads the
+same file, so the body is never copied into another buffer or temporary
+file and large photos and scans are never held in memory as a whole.
+"""
+import hashlib
+import io
+import os
+import shutil
+import threading
+from typing import BinaryIO, Optional, Union
+
+from fastapi import UploadFile
+
+UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', 25 * 1024 * 1024))
+UPLOAD_BATCH_MAX_BYTES = int(os.environ.get('UPLOAD_BATCH_MAX_BYTES', 200 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = int(os.environ.get('UPLOAD_CHUNK_BYTES', 256 * 1024))
+
+# Directory for files spooled while processing (PDF pages of a batch); the
+# system temp directory when unset
+UPLOAD_SPOOL_DIR = os.environ.get('UPLOAD_SPOOL_DIR') or None
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes / (1024 * 1024):.1f} MB limit")
+        self.max_bytes = max_bytes
+
+
+class _FileView(io.RawIOBase):
+    """Read-only view with its own position over a file shared with other views."""
+
+    def __init__(self, file: BinaryIO, lock: threading.Lock):
+        self._file = file
+        self._lock = lock
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        with self._lock:
+            self._file.seek(self._pos)
+            data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_END:
+            with self._lock:
+                offset += self._file.seek(0, io.SEEK_END)
+        elif whence == io.SEEK_CUR:
+            offset += self._pos
+        self._pos = offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class SpooledUpload:
+    """
+    An upload held in memory, in a file on disk or in the request's file.
+
+    Consumers read it through ``open()``, which returns a fresh binary
+    stream over the bytes, the path or the request's file, so no stage has
+    to copy it into another buffer. Uploads built from a request's file are
+    sent to worker processes as bytes, since the file cannot be shared.
+    """
+
+    def __init__(self, data: Optional[bytes] = None, path: Optional[str] = None,
+                 size: Optional[int] = None, sha256: Optional[str] = None, file: Optional[BinaryIO] = None):
+        self.data = data
+        self.path = path
+        self.file = file
+        if size is None:
+            if data is not None:
+                size = len(data)
+            elif file is not None:
+                size = file.seek(0, io.SEEK_END)
+            else:
+                size = os.path.getsize(path)
+        self.size = size
+        self._sha256 = sha256
+        self._file_lock = threading.Lock()
+
+    @classmethod
+    def coerce(cls, source: Union['SpooledUpload', bytes, str]) -> 'SpooledUpload':
+        """Wrap raw bytes or a file path, passing existing uploads through."""
+        if isinstance(source, cls):
+            return source
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return cls(data=bytes(source))
+        return cls(path=os.fspath(source))
+
+    @property
+    def sha256(self) -> str:
+        """Hex digest of the content, computed while ingesting or on first use."""
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            with self.open() as f:
+                for chunk in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b''):
+                    digest.update(chunk)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def open(self) -> BinaryIO:
+        """New binary stream positioned at the start of the upload."""
+        if self.data is not None:
+            # BytesIO shares the bytes object until it is written to
+            return io.BytesIO(self.data)
+        if self.file is not None:
+            return io.BufferedReader(_FileView(self.file, self._file_lock), UPLOAD_CHUNK_BYTES)
+        return open(self.path, 'rb')
+
+    def read(self) -> bytes:
+        if self.data is not None:
+            return self.data
+        with self.open() as f:
+            return f.read()
+
+    def move_to(self, dest: str) -> None:
+        """Store the upload at ``dest``."""
+        if self.data is not None:
+            with open(dest, 'wb') as f:
+                f.write(self.data)
+        elif self.file is not None:
+            with self.open() as src, open(dest, 'wb') as f:
+                shutil.copyfileobj(src, f, UPLOAD_CHUNK_BYTES)
+        else:
+            shutil.copyfile(self.path, dest)
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self) -> 'SpooledUpload':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_file_lock']
+        if self.file is not None:
+            state.update(data=self.read(), file=None)
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._file_lock = threading.Lock()
+
+
+async def ingest_upload(upload: UploadFile, max_bytes: int = UPLOAD_MAX_BYTES,
+                        chunk_size: int = UPLOAD_CHUNK_BYTES) -> SpooledUpload:
+    """
+    Check an upload's size and hash it in chunks, keeping its spooled file.
+
+    Raises UploadTooLarge as soon as more than ``max_bytes`` have been read,
+    or before reading when the declared size is already over the limit.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    digest = hashlib.sha256()
+    size = 0
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        digest.update(chunk)
+
+    return SpooledUpload(file=upload.file, size=size, sha256=digest.hexdigest())
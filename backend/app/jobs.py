@@ -0,0 +1,238 @@
+"""
+Background receipt processing backed by the receipt_jobs table.
+
+The API stores the upload on disk, inserts a queued job and returns at once.
+Workers claim queued jobs, run OCR, matching and the DB writes, and mark the
+job done or failed; failed attempts are retried up to ``max_attempts``.
+
+With JOB_REOCR=1, receipts OCR'd below the full quality tier under load
+(see ``ocr_tiers``) keep their upload in a ``reocr`` job. Workers pick those up only while no
+uploads are queued and replace the receipt's items with a full-tier result.
+
+Run workers alongside uvicorn (from the backend directory):
+
+    python -m app.jobs --workers 2
+"""
+import argparse
+import multiprocessing
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from . import models, database
+from .ingest import SpooledUpload
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+JOB_UPLOAD_DIR = os.environ.get('JOB_UPLOAD_DIR', os.path.join(BASE_DIR, 'uploads'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))
+
+# Running jobs older than this are assumed to belong to a dead worker
+JOB_STALE_SECONDS = int(os.environ.get('JOB_STALE_SECONDS', 600))
+
+# Seconds between the workers' checks for stale jobs
+JOB_REQUEUE_INTERVAL = float(os.environ.get('JOB_REQUEUE_INTERVAL', 60))
+
+# Queue low-tier receipts for re-OCR; only set where app.jobs workers run,
+# since the uploads wait on disk until a worker picks them up
+JOB_REOCR = os.environ.get('JOB_REOCR', '0') == '1'
+
+# Most re-OCR jobs (and their stored uploads) kept waiting
+JOB_REOCR_MAX_PENDING = int(os.environ.get('JOB_REOCR_MAX_PENDING', 500))
+
+QUEUED = 'queued'
+REOCR = 'reocr'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def enqueue_receipt(db: Session, user_id: int, upload: SpooledUpload, filename: Optional[str] = None,
+                    content_type: Optional[str] = None, receipt_id: Optional[int] = None) -> models.ReceiptJob:
+    """Persist an upload and queue it for processing.
+
+    ``filename`` and ``content_type`` are kept for the worker, which needs
+    them to recognise digital documents. With ``receipt_id`` the upload
+    belongs to an existing low-tier receipt and is queued for re-OCR when
+    the workers are idle.
+    """
+    os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.join(JOB_UPLOAD_DIR, f"{uuid.uuid4().hex}.upload")
+    # Spooled uploads are moved rather than copied
+    upload.move_to(file_path)
+
+    job = models.ReceiptJob(
+        user_id=user_id,
+        status=QUEUED if receipt_id is None else REOCR,
+        file_path=file_path,
+        filename=filename,
+        content_type=content_type,
+        receipt_id=receipt_id,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        created_at=datetime.utcnow()
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def can_queue_reocr(db: Session) -> bool:
+    """
+    Whether another low-tier receipt may be queued for re-OCR.
+
+    Re-OCR jobs keep their upload in JOB_UPLOAD_DIR until a worker runs
+    them, so they are only queued when JOB_REOCR says workers are
+    configured, and the backlog is capped at JOB_REOCR_MAX_PENDING; further
+    receipts keep their low-tier items.
+    """
+    if not JOB_REOCR or JOB_REOCR_MAX_PENDING <= 0:
+        return False
+    pending = db.query(models.ReceiptJob).filter(models.ReceiptJob.status == REOCR).count()
+    return pending < JOB_REOCR_MAX_PENDING
+
+
+def claim_job(db: Session, status: str = QUEUED) -> Optional[models.ReceiptJob]:
+    """
+    Atomically move the oldest job with ``status`` to running.
+
+    The status check in the UPDATE makes the claim safe between worker
+    processes: only one of them sees a row count of 1 for a given job.
+    """
+    while True:
+        job = db.query(models.ReceiptJob).filter(models.ReceiptJob.status == status).order_by(models.ReceiptJob.id).first()
+        if job is None:
+            return None
+        claimed = db.query(models.ReceiptJob).filter(
+            models.ReceiptJob.id == job.id,
+            models.ReceiptJob.status == status
+        ).update({
+            'status': RUNNING,
+            'attempts': models.ReceiptJob.attempts + 1,
+            'started_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            db.refresh(job)
+            return job
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Return jobs left running by a crashed worker to the queue."""
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+    stale = db.query(models.ReceiptJob).filter(
+        models.ReceiptJob.status == RUNNING,
+        models.ReceiptJob.started_at < cutoff
+    )
+    count = stale.filter(models.ReceiptJob.receipt_id.is_(None)).update({'status': QUEUED}, synchronize_session=False)
+    count += stale.filter(models.ReceiptJob.receipt_id.isnot(None)).update({'status': REOCR}, synchronize_session=False)
+    db.commit()
+    return count
+
+
+def run_job(db: Session, job: models.ReceiptJob) -> None:
+    """Process one claimed job, recording the outcome on the job row."""
+    # Imported here so the API process does not pay for it twice
+    from .receipt_service import analyze_receipt, replace_results, reset_item_sequence, save_receipt
+
+    reocr = job.receipt_id is not None
+    try:
+        document_type, results, total, ocr_metadata = analyze_receipt(
+            SpooledUpload(path=job.file_path), job.filename, job.content_type)
+        if reocr:
+            receipt = db.query(models.Receipt).filter(models.Receipt.id == job.receipt_id).first()
+            if receipt is not None:
+                replace_results(db, receipt, document_type, results, total, ocr_metadata['ocr_tier'],
+                                commit=False)
+        else:
+            reset_item_sequence(db)
+            receipt = save_receipt(db, job.user_id, document_type, results, total, commit=False,
+                                   ocr_tier=ocr_metadata['ocr_tier'])
+            job.receipt_id = receipt.id
+        job.status = DONE
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        # The receipt, its items and EcoCredits commit with the job status, so
+        # a failed attempt leaves nothing behind for the retry to duplicate
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Job {job.id} attempt {job.attempts} failed: {e}")
+        job.error = str(e)
+        if job.attempts >= job.max_attempts:
+            job.status = FAILED
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = REOCR if reocr else QUEUED
+        db.commit()
+        if job.status != FAILED:
+            # Kept for the next attempt
+            return
+
+    try:
+        os.remove(job.file_path)
+    except OSError as e:
+        print(f"Could not remove upload for job {job.id}: {e}")
+
+
+def work(poll_interval: float = JOB_POLL_INTERVAL, once: bool = False) -> None:
+    """
+    Claim and run jobs until interrupted (or until the queue is empty with ``once``).
+
+    Every JOB_REQUEUE_INTERVAL seconds, jobs left running by a dead worker
+    are returned to the queue, so they do not wait for a worker restart.
+    """
+    last_requeue = None
+    while True:
+        db = database.SessionLocal()
+        try:
+            if last_requeue is None or time.monotonic() - last_requeue >= JOB_REQUEUE_INTERVAL:
+                stale = requeue_stale_jobs(db)
+                if stale:
+                    print(f"Requeued {stale} stale jobs")
+                last_requeue = time.monotonic()
+            # Re-OCR only runs while no new uploads are waiting
+            job = claim_job(db) or claim_job(db, REOCR)
+            if job is not None:
+                run_job(db, job)
+        finally:
+            db.close()
+
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run receipt processing workers.')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--poll-interval', type=float, default=JOB_POLL_INTERVAL, help='seconds between polls of an empty queue')
+    parser.add_argument('--once', action='store_true', help='exit when the queue is empty')
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=database.engine)
+
+    if args.workers <= 1:
+        work(args.poll_interval, args.once)
+        return
+
+    # Forked workers must not inherit the connections pooled above
+    database.engine.dispose()
+    processes = [multiprocessing.Process(target=work, args=(args.poll_interval, args.once)) for _ in range(args.workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,24 @@
 import os
 import json
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
-from .ocr import extract_items_from_image
-from .parsers import document_parser
-from .enhanced_footprint import EnhancedFootprintMatcher
-from .footprint import load_dataset, calculate_offset_from_trees, get_gamification_badge, calculate_trees_needed, calculate_eco_credits, get_credits_needed_for_tree, WhatIfSimulator
-from .utils import normalize_quantity
+from sqlalchemy import func
+from .ocr_cache import ocr_cache
+from .deadline import Deadline, OCR_DEADLINE_SECONDS
+from .ocr_executor import ocr_executor, ExecutorBusy
+from .ocr_tiers import TIER_FULL, choose_tier
+from .ocr_strategy import ocr_strategy
+from .store_layout import store_layouts
+from .parser_selection import parser_selection
+from .document_classifier import as_document_type
+from .ingest import ingest_upload, UploadTooLarge, UPLOAD_BATCH_MAX_BYTES
+from .batch_ingest import BatchError
+from .pdf_document import PdfUnavailable, ScannedPdf
+from .footprint import load_dataset, calculate_offset_from_trees, get_gamification_badge, calculate_trees_needed, get_credits_needed_for_tree, WhatIfSimulator
+from .receipt_service import analyze_receipt, analyze_batch, save_receipt, save_receipts, receipt_to_schema
 from datetime import datetime, timedelta
-from . import auth, report
+from . import auth, report, jobs
 from . import models, schemas, database
 from .carbon_budgeting import (
     CarbonAnalyticsEngine,
@@ -32,6 +40,26 @@ app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], all
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics/ocr_cache")
+def ocr_cache_metrics():
+    return ocr_cache.stats()
+
+@app.get("/metrics/ocr_queue")
+def ocr_queue_metrics():
+    return ocr_executor.metrics()
+
+@app.get("/metrics/ocr_strategy")
+def ocr_strategy_metrics():
+    return ocr_strategy.stats()
+
+@app.get("/metrics/store_layouts")
+def store_layout_metrics():
+    return store_layouts.stats()
+
+@app.get("/metrics/parser_selection")
+def parser_selection_metrics():
+    return parser_selection.stats()
+
 # Dashboard endpoints (both with and without trailing slash)
 @app.get("/dashboard", response_model=list[schemas.DashboardEntry])
 @app.get("/dashboard/", response_model=list[schemas.DashboardEntry])
@@ -53,7 +81,6 @@ def get_dashboard(current_user: models.User = Depends(auth.get_current_user), db
         # Return empty list instead of crashing
         return []
 
-matcher = EnhancedFootprintMatcher(load_dataset(database.DATASET_PATH))
 simulator = WhatIfSimulator(load_dataset(database.DATASET_PATH))
 
 # Initialize carbon budgeting engines
@@ -63,96 +90,102 @@ carbon_coach = AdaptiveCarbonCoach()
 plan_generator = SustainabilityPlanGenerator()
 
 
-@app.post('/upload_receipt', response_model=schemas.ReceiptBase)
-async def upload_receipt(file: UploadFile = File(...), current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
-    contents = await file.read()
+@app.post('/upload_receipt', response_model=schemas.ReceiptBase | schemas.JobOut)
+async def upload_receipt(response: Response, file: UploadFile = File(...), defer: bool = False, current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """
+    Process an uploaded receipt.
 
+    With ``defer=true`` the upload is queued for the background workers
+    (``python -m app.jobs``) and a job is returned at once; poll
+    ``/jobs/{id}`` for the result.
+    """
     try:
-        # Use the new document parser system
-        parsed_data = document_parser.parse_document(contents)
-        items_raw = parsed_data['items']
-        document_type = parsed_data['document_type']
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f'OCR failed: {e}')
-
-    # Normalize quantities
-    items = []
-    for it in items_raw:
-        qty_kg, _ = normalize_quantity(f"{it.get('qty', 1)} {it.get('name', '')}")
-        category = it.get('category', 'food')  # Default to food for backward compatibility
-        items.append({
-            'name': it.get('name', ''),
-            'qty': qty_kg,
-            'category': category,
-            'unit': it.get('unit', 'kg')
-        })
-
-    results, total = matcher.match_and_compute(items)
-
-    # Create receipt and items in DB linked to current user
-    receipt = models.Receipt(
-        user_id=current_user.id,
-        total_footprint=total,
-        document_type=document_type,
-        date=datetime.utcnow()
-    )
-    db.add(receipt)
-    db.commit()
-    db.refresh(receipt)
+        upload = await ingest_upload(file)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    with upload:
+        if defer:
+            job = jobs.enqueue_receipt(db, current_user.id, upload, file.filename, file.content_type)
+            response.status_code = 202
+            return job_to_schema(db, job)
+
+        # The deadline also covers time spent waiting for an OCR worker
+        deadline = Deadline(OCR_DEADLINE_SECONDS)
+        # Busier queues get quicker, less thorough OCR
+        tier = choose_tier(ocr_executor.load())
+        try:
+            document_type, results, total, ocr_metadata = await ocr_executor.run(
+                analyze_receipt, upload, file.filename, file.content_type, deadline=deadline, tier=tier)
+        except ExecutorBusy as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={'Retry-After': str(e.retry_after)})
+        except ScannedPdf as e:
+            raise HTTPException(status_code=400, detail=f'{e}; upload scanned PDFs to /upload_batch')
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f'OCR failed: {e}')
+
+        ocr_tier = ocr_metadata['ocr_tier']
+        receipt = save_receipt(db, current_user.id, document_type, results, total, ocr_tier=ocr_tier)
+        # Keep the upload so the receipt can be OCR'd fully once the workers are idle
+        if ocr_tier not in (None, TIER_FULL) and jobs.can_queue_reocr(db):
+            jobs.enqueue_receipt(db, current_user.id, upload, file.filename, file.content_type,
+                                 receipt_id=receipt.id)
+
+    return receipt_to_schema(db, receipt, ocr_metadata)
+
+@app.post('/upload_batch', response_model=list[schemas.BatchDocument])
+async def upload_batch(file: UploadFile = File(...), current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    """
+    Process a multi-page PDF or a ZIP archive of receipts.
 
-    # Reset the items sequence to avoid primary key conflicts
+    Pages are parsed in parallel and each document (PDF or archive member)
+    becomes one receipt; all receipts are stored in a single transaction.
+    """
     try:
-        max_id = db.query(func.max(models.Item.id)).scalar()
-        if max_id:
-            db.execute(text(f"SELECT setval('items_id_seq', {max_id})"))
-            db.commit()
-    except Exception as seq_error:
-        print(f"Warning: Could not reset sequence: {seq_error}")
-
-    for item in results:
-        db_item = models.Item(
-            receipt_id=receipt.id,
-            name=item['name'],
-            matched_name=item['matched_name'],
-            qty=item['qty'],
-            unit=item['unit'],
-            footprint=item['footprint'],
-            category=item.get('category', 'food'),
-            match_score=item.get('match_score'),
-            co2_per_unit=item.get('co2_per_unit')
-        )
-        db.add(db_item)
-    db.commit()
-
-    # Award EcoCredits for uploading receipt
-    credits_earned = calculate_eco_credits(total)
-    user = db.query(models.User).filter(models.User.id == current_user.id).first()
-    user.eco_credits += credits_earned
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    receipt_items = db.query(models.Item).filter(models.Item.receipt_id == receipt.id).all()
-    doc_type_value = receipt.document_type if isinstance(receipt.document_type, str) else receipt.document_type.value
-    receipt_data = schemas.ReceiptBase(
-        id=receipt.id,
-        user_id=receipt.user_id,
-        total_footprint=receipt.total_footprint,
-        document_type=schemas.DocumentType(doc_type_value),
-        items=[schemas.ItemBase(
-            name=i.name,
-            matched_name=i.matched_name or "",
-            qty=i.qty,
-            unit=i.unit or "",
-            footprint=i.footprint,
-            category=getattr(i, 'category', 'food'),
-            match_score=getattr(i, 'match_score', None),
-            co2_per_unit=getattr(i, 'co2_per_unit', None)
-        ) for i in receipt_items],
-        date=receipt.date
+        upload = await ingest_upload(file, max_bytes=UPLOAD_BATCH_MAX_BYTES)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    with upload:
+        try:
+            documents = await ocr_executor.run(analyze_batch, upload, file.filename or 'upload')
+        except ExecutorBusy as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={'Retry-After': str(e.retry_after)})
+        except (BatchError, PdfUnavailable) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f'OCR failed: {e}')
+
+    if not documents:
+        raise HTTPException(status_code=400, detail="No readable pages found in upload")
+
+    receipts = save_receipts(db, current_user.id, documents)
+    return [schemas.BatchDocument(
+        name=document['name'],
+        pages=document['pages'],
+        receipt=receipt_to_schema(db, receipt)
+    ) for document, receipt in zip(documents, receipts)]
+
+@app.get('/jobs/{job_id}', response_model=schemas.JobOut)
+def get_job(job_id: int, current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    job = db.query(models.ReceiptJob).filter(
+        models.ReceiptJob.id == job_id,
+        models.ReceiptJob.user_id == current_user.id
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_schema(db, job)
+
+def job_to_schema(db: Session, job: models.ReceiptJob) -> schemas.JobOut:
+    return schemas.JobOut(
+        id=job.id,
+        status=job.status,
+        attempts=job.attempts or 0,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        receipt=receipt_to_schema(db, job.receipt) if job.receipt else None
     )
-    return receipt_data
 
 @app.post('/plant_trees')
 def plant_trees(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
@@ -243,7 +276,7 @@ def footprint_history(current_user: models.User = Depends(auth.get_current_user)
             id=receipt.id,
             user_id=receipt.user_id,
             total_footprint=receipt.total_footprint,
-            document_type=schemas.DocumentType(receipt.document_type) if isinstance(receipt.document_type, str) else schemas.DocumentType(receipt.document_type.value),
+            document_type=as_document_type(receipt.document_type) if isinstance(receipt.document_type, str) else receipt.document_type,
             items=[schemas.ItemBase(
                 name=i.name,
                 matched_name=i.matched_name or "",
@@ -23,6 +23,7 @@ class Receipt(Base):
     total_footprint = Column(Float)
     document_type = Column(String, default="grocery")
     date = Column(DateTime, default=datetime.utcnow)
+    ocr_tier = Column(String, nullable=True)  # full, single, fast; None for digital documents and batches
 
     owner = relationship("User", back_populates="receipts")
     items = relationship("Item", back_populates="receipt")
@@ -42,6 +43,26 @@ class Item(Base):
 
     receipt = relationship("Receipt", back_populates="items")
 
+class ReceiptJob(Base):
+    """Upload waiting for (or done with) background processing"""
+    __tablename__ = "receipt_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    status = Column(String, default="queued", index=True)  # queued, reocr, running, done, failed
+    file_path = Column(String)
+    filename = Column(String, nullable=True)  # as uploaded, for digital-text detection
+    content_type = Column(String, nullable=True)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    error = Column(String, nullable=True)
+    receipt_id = Column(Integer, ForeignKey("receipts.id"), nullable=True)  # set up front for re-OCR jobs
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    owner = relationship("User")
+    receipt = relationship("Receipt")
+
 class UserOffset(Base):
     __tablename__ = "user_offsets"
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,129 @@
+import re
+from typing import Dict, List
+
+# Common OCR typo corrections and standardizations for grocery item names.
+# Order matters: earlier corrections can produce text that later ones match
+# (e.g. 'mil' -> 'milk' lets 'whole milk' -> 'milk' apply).
+ITEM_CORRECTIONS = {
+    # Common OCR errors
+    'mi1k': 'milk', 'mil': 'milk', 'mik': 'milk',
+    'brea': 'bread', 'bre': 'bread',
+    'chic': 'chicken', 'chick': 'chicken', 'chi': 'chicken',
+    'chee': 'cheese', 'ches': 'cheese',
+    'toma': 'tomato', 'tomat': 'tomato',
+    'pota': 'potato', 'potat': 'potato',
+    'appl': 'apple', 'app': 'apple',
+    'bana': 'banana', 'ban': 'banana',
+    'eggi': 'eggs', 'egg': 'eggs',
+    'beef': 'beef', 'bee': 'beef',
+    'rice': 'rice', 'ric': 'rice',
+    'past': 'pasta', 'pas': 'pasta',
+
+    # Common variations and abbreviations
+    'whole milk': 'milk', 'semi skimmed': 'milk', 'skim milk': 'milk',
+    'white bread': 'bread', 'brown bread': 'bread', 'wholemeal': 'bread',
+    'free range eggs': 'eggs', 'large eggs': 'eggs', 'medium eggs': 'eggs',
+    'chicken breast': 'chicken', 'chicken thigh': 'chicken',
+    'ground beef': 'beef', 'minced beef': 'beef', 'steak': 'beef',
+    'cheddar cheese': 'cheese', 'mozzarella': 'cheese', 'parmesan': 'cheese',
+    'cherry tomato': 'tomato', 'plum tomato': 'tomato',
+    'baking potato': 'potato', 'new potato': 'potato',
+    'braeburn apple': 'apple', 'granny smith': 'apple', 'gala apple': 'apple',
+    'fairtrade banana': 'banana',
+    'white rice': 'rice', 'brown rice': 'rice', 'basmati': 'rice', 'jasmine rice': 'rice',
+    'spaghetti': 'pasta', 'penne': 'pasta', 'fusilli': 'pasta', 'macaroni': 'pasta',
+
+    # Units and quantities (remove these)
+    'kg': '', 'kilo': '', 'kilogram': '', 'kilograms': '',
+    'g': '', 'gram': '', 'grams': '',
+    'l': '', 'liter': '', 'litre': '', 'liters': '', 'litres': '',
+    'ml': '', 'milliliter': '', 'millilitre': '', 'milliliters': '', 'millilitres': '',
+    'lb': '', 'lbs': '', 'pound': '', 'pounds': '',
+    'oz': '', 'ounce': '', 'ounces': '',
+    'pack': '', 'packet': '', 'pack of': '', 'pk': '',
+    'pc': '', 'piece': '', 'pieces': '', 'pcs': '',
+    'ea': '', 'each': '', 'item': '',
+}
+
+# Common restaurant item abbreviations
+MENU_CORRECTIONS = {
+    'chk': 'chicken',
+    'bf': 'beef',
+    'veg': 'vegetable',
+    'app': 'appetizer',
+    'des': 'dessert',
+    'bev': 'beverage'
+}
+
+# Price patterns shared by the line parsers, tried in order
+PRICE_PATTERNS = [
+    re.compile(r'(\d{1,5}(?:[\.,]\d{2})?)\s*(?:$|[€£$]|EUR|USD|GBP)'),  # Price at end
+    re.compile(r'(?:€|£|\$|EUR|USD|GBP)\s*(\d{1,5}(?:[\.,]\d{2})?)'),    # Currency at start
+    re.compile(r'(\d{1,5}(?:[\.,]\d{2})?)\s*(?:€|£|\$)'),                # Price with currency
+]
+
+# Quantity patterns shared by the line parsers, tried in order
+QTY_PATTERNS = [
+    re.compile(r'^(\d+)\s*[xX]\s*', re.IGNORECASE),  # 2x, 3x format
+    re.compile(r'(\d+)\s*(?:pcs?|PK|pack|pieces?|items?)', re.IGNORECASE),  # 2 pcs, 3 pack
+    re.compile(r'\((\d+)\)', re.IGNORECASE),  # (2) format
+    re.compile(r'qty[:\s]*(\d+)', re.IGNORECASE),  # qty: 2 format
+    re.compile(r'quantity[:\s]*(\d+)', re.IGNORECASE),  # quantity: 2 format
+]
+
+_WORD_RE = re.compile(r'\w+')
+
+
+class _Stage:
+    """Corrections that can be applied together by one regex."""
+
+    def __init__(self):
+        self.replacements: Dict[str, str] = {}
+        self.words = set()
+        self.pattern = None
+
+
+class CorrectionTable:
+    """
+    Ordered whole-word replacement table compiled once into alternation regexes.
+
+    Applying a table one ``re.sub`` per entry lets an earlier replacement feed
+    a later pattern. To keep exactly those semantics, consecutive entries are
+    grouped into stages whose patterns and replacements share no words, so
+    no entry in a stage can see another's output. Each stage is then a single
+    alternation regex plus a dict lookup, applied in order.
+    """
+
+    def __init__(self, corrections: Dict[str, str], flags: int = 0):
+        self.ignore_case = bool(flags & re.IGNORECASE)
+        self.stages: List[_Stage] = []
+
+        for wrong, correct in corrections.items():
+            key = wrong.lower() if self.ignore_case else wrong
+            words = set(_WORD_RE.findall(wrong.lower()))
+            stage = self.stages[-1] if self.stages else None
+            if stage is None or words & stage.words:
+                stage = _Stage()
+                self.stages.append(stage)
+            stage.replacements[key] = correct
+            stage.words |= words | set(_WORD_RE.findall(correct.lower()))
+
+        for stage in self.stages:
+            # Alternatives keep table order, so the earlier entry wins where two
+            # could match at the same position, as with sequential substitution
+            alternation = '|'.join(re.escape(wrong) for wrong in stage.replacements)
+            stage.pattern = re.compile(r'\b(?:' + alternation + r')\b', flags)
+
+    def apply(self, text: str) -> str:
+        for stage in self.stages:
+            replacements = stage.replacements
+            if self.ignore_case:
+                text = stage.pattern.sub(lambda m: replacements[m.group(0).lower()], text)
+            else:
+                text = stage.pattern.sub(lambda m: replacements[m.group(0)], text)
+        return text
+
+
+# Tables are compiled once at import and shared by all parsers
+ITEM_CORRECTION_TABLE = CorrectionTable(ITEM_CORRECTIONS)
+MENU_CORRECTION_TABLE = CorrectionTable(MENU_CORRECTIONS, re.IGNORECASE)
@@ -1,10 +1,18 @@
-import io
-import pytesseract
-from PIL import Image
-import cv2
-import numpy as np
+import os
 import re
-from pytesseract import Output
+from concurrent.futures import TimeoutError as FuturesTimeout, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from .deadline import DeadlineExceeded
+from .document_image import DocumentImage, OCR_CROP_RECEIPT, OCR_FAST_DECODE
+from .normalization import ITEM_CORRECTION_TABLE, PRICE_PATTERNS, QTY_PATTERNS
+from .ocr_backend import get_backend, get_worker_pool, reset_worker_pool, in_worker
+from .ocr_cache import ocr_cache
+from .ocr_result import OcrResult
+from .ocr_tiers import TIER_FAST, TIER_FULL
+from .ocr_strategy import OCR_STRATEGY_ENABLED, config_key, ocr_strategy
+from .store_layout import (OCR_STORE_LAYOUTS, STORE_LAYOUT_MIN_ITEMS, STORE_LAYOUT_MIN_SHARE, layout_fingerprint,
+                           store_layouts)
+from .strip_ocr import OCR_STRIP_PARALLEL, ocr_strips, should_split
 
 IGNORE_KEYWORDS = {'TOTAL','SUBTOTAL','SUB-TOTAL','TAX','VAT','CHANGE','CASH','CARD','BALANCE','PAY','AMOUNT','DISCOUNT'}
 
@@ -12,100 +20,76 @@ PRICE_RE_END = re.compile(r'(\d{1,5}(?:[\.,]\d{2})?)\s*(?:$|[€£$]|EUR|USD|GBP
 QTY_X_RE = re.compile(r'(\d+)\s*[xX]')
 QTY_PCS_RE = re.compile(r'(\d+)\s*(?:pcs?|PK|pack)', re.I)
 
+# Lines containing any of these (after stripping non-letters) are not items
+SKIP_LINE_KEYWORDS = {
+    'TOTAL','SUBTOTAL','SUB-TOTAL','TAX','VAT','CHANGE','CASH','CARD','BALANCE','PAY',
+    'AMOUNT','DISCOUNT','TIP','SERVICE','GRATUITY','TABLE','SEAT','SERVER','BILL',
+    'INVOICE','RECEIPT','THANK','YOU','WELCOME','CUSTOMER','GUEST','ORDER','ITEM',
+    'QTY','QUANTITY','PRICE','UNIT','RATE','DESCRIPTION','PRODUCT','NAME','NUMBER'
+}
+
+# Cleaned names that are totals rather than items
+SKIP_ITEM_NAMES = {'total', 'subtotal', 'tax', 'vat', 'change', 'cash', 'card', 'balance', 'pay', 'amount', 'discount', 'tip', 'service', 'gratuity'}
+
+_NOISE_RE = re.compile(r'[^\w\s\-.,]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NUMBER_RE = re.compile(r'\d+(\.\d+)?')
+_UNIT_RE = re.compile(r'\b(?:kg|g|lb|oz|l|ml|liter|gram|pound|ounce|pack|piece|item|each)\b')
+_NON_UPPER_RE = re.compile(r'[^A-Z ]+')
+_SKIP_LINE_RE = re.compile('|'.join(re.escape(k) for k in SKIP_LINE_KEYWORDS))
+_CODE_RE = re.compile(r'^[A-Z0-9]{1,3}$')
+_NO_WORD_RE = re.compile(r'^[^\w]*$')
+
+# OCR configurations tried by extract_items_from_image, in order
+OCR_CONFIGURATIONS = [
+    {'preprocess': True, 'config': '--oem 3 --psm 6', 'lang': 'eng'},
+    {'preprocess': True, 'config': '--oem 3 --psm 3', 'lang': 'eng'},  # Better for uniform text
+    {'preprocess': False, 'config': '--oem 3 --psm 6', 'lang': 'eng'},  # No preprocessing
+    {'preprocess': True, 'config': '--oem 1 --psm 6', 'lang': 'eng'},  # Neural nets OCR
+]
+
+# OCR only the item list between header and totals, located from the shared pass
+OCR_ITEM_BAND = os.environ.get('OCR_ITEM_BAND', '0') == '1'
+
+# Run the configurations concurrently in the shared OCR worker pool
+OCR_PARALLEL = os.environ.get('OCR_PARALLEL', '0') == '1'
+
+# Stop running configurations once this many items were found (0 disables)
+# by a pass whose mean word confidence is at least OCR_EARLY_EXIT_CONFIDENCE
+OCR_EARLY_EXIT_ITEMS = int(os.environ.get('OCR_EARLY_EXIT_ITEMS', '0'))
+OCR_EARLY_EXIT_CONFIDENCE = float(os.environ.get('OCR_EARLY_EXIT_CONFIDENCE', '0'))
+
 def preprocess_image_bytes(image_bytes: bytes):
-    img = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-    max_side = max(img.size)
-    if max_side < 1200:
-        scale = 1200 / max_side
-        img = img.resize((int(img.width*scale), int(img.height*scale)))
-    img_cv = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-    gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
-    gray = cv2.GaussianBlur(gray, (3,3), 0)
-    th = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
-    return Image.fromarray(th)
+    return DocumentImage(image_bytes).preprocessed
 
 def clean_item_name(raw: str) -> str:
     """Enhanced item name cleaning with better normalization."""
     text = raw.lower().strip()
 
     # Remove common OCR artifacts and noise
-    text = re.sub(r'[^\w\s\-.,]', ' ', text)  # Replace non-alphanumeric with spaces
-    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+    text = _NOISE_RE.sub(' ', text)  # Replace non-alphanumeric with spaces
+    text = _WHITESPACE_RE.sub(' ', text)  # Normalize whitespace
 
     # Common OCR typo corrections and standardizations
-    corrections = {
-        # Common OCR errors
-        'mi1k': 'milk', 'mil': 'milk', 'mik': 'milk',
-        'brea': 'bread', 'bre': 'bread',
-        'chic': 'chicken', 'chick': 'chicken', 'chi': 'chicken',
-        'chee': 'cheese', 'ches': 'cheese',
-        'toma': 'tomato', 'tomat': 'tomato',
-        'pota': 'potato', 'potat': 'potato',
-        'appl': 'apple', 'app': 'apple',
-        'bana': 'banana', 'ban': 'banana',
-        'eggi': 'eggs', 'egg': 'eggs',
-        'beef': 'beef', 'bee': 'beef',
-        'rice': 'rice', 'ric': 'rice',
-        'past': 'pasta', 'pas': 'pasta',
-
-        # Common variations and abbreviations
-        'whole milk': 'milk', 'semi skimmed': 'milk', 'skim milk': 'milk',
-        'white bread': 'bread', 'brown bread': 'bread', 'wholemeal': 'bread',
-        'free range eggs': 'eggs', 'large eggs': 'eggs', 'medium eggs': 'eggs',
-        'chicken breast': 'chicken', 'chicken thigh': 'chicken',
-        'ground beef': 'beef', 'minced beef': 'beef', 'steak': 'beef',
-        'cheddar cheese': 'cheese', 'mozzarella': 'cheese', 'parmesan': 'cheese',
-        'cherry tomato': 'tomato', 'plum tomato': 'tomato',
-        'baking potato': 'potato', 'new potato': 'potato',
-        'braeburn apple': 'apple', 'granny smith': 'apple', 'gala apple': 'apple',
-        'fairtrade banana': 'banana',
-        'white rice': 'rice', 'brown rice': 'rice', 'basmati': 'rice', 'jasmine rice': 'rice',
-        'spaghetti': 'pasta', 'penne': 'pasta', 'fusilli': 'pasta', 'macaroni': 'pasta',
-
-        # Units and quantities (remove these)
-        'kg': '', 'kilo': '', 'kilogram': '', 'kilograms': '',
-        'g': '', 'gram': '', 'grams': '',
-        'l': '', 'liter': '', 'litre': '', 'liters': '', 'litres': '',
-        'ml': '', 'milliliter': '', 'millilitre': '', 'milliliters': '', 'millilitres': '',
-        'lb': '', 'lbs': '', 'pound': '', 'pounds': '',
-        'oz': '', 'ounce': '', 'ounces': '',
-        'pack': '', 'packet': '', 'pack of': '', 'pk': '',
-        'pc': '', 'piece': '', 'pieces': '', 'pcs': '',
-        'ea': '', 'each': '', 'item': '',
-    }
-
-    # Apply corrections
-    for wrong, correct in corrections.items():
-        text = re.sub(r'\b' + re.escape(wrong) + r'\b', correct, text)
+    text = ITEM_CORRECTION_TABLE.apply(text)
 
     # Remove numbers and units that weren't caught above
-    text = re.sub(r'\d+(\.\d+)?', '', text)  # Remove numbers
-    text = re.sub(r'\b(?:kg|g|lb|oz|l|ml|liter|gram|pound|ounce|pack|piece|item|each)\b', '', text)
+    text = _NUMBER_RE.sub('', text)  # Remove numbers
+    text = _UNIT_RE.sub('', text)
 
     # Clean up extra spaces and normalize
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
 
     # Skip if it's a total/subtotal keyword
-    skip_keywords = ['total', 'subtotal', 'tax', 'vat', 'change', 'cash', 'card', 'balance', 'pay', 'amount', 'discount', 'tip', 'service', 'gratuity']
-    if text in skip_keywords:
+    if text in SKIP_ITEM_NAMES:
         return ""
 
     return text.capitalize()
 
 def _reconstruct_lines(img):
-    cfg = '--oem 3 --psm 6'
-    df = pytesseract.image_to_data(img, output_type=Output.DATAFRAME, config=cfg, lang='eng')
-    df = df.dropna(subset=['text']).copy()
-    df = df[df['conf'] > 40]
-    lines = []
-    if df.empty:
-        return lines
-    for key, group in df.groupby(['page_num','block_num','par_num','line_num']):
-        g = group.sort_values('left')
-        text = ' '.join(str(t) for t in g['text'].tolist()).strip()
-        if text:
-            lines.append(text)
-    return lines
+    data = get_backend().image_to_data(img, config='--oem 3 --psm 6', lang='eng')
+    result = OcrResult.from_data(data, min_conf=40)
+    return [line.text for line in result.lines if line.text]
 
 def _parse_line(line: str):
     """Enhanced line parsing with better price and quantity detection."""
@@ -114,27 +98,13 @@ def _parse_line(line: str):
         return None
 
     # Skip non-item lines more aggressively
-    up = re.sub(r'[^A-Z ]+', '', raw.upper())
-    extended_skip_keywords = {
-        'TOTAL','SUBTOTAL','SUB-TOTAL','TAX','VAT','CHANGE','CASH','CARD','BALANCE','PAY',
-        'AMOUNT','DISCOUNT','TIP','SERVICE','GRATUITY','TABLE','SEAT','SERVER','BILL',
-        'INVOICE','RECEIPT','THANK','YOU','WELCOME','CUSTOMER','GUEST','ORDER','ITEM',
-        'QTY','QUANTITY','PRICE','UNIT','RATE','DESCRIPTION','PRODUCT','NAME','NUMBER'
-    }
-
-    if any(k in up for k in extended_skip_keywords):
+    up = _NON_UPPER_RE.sub('', raw.upper())
+    if _SKIP_LINE_RE.search(up):
         return None
 
-    # Enhanced price regex patterns
-    price_patterns = [
-        r'(\d{1,5}(?:[\.,]\d{2})?)\s*(?:$|[€£$]|EUR|USD|GBP)',  # Price at end
-        r'(?:€|£|\$|EUR|USD|GBP)\s*(\d{1,5}(?:[\.,]\d{2})?)',    # Currency at start
-        r'(\d{1,5}(?:[\.,]\d{2})?)\s*(?:€|£|\$)',                # Price with currency
-    ]
-
     price = None
-    for pattern in price_patterns:
-        m = re.search(pattern, raw)
+    for pattern in PRICE_PATTERNS:
+        m = pattern.search(raw)
         if m:
             price_str = m.group(1).replace(',', '.')
             try:
@@ -150,17 +120,9 @@ def _parse_line(line: str):
     name_part = raw[:raw.find(m.group(0))].strip(' -:')
 
     # Enhanced quantity detection
-    qty_patterns = [
-        r'^(\d+)\s*[xX]\s*',  # 2x, 3x format
-        r'(\d+)\s*(?:pcs?|PK|pack|pieces?|items?)',  # 2 pcs, 3 pack
-        r'\((\d+)\)',  # (2) format
-        r'qty[:\s]*(\d+)',  # qty: 2 format
-        r'quantity[:\s]*(\d+)',  # quantity: 2 format
-    ]
-
     qty = 1
-    for pattern in qty_patterns:
-        q_match = re.search(pattern, raw, re.IGNORECASE)
+    for pattern in QTY_PATTERNS:
+        q_match = pattern.search(raw)
         if q_match:
             try:
                 qty = int(q_match.group(1))
@@ -174,7 +136,7 @@ def _parse_line(line: str):
         return None
 
     # Additional validation - skip if name is too short or looks like a code
-    if len(name) < 2 or re.match(r'^[A-Z0-9]{1,3}$', name.upper()):
+    if len(name) < 2 or _CODE_RE.match(name.upper()):
         return None
 
     return {
@@ -185,44 +147,108 @@ def _parse_line(line: str):
         'confidence': 'high' if qty > 1 else 'medium'
     }
 
-def extract_items_from_image(image_bytes: bytes):
-    """Enhanced item extraction with multiple OCR strategies."""
-    items = []
+def extract_items_from_image(image, parallel=None, use_cache=True, document_type='grocery'):
+    """Enhanced item extraction with multiple OCR strategies.
+
+    Accepts raw image bytes or a DocumentImage; the image is decoded and
+    preprocessed once and shared by every configuration. With ``parallel``
+    (default: OCR_PARALLEL) the configurations are submitted to a process
+    pool at once and merged as they complete. Tall receipts can instead be
+    split into strips recognised in parallel (OCR_STRIP_PARALLEL). Results
+    are cached by image content, so a repeated upload skips tesseract
+    entirely. Which configurations run, and in what order, is planned
+    from what contributed items for earlier ``document_type`` documents
+    (see ocr_strategy). Receipts whose layout matches a store seen before
+    only OCR that store's item region with its best configuration (see
+    store_layout). When the document's deadline runs out, configurations
+    that have not run are skipped and the items found so far are returned
+    uncached; the skipped stages are recorded on the deadline. Below the
+    ``full`` quality tier (``document.tier``) only the most productive
+    configuration runs, in the ``fast`` tier on the item band only; those
+    results are not cached either.
+    """
+    document = DocumentImage.coerce(image)
+    deadline = document.deadline
+    tier = document.tier
+    if parallel is None:
+        parallel = OCR_PARALLEL
+    # Pool workers never fan out again
+    parallel = parallel and not in_worker()
+
+    cache_key = ocr_cache.make_key(document.sha256, 'extract_items', extraction_config())
+    if use_cache:
+        cached = ocr_cache.get(cache_key)
+        if cached is not None:
+            return cached['items']
+
+    # Repeat retailers skip the configuration search
+    fingerprint = None
+    if OCR_STORE_LAYOUTS:
+        try:
+            fingerprint = layout_fingerprint(document.ocr(), document.preprocessed.width)
+        except DeadlineExceeded:
+            deadline.skip('store_layout')
+    if fingerprint is not None:
+        found = _extract_items_with_layout(document, fingerprint[0])
+        if found is not None:
+            layout_items, layout_lines = found
+            if use_cache and tier == TIER_FULL and not deadline.skipped:
+                ocr_cache.put(cache_key, {'lines': layout_lines, 'items': layout_items})
+            return layout_items
 
     # Try multiple preprocessing and OCR configurations
-    configurations = [
-        {'preprocess': True, 'config': '--oem 3 --psm 6', 'lang': 'eng'},
-        {'preprocess': True, 'config': '--oem 3 --psm 3', 'lang': 'eng'},  # Better for uniform text
-        {'preprocess': False, 'config': '--oem 3 --psm 6', 'lang': 'eng'},  # No preprocessing
-        {'preprocess': True, 'config': '--oem 1 --psm 6', 'lang': 'eng'},  # Neural nets OCR
-    ]
-
-    for config in configurations:
+    band = None
+    if OCR_ITEM_BAND or tier == TIER_FAST:
         try:
-            if config['preprocess']:
-                img = preprocess_image_bytes(image_bytes)
-            else:
-                img = Image.open(io.BytesIO(image_bytes)).convert('RGB')
-
-            # Try structured text extraction first
-            lines = _reconstruct_lines_enhanced(img, config['config'], config['lang'])
-            for ln in lines:
-                it = _parse_line(ln)
-                if it and it['name'] not in [item['name'] for item in items]:
-                    items.append(it)
-
-            # If no items found with structured extraction, try full text extraction
-            if not items:
-                text = pytesseract.image_to_string(img, lang=config['lang'], config=config['config'])
-                for line in text.splitlines():
-                    it = _parse_line(line)
-                    if it and it['name'] not in [item['name'] for item in items]:
-                        items.append(it)
-
-        except Exception as e:
-            print(f"OCR configuration {config} failed: {e}")
-            continue
+            band = document.item_band()
+        except DeadlineExceeded:
+            deadline.skip('item_band')
+    configurations = ocr_strategy.plan(document_type, OCR_CONFIGURATIONS)
+    if tier != TIER_FULL:
+        configurations = configurations[:1]
+    jobs = [(_configuration_image(document, config, band), config) for config in configurations]
+    # The classifier's pass is one of the configurations; its words are reused
+    seeded = _seeded_configurations(document, configurations) if band is None else {}
+
+    # Tall receipts already spread each configuration's strips over the pool
+    if any(should_split(img) for img, _ in jobs):
+        parallel = False
 
+    lines = []
+    sources = {}
+    ran = []
+    if parallel:
+        items = _extract_items_parallel(jobs, lines, sources, ran, deadline, seeded)
+    else:
+        items = _extract_items_sequential(jobs, lines, sources, ran, deadline, seeded)
+
+    unique_items = _rank_items(items)
+
+    # Credit each accepted item to the configuration that found it first.
+    # Lower tiers run only the current leader, so counting their runs would
+    # lock the ranking in; only full-tier runs are recorded
+    if tier == TIER_FULL:
+        contributions = {}
+        for item in unique_items:
+            source = sources.get(item['name'])
+            contributions[source] = contributions.get(source, 0) + 1
+        ocr_strategy.record(document_type, ran, contributions)
+
+        if fingerprint is not None:
+            _learn_store_layout(fingerprint, ran, contributions, unique_items)
+
+    # Partial results are not cached, a later upload may have more time
+    if use_cache and tier == TIER_FULL and not deadline.skipped:
+        ocr_cache.put(cache_key, {'lines': lines, 'items': unique_items})
+
+    return unique_items
+
+def extract_items_from_text(text: str):
+    """Parse items from text that needs no OCR, e.g. a digital receipt."""
+    return _rank_items([item for item in (_parse_line(line) for line in text.splitlines()) if item])
+
+def _rank_items(items):
+    """Drop repeated names and keep the 20 most confident items."""
     # Remove duplicates and sort by confidence
     unique_items = []
     seen_names = set()
@@ -238,23 +264,253 @@ def extract_items_from_image(image_bytes: bytes):
 
     return unique_items[:20]  # Return top 20 items
 
-def _reconstruct_lines_enhanced(img, config, lang):
-    """Enhanced line reconstruction with better text grouping."""
-    df = pytesseract.image_to_data(img, output_type=Output.DATAFRAME, config=config, lang=lang)
-    df = df.dropna(subset=['text']).copy()
-    df = df[df['conf'] > 30]  # Lower confidence threshold
+def extraction_config():
+    """Everything besides the image that determines extract_items_from_image output."""
+    return {
+        'configurations': OCR_CONFIGURATIONS,
+        'early_exit': [OCR_EARLY_EXIT_ITEMS, OCR_EARLY_EXIT_CONFIDENCE],
+        'crop_receipt': OCR_CROP_RECEIPT,
+        'fast_decode': OCR_FAST_DECODE,
+        'item_band': OCR_ITEM_BAND,
+        'strips': OCR_STRIP_PARALLEL,
+        'strategy': OCR_STRATEGY_ENABLED,
+        'store_layouts': [OCR_STORE_LAYOUTS, STORE_LAYOUT_MIN_ITEMS, STORE_LAYOUT_MIN_SHARE],
+    }
+
+def _configuration_image(document, config, band=None):
+    """Image a configuration runs on, cropped to the item band when one was found."""
+    if band is not None:
+        return document.band_image(band, preprocess=config['preprocess'])
+    return document.preprocessed if config['preprocess'] else document.image
+
+def _extract_items_with_layout(document, fingerprint):
+    """Items read with a store's learned layout, or None to run the full search.
+
+    The item band comes from the shared pass when its totals line was found
+    and from the learned header height otherwise; only the learned columns
+    are OCR'd, with the learned configuration.
+    """
+    layout = store_layouts.get(fingerprint)
+    if layout is None:
+        return None
+
+    width, height = document.preprocessed.size
+    band = document.item_band() or layout.band(width, height)
+    img = document.band_image(band, preprocess=layout.config['preprocess'], span=layout.span(width))
 
     lines = []
-    if df.empty:
-        return lines
+    items = _rank_items(_extract_items_sequential([(img, layout.config)], lines, deadline=document.deadline))
+    if not layout.enough_items(len(items)):
+        return None
+    return items, lines
+
+def _learn_store_layout(fingerprint, ran, contributions, items):
+    """Remember the layout and most productive configuration of a receipt."""
+    if len(items) < STORE_LAYOUT_MIN_ITEMS or not ran:
+        return
+    key, layout = fingerprint
+    layout.config = max(ran, key=lambda config: contributions.get(config_key(config), 0))
+    layout.items = len(items)
+    store_layouts.put(key, layout)
+
+def _seeded_configurations(document, configurations):
+    """Lines and confidence of the configurations already run on the whole image, by key."""
+    seeded = {}
+    for config in configurations:
+        result = document.cached_ocr(config['config'], config['lang'], config['preprocess'])
+        if result is not None:
+            seeded[config_key(config)] = _lines_from_result(result)
+    return seeded
+
+def _extract_items_sequential(jobs, lines, sources=None, ran=None, deadline=None, seeded=None):
+    """Run the configurations one after another, collecting their lines into ``lines``.
+
+    ``sources`` maps each item name to the key of the configuration that
+    found it; configurations that completed are appended to ``ran``.
+    Configurations the ``deadline`` leaves no time for are skipped, and
+    those in ``seeded`` (see _seeded_configurations) are not OCR'd again.
+    """
+    items = []
+    best_confidence = 0.0
+
+    for img, config in jobs:
+        shared = (seeded or {}).get(config_key(config))
+        if shared is None and deadline is not None and deadline.expired():
+            deadline.skip(_stage_name(config))
+            continue
+        timeout = deadline.timeout() if deadline is not None else 0
+        try:
+            # Try structured text extraction first
+            found, confidence, config_lines = _run_configuration(img, config, fallback=False, timeout=timeout,
+                                                                 shared=shared)
+            lines.extend(config_lines)
+            _merge_items(items, found, sources, config)
+
+            # If no items found with structured extraction, try full text extraction
+            if not items:
+                timeout = deadline.timeout() if deadline is not None else 0
+                _merge_items(items, _full_text_items(img, config, timeout), sources, config)
+
+        except DeadlineExceeded:
+            deadline.skip(_stage_name(config))
+            continue
+        except Exception as e:
+            print(f"OCR configuration {config} failed: {e}")
+            continue
 
-    # Group by line with better logic
-    for key, group in df.groupby(['page_num','block_num','par_num','line_num']):
-        g = group.sort_values('left')
-        text = ' '.join(str(t) for t in g['text'].tolist()).strip()
+        if ran is not None:
+            ran.append(config)
+        best_confidence = max(best_confidence, confidence)
+        if _early_exit_reached(items, best_confidence):
+            break
 
-        # Filter out very short or meaningless text
-        if text and len(text) > 1 and not re.match(r'^[^\w]*$', text):
-            lines.append(text)
+    return items
 
-    return lines
+def _extract_items_parallel(jobs, lines, sources=None, ran=None, deadline=None, seeded=None):
+    """Run the configurations concurrently, merging results as they arrive.
+
+    Configurations in ``seeded`` are merged first without OCR. Once the
+    early-exit threshold is met, configurations that have not started yet
+    are cancelled and running ones are no longer waited for. The same
+    happens when the ``deadline`` runs out.
+    """
+    items = []
+    best_confidence = 0.0
+    timeout = deadline.timeout() if deadline is not None else 0
+    done = set()
+
+    seeded = seeded or {}
+    pending = [(img, config) for img, config in jobs if config_key(config) not in seeded]
+
+    try:
+        executor = get_worker_pool()
+        futures = {executor.submit(_run_configuration, img, config, True, timeout): config for img, config in pending}
+    except (BrokenProcessPool, RuntimeError) as e:
+        print(f"OCR pool unavailable, running configurations sequentially: {e}")
+        reset_worker_pool()
+        return _extract_items_sequential(jobs, lines, sources, ran, deadline, seeded)
+
+    try:
+        # Passes that already ran are merged while the pool works on the rest
+        for img, config in jobs:
+            shared = seeded.get(config_key(config))
+            if shared is None:
+                continue
+            try:
+                found, confidence, config_lines = _run_configuration(img, config, timeout=timeout, shared=shared)
+            except DeadlineExceeded:
+                deadline.skip(_stage_name(config))
+                continue
+            except Exception as e:
+                print(f"OCR configuration {config} failed: {e}")
+                continue
+            lines.extend(config_lines)
+            _merge_items(items, found, sources, config)
+            if ran is not None:
+                ran.append(config)
+            best_confidence = max(best_confidence, confidence)
+        if _early_exit_reached(items, best_confidence):
+            return items
+
+        for future in as_completed(futures, timeout=deadline.remaining() if deadline is not None else None):
+            config = futures[future]
+            done.add(future)
+            try:
+                found, confidence, config_lines = future.result()
+            except DeadlineExceeded:
+                deadline.skip(_stage_name(config))
+                continue
+            except BrokenProcessPool as e:
+                print(f"OCR configuration {config} failed: {e}")
+                reset_worker_pool()
+                continue
+            except Exception as e:
+                print(f"OCR configuration {config} failed: {e}")
+                continue
+
+            lines.extend(config_lines)
+            _merge_items(items, found, sources, config)
+            if ran is not None:
+                ran.append(config)
+            best_confidence = max(best_confidence, confidence)
+            if _early_exit_reached(items, best_confidence):
+                break
+    except FuturesTimeout:
+        for future, config in futures.items():
+            if future not in done:
+                deadline.skip(_stage_name(config))
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return items
+
+def _run_configuration(img, config, fallback=True, timeout=0, shared=None):
+    """Run one OCR configuration and parse its lines into items.
+
+    Returns the items, the mean tesseract confidence of the words they
+    were read from and the reconstructed lines. With ``fallback``, full
+    text extraction is tried when structured extraction yields nothing.
+    ``timeout`` bounds each tesseract call. ``shared`` holds the (lines,
+    confidence) of a pass that already ran, which is parsed instead.
+    """
+    if shared is not None:
+        lines, confidence = shared
+    elif should_split(img):
+        lines, confidence = ocr_strips(img, config['config'], config['lang'], _reconstruct_lines_enhanced, timeout)
+    else:
+        lines, confidence = _reconstruct_lines_enhanced(img, config['config'], config['lang'], timeout)
+    items = []
+    _merge_items(items, (_parse_line(ln) for ln in lines))
+
+    if fallback and not items:
+        _merge_items(items, _full_text_items(img, config, timeout))
+
+    return items, confidence, lines
+
+def _stage_name(config):
+    """Label of a configuration in the skipped stages of a deadline."""
+    return f"ocr {config['config']}" + ('' if config['preprocess'] else ' (no preprocessing)')
+
+def _full_text_items(img, config, timeout=0):
+    """Parse items from plain image_to_string output."""
+    text = get_backend().image_to_string(img, lang=config['lang'], config=config['config'], timeout=timeout)
+    return [_parse_line(line) for line in text.splitlines()]
+
+def _merge_items(items, candidates, sources=None, config=None):
+    """Append parsed items whose name has not been seen yet.
+
+    With ``sources``, each new item's name is mapped to ``config``'s key.
+    """
+    names = {item['name'] for item in items}
+    for it in candidates:
+        if it and it['name'] not in names:
+            items.append(it)
+            names.add(it['name'])
+            if sources is not None:
+                sources[it['name']] = config_key(config)
+
+def _early_exit_reached(items, confidence):
+    if OCR_EARLY_EXIT_ITEMS <= 0:
+        return False
+    return len(items) >= OCR_EARLY_EXIT_ITEMS and confidence >= OCR_EARLY_EXIT_CONFIDENCE
+
+def _reconstruct_lines_enhanced(img, config, lang, timeout=0):
+    """Enhanced line reconstruction with better text grouping.
+
+    Returns the lines and the mean confidence of the words kept.
+    """
+    return _lines_from_data(get_backend().image_to_data(img, config=config, lang=lang, timeout=timeout))
+
+def _lines_from_data(data, min_conf=30):
+    """Group image_to_data words into lines in one pass, keeping their boxes (see OcrResult)."""
+    return _lines_from_result(OcrResult.from_data(data, min_conf=min_conf))  # Lower confidence threshold
+
+def _lines_from_result(result, min_conf=30):
+    """Item lines and mean confidence of the words of an OcrResult above ``min_conf``."""
+    if any(word.conf <= min_conf for word in result.words):
+        result = OcrResult([word for word in result.words if word.conf > min_conf])
+
+    # Filter out very short or meaningless text
+    lines = [line.text for line in result.lines if len(line.text) > 1 and not _NO_WORD_RE.match(line.text)]
+    return lines, result.conf
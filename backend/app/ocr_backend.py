@@ -0,0 +1,232 @@
+"""
+OCR engine backends.
+
+Every tesseract call in the OCR layer goes through ``get_backend()``:
+
+- ``pytesseract`` (default) spawns a tesseract process per call.
+- ``tesserocr`` keeps warm tesseract engines (traineddata loaded once) in
+  long-lived worker processes and talks to them over the process pool's
+  pipes, so a page costs recognition time only.
+
+The backend is selected with OCR_BACKEND. If tesserocr is not installed the
+pytesseract backend is used instead.
+"""
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pytesseract
+from PIL import Image
+from pytesseract import Output
+from pytesseract.pytesseract import file_to_dict
+
+from .deadline import DeadlineExceeded
+
+OCR_BACKEND = os.environ.get('OCR_BACKEND', 'pytesseract')
+
+# Size of the shared worker pool used by the tesserocr backend and by the
+# parallel configuration fan-out in ocr.py
+OCR_MAX_WORKERS = int(os.environ.get('OCR_MAX_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Languages loaded into every warm worker on startup
+OCR_WARM_LANGS = os.environ.get('OCR_WARM_LANGS', 'eng').split(',')
+
+TSV_HEADER = 'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext'
+
+_OEM_RE = re.compile(r'--oem\s+(\d+)')
+_PSM_RE = re.compile(r'--psm\s+(\d+)')
+
+_backend = None
+_pool = None
+_pool_lock = threading.Lock()
+_in_worker = False
+
+
+class OcrBackend(ABC):
+    """Runs tesseract on an image."""
+
+    name = 'base'
+
+    @abstractmethod
+    def image_to_data(self, image, config: str = '', lang: str = 'eng', timeout: float = 0) -> Dict[str, List]:
+        """Word-level results in pytesseract's Output.DICT layout.
+
+        A non-zero ``timeout`` (seconds) stops recognition with DeadlineExceeded.
+        """
+        pass
+
+    @abstractmethod
+    def image_to_string(self, image, config: str = '', lang: str = 'eng', timeout: float = 0) -> str:
+        """Plain recognised text."""
+        pass
+
+    def warm_up(self) -> None:
+        """Prepare the engine before the first request; a no-op by default."""
+        pass
+
+
+class PytesseractBackend(OcrBackend):
+    """Spawns a tesseract process per call."""
+
+    name = 'pytesseract'
+
+    def image_to_data(self, image, config: str = '', lang: str = 'eng', timeout: float = 0) -> Dict[str, List]:
+        try:
+            return pytesseract.image_to_data(image, output_type=Output.DICT, config=config, lang=lang, timeout=timeout)
+        except RuntimeError as e:
+            raise _timeout_error(e)
+
+    def image_to_string(self, image, config: str = '', lang: str = 'eng', timeout: float = 0) -> str:
+        try:
+            return pytesseract.image_to_string(image, config=config, lang=lang, timeout=timeout)
+        except RuntimeError as e:
+            raise _timeout_error(e)
+
+
+class TesserocrBackend(OcrBackend):
+    """
+    Long-lived tesseract engines kept warm in the shared worker pool.
+
+    Calls made from the API process are shipped to a pool worker; calls made
+    inside a worker (e.g. by the configuration fan-out) use that worker's own
+    engines directly. Engines are cached per (lang, oem) since both are fixed
+    when tesseract initialises, while the page segmentation mode is switched
+    per call.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self):
+        import tesserocr  # noqa: F401 - fail early so get_backend can fall back
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def image_to_data(self, image, config: str = '', lang: str = 'eng', timeout: float = 0) -> Dict[str, List]:
+        if not _in_worker:
+            return get_worker_pool().submit(_worker_image_to_data, image, config, lang, timeout).result()
+        return file_to_dict(self._run(image, config, lang, 'tsv', timeout), '\t', -1)
+
+    def image_to_string(self, image, config: str = '', lang: str = 'eng', timeout: float = 0) -> str:
+        if not _in_worker:
+            return get_worker_pool().submit(_worker_image_to_string, image, config, lang, timeout).result()
+        return self._run(image, config, lang, 'text', timeout)
+
+    def warm_up(self) -> None:
+        for lang in OCR_WARM_LANGS:
+            self._engine(lang, 3)
+
+    def _run(self, image, config: str, lang: str, output: str, timeout: float = 0) -> str:
+        import tesserocr
+
+        oem, psm = _parse_config(config)
+        pixels = _pixel_buffer(image)
+
+        with self._lock:
+            api = self._engine(lang, oem)
+            api.SetPageSegMode(tesserocr.PSM(psm))
+            # Raw pixels; SetImage would encode the image to BMP and decode it again
+            height, width = pixels.shape[:2]
+            channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+            api.SetImageBytes(pixels.tobytes(), width, height, channels, width * channels)
+            if timeout and not api.Recognize(int(timeout * 1000)):
+                raise DeadlineExceeded("Tesseract recognition timeout")
+            if output == 'tsv':
+                return TSV_HEADER + '\n' + api.GetTSVText(0)
+            return api.GetUTF8Text()
+
+    def _engine(self, lang: str, oem: int):
+        import tesserocr
+
+        key = (lang, oem)
+        if key not in self._engines:
+            self._engines[key] = tesserocr.PyTessBaseAPI(lang=lang, oem=tesserocr.OEM(oem))
+        return self._engines[key]
+
+
+BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+
+
+def get_backend() -> OcrBackend:
+    """Return the configured backend, falling back to pytesseract."""
+    global _backend
+    if _backend is None:
+        backend_cls = BACKENDS.get(OCR_BACKEND, PytesseractBackend)
+        try:
+            _backend = backend_cls()
+        except ImportError as e:
+            print(f"OCR backend '{OCR_BACKEND}' unavailable, using pytesseract: {e}")
+            _backend = PytesseractBackend()
+    return _backend
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """Shared pool of long-lived OCR worker processes, created on first use."""
+    global _pool
+    # OCR executor threads ask for the pool concurrently; create it only once
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=OCR_MAX_WORKERS, initializer=_init_worker)
+        return _pool
+
+
+def reset_worker_pool() -> None:
+    """Drop a broken pool so the next call starts fresh workers."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def in_worker() -> bool:
+    """True inside a pool worker, where work must not be fanned out again."""
+    return _in_worker
+
+
+def _init_worker():
+    global _in_worker
+    _in_worker = True
+    try:
+        get_backend().warm_up()
+    except Exception as e:
+        print(f"OCR worker warm-up failed: {e}")
+
+
+def _worker_image_to_data(image, config, lang, timeout=0):
+    return get_backend().image_to_data(image, config=config, lang=lang, timeout=timeout)
+
+
+def _worker_image_to_string(image, config, lang, timeout=0):
+    return get_backend().image_to_string(image, config=config, lang=lang, timeout=timeout)
+
+
+def _timeout_error(error: RuntimeError) -> Exception:
+    """DeadlineExceeded for pytesseract's timeout error, anything else unchanged."""
+    if str(error) == 'Tesseract process timeout':
+        return DeadlineExceeded(str(error))
+    return error
+
+
+def _pixel_buffer(image) -> np.ndarray:
+    """Contiguous 8-bit grayscale or RGB array of a PIL image or NumPy array."""
+    if isinstance(image, Image.Image):
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+        image = np.asarray(image)
+    elif image.ndim == 3 and image.shape[2] == 4:
+        image = image[:, :, :3]
+    return np.ascontiguousarray(image, dtype=np.uint8)
+
+
+def _parse_config(config: str):
+    """Extract (oem, psm) from a tesseract command-line config string."""
+    oem = _OEM_RE.search(config)
+    psm = _PSM_RE.search(config)
+    return (int(oem.group(1)) if oem else 3), (int(psm.group(1)) if psm else 3)
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from .sqlite_store import SqliteStore
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+OCR_CACHE_ENABLED = os.environ.get('OCR_CACHE', '1') == '1'
+OCR_CACHE_PATH = os.environ.get('OCR_CACHE_PATH', os.path.join(BASE_DIR, 'ocr_cache.sqlite3'))
+OCR_CACHE_MAX_BYTES = int(os.environ.get('OCR_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Bump when OCR or parsing output changes so stale entries stop matching
+CACHE_VERSION = 1
+
+
+class OcrCache(SqliteStore):
+    """
+    Content-addressed store for OCR output, persisted in a local SQLite file.
+
+    Entries are keyed by the SHA-256 of the uploaded bytes plus the OCR
+    configuration that produced them, and are evicted least recently used
+    first once the stored payloads exceed ``max_bytes``. Hit and miss
+    counters are kept in the same file so every worker process reports
+    the same totals.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entries ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access)",
+        "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    )
+
+    def __init__(self, path: str, max_bytes: int, enabled: bool = True):
+        super().__init__(path, enabled)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(digest: str, namespace: str, config: Any) -> str:
+        """Combine a content digest with the configuration that produced the entry."""
+        fingerprint = json.dumps([CACHE_VERSION, namespace, config], sort_keys=True, default=str)
+        return f"{digest}:{hashlib.sha256(fingerprint.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for ``key`` or None, counting the lookup."""
+        if not self.enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self._bump(conn, 'misses')
+                    return None
+                conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._bump(conn, 'hits')
+                return json.loads(row[0])
+        except sqlite3.Error as e:
+            print(f"OCR cache lookup failed: {e}")
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store ``value`` under ``key`` and evict old entries past the size bound."""
+        if not self.enabled:
+            return
+        payload = json.dumps(value, default=str)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, payload, len(payload), time.time())
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"OCR cache store failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters plus the current entry count and size."""
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'entries': 0, 'bytes': 0}
+        if not self.enabled:
+            return stats
+        try:
+            with self._connect() as conn:
+                for name, value in conn.execute("SELECT name, value FROM counters"):
+                    stats[name] = value
+                entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+                stats['entries'] = entries
+                stats['bytes'] = size
+        except sqlite3.Error as e:
+            print(f"OCR cache stats failed: {e}")
+        return stats
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._bump(conn, 'evictions', evicted)
+
+    def _bump(self, conn: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+
+# Global cache instance
+ocr_cache = OcrCache(OCR_CACHE_PATH, OCR_CACHE_MAX_BYTES, enabled=OCR_CACHE_ENABLED)
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# Where CPU-bound upload stages run: 'thread' or 'process'
+OCR_EXECUTOR = os.environ.get('OCR_EXECUTOR', 'thread')
+OCR_EXECUTOR_WORKERS = int(os.environ.get('OCR_EXECUTOR_WORKERS', os.cpu_count() or 1))
+
+# Requests admitted at once (running plus waiting for a worker)
+OCR_MAX_IN_FLIGHT = int(os.environ.get('OCR_MAX_IN_FLIGHT', OCR_EXECUTOR_WORKERS * 2))
+
+# Seconds clients are told to wait when the queue is full
+OCR_RETRY_AFTER = int(os.environ.get('OCR_RETRY_AFTER', 5))
+
+
+class ExecutorBusy(Exception):
+    """Raised instead of queueing when the in-flight limit is reached."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"OCR queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """
+    Runs blocking work off the event loop with a cap on admitted requests.
+
+    Work beyond ``max_in_flight`` is rejected immediately with ExecutorBusy
+    rather than queued, so a burst of uploads fails fast instead of stalling
+    every request on the worker.
+    """
+
+    def __init__(self, kind: str, max_workers: int, max_in_flight: int, retry_after: int):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func`` in the executor, or raise ExecutorBusy if the queue is full."""
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self._rejected += 1
+                raise ExecutorBusy(self.retry_after)
+            self._in_flight += 1
+
+        try:
+            future = self._get_executor().submit(func, *args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+                self._failed += 1
+            raise
+        # Released when the work ends rather than when the caller stops
+        # waiting: a cancelled request (client disconnect) keeps its worker busy
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def load(self) -> float:
+        """Share of the in-flight limit currently in use (0.0 - 1.0)."""
+        return self._in_flight / self.max_in_flight if self.max_in_flight else 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                'executor': self.kind,
+                'workers': self.max_workers,
+                'max_in_flight': self.max_in_flight,
+                'in_flight': in_flight,
+                'running': min(in_flight, self.max_workers),
+                'queue_depth': max(0, in_flight - self.max_workers),
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+            }
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ocr')
+        return self._executor
+
+
+# Global executor for upload processing
+ocr_executor = BoundedExecutor(OCR_EXECUTOR, OCR_EXECUTOR_WORKERS, OCR_MAX_IN_FLIGHT, OCR_RETRY_AFTER)
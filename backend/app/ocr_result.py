@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class OcrWord:
+    """A single word recognised by tesseract with its bounding box."""
+    text: str
+    conf: float
+    left: int
+    top: int
+    width: int
+    height: int
+    line_key: Tuple[int, int, int, int]  # (page_num, block_num, par_num, line_num)
+
+    @property
+    def right(self) -> int:
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.top + self.height
+
+
+@dataclass
+class OcrLine:
+    """Words sharing one tesseract line, ordered left to right."""
+    words: List[OcrWord] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return ' '.join(w.text for w in self.words).strip()
+
+    @property
+    def conf(self) -> float:
+        return sum(w.conf for w in self.words) / len(self.words) if self.words else 0.0
+
+    @property
+    def box(self) -> Tuple[int, int, int, int]:
+        """(left, top, right, bottom) of the whole line."""
+        return (
+            min(w.left for w in self.words),
+            min(w.top for w in self.words),
+            max(w.right for w in self.words),
+            max(w.bottom for w in self.words),
+        )
+
+
+class OcrResult:
+    """
+    Words, boxes, confidences and line structure from one image_to_data call.
+
+    Built once per document and shared by the classifier and the parsers so
+    that no stage has to run tesseract again just to get plain text.
+    """
+
+    def __init__(self, words: List[OcrWord]):
+        self.words = words
+        self._lines = None
+
+    @classmethod
+    def from_data(cls, data: Dict[str, list], min_conf: float = -1) -> 'OcrResult':
+        """Build a result from pytesseract's Output.DICT structure.
+
+        Words with a confidence of ``min_conf`` or below are dropped.
+        """
+        words = []
+        for i, text in enumerate(data['text']):
+            text = str(text).strip()
+            conf = float(data['conf'][i])
+            # Structural rows (page/block/para/line) carry no text and conf -1
+            if not text or conf < 0 or conf <= min_conf:
+                continue
+            words.append(OcrWord(
+                text=text,
+                conf=conf,
+                left=int(data['left'][i]),
+                top=int(data['top'][i]),
+                width=int(data['width'][i]),
+                height=int(data['height'][i]),
+                line_key=(int(data['page_num'][i]), int(data['block_num'][i]),
+                          int(data['par_num'][i]), int(data['line_num'][i])),
+            ))
+        return cls(words)
+
+    @property
+    def lines(self) -> List[OcrLine]:
+        """Words grouped into lines in a single pass, in reading order."""
+        if self._lines is None:
+            grouped: Dict[Tuple[int, int, int, int], OcrLine] = {}
+            for word in self.words:
+                grouped.setdefault(word.line_key, OcrLine()).words.append(word)
+            for line in grouped.values():
+                line.words.sort(key=lambda w: w.left)
+            self._lines = list(grouped.values())
+        return self._lines
+
+    @property
+    def conf(self) -> float:
+        """Mean confidence of all words."""
+        return sum(w.conf for w in self.words) / len(self.words) if self.words else 0.0
+
+    @property
+    def text(self) -> str:
+        """Plain text, one OCR line per text line."""
+        return '\n'.join(line.text for line in self.lines)
@@ -0,0 +1,130 @@
+import json
+import os
+import random
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+from .sqlite_store import SqliteStore
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+OCR_STRATEGY_ENABLED = os.environ.get('OCR_STRATEGY', '1') == '1'
+OCR_STRATEGY_PATH = os.environ.get('OCR_STRATEGY_PATH', os.path.join(BASE_DIR, 'ocr_strategy.sqlite3'))
+
+# Runs after which a configuration that never contributed an item is skipped
+OCR_STRATEGY_MIN_RUNS = int(os.environ.get('OCR_STRATEGY_MIN_RUNS', 20))
+
+# Probability of still running a skipped configuration, to keep stats fresh
+OCR_STRATEGY_EXPLORE = float(os.environ.get('OCR_STRATEGY_EXPLORE', 0.1))
+
+
+def config_key(config: Dict[str, Any]) -> str:
+    """Stable identifier of an OCR configuration."""
+    return json.dumps(config, sort_keys=True)
+
+
+class OcrStrategy(SqliteStore):
+    """
+    Learns which OCR configurations pay off, per document type.
+
+    For every extraction, each configuration that ran is recorded together
+    with the number of accepted items it was first to produce. ``plan``
+    orders configurations by how often they contributed and drops the ones
+    that never did after ``min_runs`` tries; a dropped configuration is
+    still run with probability ``explore_rate`` so it can earn its place
+    back. Statistics live in a local SQLite file shared by all workers.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS config_stats ("
+        "document_type TEXT NOT NULL, config TEXT NOT NULL, runs INTEGER NOT NULL, "
+        "contributed INTEGER NOT NULL, items INTEGER NOT NULL, "
+        "PRIMARY KEY (document_type, config))",
+    )
+
+    def __init__(self, path: str, enabled: bool = True, min_runs: int = OCR_STRATEGY_MIN_RUNS,
+                 explore_rate: float = OCR_STRATEGY_EXPLORE, rng: Optional[random.Random] = None):
+        super().__init__(path, enabled)
+        self.min_runs = min_runs
+        self.explore_rate = explore_rate
+        self.rng = rng or random.Random()
+
+    def plan(self, document_type: str, configurations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Configurations to run for ``document_type``, most productive first."""
+        if not self.enabled:
+            return list(configurations)
+
+        stats = self._load(document_type)
+        ranked = []
+        skipped = []
+        for index, config in enumerate(configurations):
+            runs, contributed = stats.get(config_key(config), (0, 0))
+            if runs >= self.min_runs and contributed == 0:
+                skipped.append(config)
+                continue
+            # Untried configurations rank first until they have a record
+            rate = contributed / runs if runs else 1.0
+            ranked.append((-rate, index, config))
+
+        planned = [config for _, _, config in sorted(ranked, key=lambda r: r[:2])]
+        for config in skipped:
+            if not planned or self.rng.random() < self.explore_rate:
+                planned.append(config)
+        return planned
+
+    def record(self, document_type: str, ran: Iterable[Dict[str, Any]], contributions: Dict[str, int]) -> None:
+        """Count one run of each configuration in ``ran`` and the items it contributed."""
+        if not self.enabled:
+            return
+        try:
+            with self._connect() as conn:
+                for config in ran:
+                    key = config_key(config)
+                    items = contributions.get(key, 0)
+                    conn.execute(
+                        "INSERT INTO config_stats (document_type, config, runs, contributed, items) "
+                        "VALUES (?, ?, 1, ?, ?) "
+                        "ON CONFLICT(document_type, config) DO UPDATE SET "
+                        "runs = runs + 1, contributed = contributed + excluded.contributed, "
+                        "items = items + excluded.items",
+                        (document_type, key, 1 if items else 0, items)
+                    )
+        except sqlite3.Error as e:
+            print(f"OCR strategy update failed: {e}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per document type and configuration: runs, runs that contributed, items."""
+        if not self.enabled:
+            return []
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT document_type, config, runs, contributed, items FROM config_stats "
+                    "ORDER BY document_type, contributed DESC"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"OCR strategy stats failed: {e}")
+            return []
+        return [{
+            'document_type': document_type,
+            'config': json.loads(config),
+            'runs': runs,
+            'contributed': contributed,
+            'items': items,
+        } for document_type, config, runs, contributed, items in rows]
+
+    def _load(self, document_type: str) -> Dict[str, tuple]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT config, runs, contributed FROM config_stats WHERE document_type = ?",
+                    (document_type,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"OCR strategy lookup failed: {e}")
+            return {}
+        return {config: (runs, contributed) for config, runs, contributed in rows}
+
+
+# Global strategy instance
+ocr_strategy = OcrStrategy(OCR_STRATEGY_PATH, enabled=OCR_STRATEGY_ENABLED)
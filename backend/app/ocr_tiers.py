@@ -0,0 +1,44 @@
+"""
+OCR quality tiers chosen from the current upload load.
+
+Under load an upload is OCR'd less thoroughly so it returns quickly instead
+of timing out:
+
+- ``full``: every planned configuration (see ocr_strategy)
+- ``single``: only the most productive configuration
+- ``fast``: the most productive configuration on a downscaled image cropped
+  to the receipt and its item band
+
+Tiers are off unless OCR_QUALITY_TIERS=1. The tier is stored on the
+receipt, and with JOB_REOCR=1 receipts below ``full`` are OCR'd again in the
+background once the system is idle (see ``jobs``).
+"""
+import os
+
+TIER_FULL = 'full'
+TIER_SINGLE = 'single'
+TIER_FAST = 'fast'
+
+# Most to least thorough
+TIERS = (TIER_FULL, TIER_SINGLE, TIER_FAST)
+
+# Choose the tier from the OCR executor's load
+OCR_QUALITY_TIERS = os.environ.get('OCR_QUALITY_TIERS', '0') == '1'
+
+# Share of the in-flight limit from which each lower tier is used
+OCR_TIER_SINGLE_LOAD = float(os.environ.get('OCR_TIER_SINGLE_LOAD', 0.5))
+OCR_TIER_FAST_LOAD = float(os.environ.get('OCR_TIER_FAST_LOAD', 0.8))
+
+# Longest side of the image OCR'd in the fast tier
+OCR_FAST_TIER_SIDE = int(os.environ.get('OCR_FAST_TIER_SIDE', 1000))
+
+
+def choose_tier(load: float) -> str:
+    """Tier for an upload admitted at ``load`` (0.0 - 1.0, see BoundedExecutor.load)."""
+    if not OCR_QUALITY_TIERS:
+        return TIER_FULL
+    if load >= OCR_TIER_FAST_LOAD:
+        return TIER_FAST
+    if load >= OCR_TIER_SINGLE_LOAD:
+        return TIER_SINGLE
+    return TIER_FULL
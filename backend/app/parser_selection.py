@@ -0,0 +1,125 @@
+import os
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from .sqlite_store import SqliteStore
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Run several parsers when the classification is ambiguous (off by default:
+# each ambiguous upload then costs one parser run per candidate)
+PARSER_ENSEMBLE = os.environ.get('PARSER_ENSEMBLE', '0') == '1'
+
+# Keyword points within which a runner-up type is also parsed
+PARSER_ENSEMBLE_MARGIN = int(os.environ.get('PARSER_ENSEMBLE_MARGIN', 1))
+
+# Most parsers run for one document, the classified type included
+PARSER_ENSEMBLE_SIZE = int(os.environ.get('PARSER_ENSEMBLE_SIZE', 2))
+
+PARSER_SELECTION_PATH = os.environ.get('PARSER_SELECTION_PATH', os.path.join(BASE_DIR, 'parser_selection.sqlite3'))
+
+_TOTAL_RE = re.compile(r'(?<!sub)total[^\d\n]*(\d+[.,]\d{2})', re.IGNORECASE)
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
+# Units of items that carry a measured quantity instead of a price
+_PRICELESS_UNITS = {'item', 'bill'}
+
+
+def document_total(text: str) -> Optional[float]:
+    """Last "total" amount printed on the document, if any."""
+    totals = _TOTAL_RE.findall(text)
+    if not totals:
+        return None
+    return float(totals[-1].replace(',', '.'))
+
+
+def score_items(items: List[Dict[str, Any]], text: str) -> float:
+    """
+    How plausible a parser's items are for the document text (0.0 - 1.0).
+
+    Combines the number of items, whether their prices add up to the
+    printed total (or, for consumption items, carry a measured quantity)
+    and how much their names look like words rather than OCR noise.
+    """
+    if not items:
+        return 0.0
+    count = 1 - 1 / (1 + len(items))
+
+    prices = [float(item.get('price') or 0) for item in items]
+    total = document_total(text)
+    if total and sum(prices) > 0:
+        consistency = max(0.0, 1 - abs(sum(prices) - total) / total)
+    else:
+        consistency = sum(
+            1 for item, price in zip(items, prices)
+            if price > 0 or (item.get('qty') and item.get('unit') not in _PRICELESS_UNITS)
+        ) / len(items)
+
+    names = 0.0
+    for item in items:
+        name = str(item.get('name', '')).strip()
+        letters = len(_LETTER_RE.findall(name))
+        if letters >= 3:
+            names += letters / len(name.replace(' ', ''))
+    names /= len(items)
+
+    return round(0.4 * count + 0.35 * consistency + 0.25 * names, 4)
+
+
+class ParserSelection(SqliteStore):
+    """
+    Records which candidate type's parser won when several were run for an
+    ambiguous document, per classified type, so the margin and keywords can
+    be tuned.
+    Statistics live in a local SQLite file shared by all workers.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS candidate_stats ("
+        "classified TEXT NOT NULL, candidate TEXT NOT NULL, runs INTEGER NOT NULL, "
+        "wins INTEGER NOT NULL, score REAL NOT NULL, "
+        "PRIMARY KEY (classified, candidate))",
+    )
+
+    def record(self, classified: str, scores: Dict[str, float], winner: str) -> None:
+        """Count one run of every candidate type in ``scores`` and the win of ``winner``."""
+        if not self.enabled:
+            return
+        try:
+            with self._connect() as conn:
+                for candidate, score in scores.items():
+                    conn.execute(
+                        "INSERT INTO candidate_stats (classified, candidate, runs, wins, score) "
+                        "VALUES (?, ?, 1, ?, ?) "
+                        "ON CONFLICT(classified, candidate) DO UPDATE SET "
+                        "runs = runs + 1, wins = wins + excluded.wins, score = score + excluded.score",
+                        (classified, candidate, 1 if candidate == winner else 0, score)
+                    )
+        except sqlite3.Error as e:
+            print(f"Parser selection update failed: {e}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per classified type and candidate type: runs, wins and mean score."""
+        if not self.enabled:
+            return []
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT classified, candidate, runs, wins, score FROM candidate_stats "
+                    "ORDER BY classified, wins DESC"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Parser selection stats failed: {e}")
+            return []
+        return [{
+            'classified': classified,
+            'candidate': candidate,
+            'runs': runs,
+            'wins': wins,
+            'mean_score': round(score / runs, 4) if runs else 0.0,
+        } for classified, candidate, runs, wins, score in rows]
+
+
+# Global selection statistics
+parser_selection = ParserSelection(PARSER_SELECTION_PATH, enabled=PARSER_ENSEMBLE)
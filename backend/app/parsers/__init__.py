@@ -0,0 +1,29 @@
+"""
+Document parsers.
+
+``document_parser`` classifies a document and hands it to the parser
+registered for its type (see ``registry``). Parser modules are imported on
+first use, so importing this package does not load the OCR stack.
+"""
+import importlib
+
+from .base import BaseParser
+from .registry import ParserRegistry, parser_registry, register_parser
+from .document_parser import DocumentParser, document_parser
+
+# Built-in parser classes, importable from here as before the split
+_PARSER_MODULES = {
+    'GroceryParser': 'grocery',
+    'RestaurantParser': 'restaurant',
+    'UtilityParser': 'utility',
+    'InvoiceParser': 'invoice',
+    'TransportParser': 'transport',
+}
+
+
+def __getattr__(name):
+    """Import a built-in parser class only when it is accessed."""
+    module = _PARSER_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f'.{module}', __name__), name)
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from ..document_classifier import DocumentType
+from ..table_extraction import Table, extract_table
+
+if TYPE_CHECKING:
+    from PIL import Image
+    from ..document_image import DocumentImage
+
+
+class BaseParser(ABC):
+    """Base class for all document parsers."""
+
+    def __init__(self, document_type: Union[DocumentType, str]):
+        self.document_type = document_type
+
+    @abstractmethod
+    def parse(self, document: 'DocumentImage') -> List[Dict[str, Any]]:
+        """Parse document and return list of items with quantities and metadata."""
+        pass
+
+    @abstractmethod
+    def parse_text(self, text: str) -> List[Dict[str, Any]]:
+        """Parse the text of a digital document (no OCR) into the same items."""
+        pass
+
+    def preprocess_image(self, document: 'DocumentImage') -> 'Image.Image':
+        """Enhanced preprocessing for specific document types."""
+        return document.preprocessed
+
+    def extract_table(self, document: 'DocumentImage') -> Optional[Table]:
+        """Line-item table read from the word boxes of the shared OCR pass."""
+        return extract_table(document.ocr(), document.preprocessed.width)
@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+from ..deadline import Deadline, DeadlineExceeded
+from ..document_classifier import DocumentType, predict_type_name, preprocess_for_classification, rank_document_types
+from ..ocr_cache import ocr_cache
+from ..ocr_tiers import TIER_FULL
+from ..parser_selection import (PARSER_ENSEMBLE, PARSER_ENSEMBLE_MARGIN, PARSER_ENSEMBLE_SIZE,
+                                parser_selection, score_items)
+from ..table_extraction import CELL_GAP, COLUMN_TOLERANCE
+from .base import BaseParser
+from .registry import ParserRegistry, parser_registry
+
+if TYPE_CHECKING:
+    from ..document_image import DocumentImage
+    from ..ingest import SpooledUpload
+
+
+_BUILTIN_TYPES = {document_type.value for document_type in DocumentType}
+
+
+class DocumentParser:
+    """Main parser that routes documents to appropriate specialized parsers."""
+
+    def __init__(self, registry: Optional[ParserRegistry] = None):
+        self.registry = registry or parser_registry
+
+    def parser_for(self, document_type: str) -> BaseParser:
+        """The registered parser for the type named ``document_type``; the grocery parser when there is none."""
+        return self.registry.get(document_type) or self.registry.get(DocumentType.GROCERY.value)
+
+    def route(self, document_type: str) -> Tuple[str, BaseParser]:
+        """
+        (reported type, parser) for a classified type name.
+
+        Types are looked up by name, so parsers registered for types
+        outside DocumentType are used. A type without a parser that is not
+        a built-in type is reported as "other" and parsed as grocery.
+        """
+        parser = self.registry.get(document_type)
+        if parser is not None:
+            return document_type, parser
+        if document_type not in _BUILTIN_TYPES:
+            document_type = DocumentType.OTHER.value
+        return document_type, self.parser_for(document_type)
+
+    def parse_document(self, upload: Union['DocumentImage', 'SpooledUpload', bytes], use_cache: bool = True,
+                       deadline: Optional[Deadline] = None, tier: str = TIER_FULL) -> Dict[str, Any]:
+        """Parse document and return structured data with classification.
+
+        Results are cached by the content of the upload, so re-uploads and
+        client retries go straight to matching without running tesseract.
+        Every tesseract call is bounded by ``deadline``; stages it cuts short
+        are recorded on it and the partial result is returned uncached.
+        ``tier`` is the OCR quality tier; the result's ``ocr_tier`` is the
+        tier it was actually produced at (None when no OCR was needed), and
+        only full-tier results are cached. When the classification is
+        ambiguous the runner-up parsers run too and the result carries the
+        ``parser_scores`` the winner was picked by.
+        """
+        from ..code_reader import document_code_items
+        from ..document_image import DocumentImage
+
+        # Decode once; the classifier and parser share the same image context
+        document = DocumentImage.coerce(upload)
+        if deadline is not None:
+            document.deadline = deadline
+        deadline = document.deadline
+        document.tier = tier
+
+        cache_key = ocr_cache.make_key(document.sha256, 'parse_document', self._cache_config())
+        if use_cache:
+            cached = ocr_cache.get(cache_key)
+            if cached is not None:
+                cached.setdefault('ocr_tier', TIER_FULL)
+                return cached
+
+        # Structured QR payloads and known barcodes make OCR unnecessary
+        code_items = document_code_items(document)
+        if code_items:
+            result = {
+                'document_type': DocumentType.GROCERY.value,
+                'items': code_items,
+                'parser_used': 'CodeReader',
+                'ocr_tier': None
+            }
+            if use_cache:
+                ocr_cache.put(cache_key, result)
+            return result
+
+        # Classify document type; grocery receipts are the most common
+        try:
+            text = preprocess_for_classification(document)
+            candidates = self._candidate_types(text)
+        except DeadlineExceeded:
+            deadline.skip('classify')
+            text, candidates = '', [DocumentType.GROCERY.value]
+
+        def parse(parser: BaseParser) -> List[Dict[str, Any]]:
+            try:
+                return parser.parse(document)
+            except DeadlineExceeded:
+                deadline.skip(f"parse {parser.__class__.__name__}")
+                return []
+
+        # Parse with specialized parser(s); the classifier's OCR pass is shared
+        doc_type, parser, items, parser_scores = self._select(candidates, parse, text, concurrent=True)
+
+        result = {
+            'document_type': doc_type,
+            'items': items,
+            'parser_used': parser.__class__.__name__,
+            'ocr_tier': tier
+        }
+        if parser_scores:
+            result['parser_scores'] = parser_scores
+        if use_cache and tier == TIER_FULL and not deadline.skipped:
+            ocr_cache.put(cache_key, result)
+        return result
+
+    def parse_text(self, text: str) -> Dict[str, Any]:
+        """Classify and parse the text of a digital document.
+
+        Nothing is rasterised or OCR'd, so no caching is needed.
+        """
+        doc_type, parser, items, parser_scores = self._select(
+            self._candidate_types(text.lower()), lambda parser: parser.parse_text(text), text)
+        result = {
+            'document_type': doc_type,
+            'items': items,
+            'parser_used': parser.__class__.__name__
+        }
+        if parser_scores:
+            result['parser_scores'] = parser_scores
+        return result
+
+    def _candidate_types(self, text: str) -> List[str]:
+        """Type names to parse the document as, most likely first; several only when the scores are close."""
+        if not PARSER_ENSEMBLE or PARSER_ENSEMBLE_SIZE < 2:
+            return [predict_type_name(text)]
+        return rank_document_types(text, PARSER_ENSEMBLE_MARGIN, PARSER_ENSEMBLE_SIZE)
+
+    def _select(self, candidates: List[str], parse: Callable[[BaseParser], List[Dict[str, Any]]],
+                text: str, concurrent: bool = False
+                ) -> Tuple[str, BaseParser, List[Dict[str, Any]], Optional[Dict[str, float]]]:
+        """
+        Run the parser of every candidate type and keep the most plausible items.
+
+        Returns (type, parser, items, score per candidate type); the scores
+        are None when there was only one candidate. Scores are keyed by type
+        because several types may share a parser (grocery and other). Ties
+        keep the classified type, and every multi-parser run is recorded in
+        parser_selection.
+        """
+        parsers = []
+        for doc_type, parser in map(self.route, candidates):
+            if doc_type not in (routed for routed, _ in parsers):
+                parsers.append((doc_type, parser))
+        if len(parsers) == 1:
+            doc_type, parser = parsers[0]
+            return doc_type, parser, parse(parser), None
+
+        if concurrent:
+            # The shared OCR pass has already computed the image views;
+            # DocumentImage.ocr runs any other configuration only once
+            with ThreadPoolExecutor(max_workers=len(parsers)) as pool:
+                outputs = list(pool.map(lambda entry: parse(entry[1]), parsers))
+        else:
+            outputs = [parse(parser) for _, parser in parsers]
+
+        scores = [score_items(items, text) for items in outputs]
+        best = max(range(len(parsers)), key=lambda i: (scores[i], -i))
+        parser_scores = {doc_type: score for (doc_type, _), score in zip(parsers, scores)}
+        doc_type, parser = parsers[best]
+        parser_selection.record(parsers[0][0], parser_scores, doc_type)
+        return doc_type, parser, outputs[best], parser_scores
+
+    def _cache_config(self) -> Dict[str, Any]:
+        """Everything besides the upload that determines parse_document output."""
+        from ..code_reader import OCR_READ_CODES
+        from ..document_model import document_model
+        from ..ocr import extraction_config
+
+        return {
+            'parsers': self.registry.describe(),
+            'extraction': extraction_config(),
+            'read_codes': OCR_READ_CODES,
+            'document_model': document_model.describe() if document_model else None,
+            'parser_ensemble': [PARSER_ENSEMBLE, PARSER_ENSEMBLE_MARGIN, PARSER_ENSEMBLE_SIZE],
+            'tables': [CELL_GAP, COLUMN_TOLERANCE],
+        }
+
+# Global parser instance
+document_parser = DocumentParser()
@@ -0,0 +1,20 @@
+from typing import Any, Dict, List
+
+from ..document_classifier import DocumentType
+from ..document_image import DocumentImage
+from ..ocr import extract_items_from_image, extract_items_from_text
+from .base import BaseParser
+
+
+class GroceryParser(BaseParser):
+    """Parser for grocery receipts - extends existing OCR functionality."""
+
+    def __init__(self):
+        super().__init__(DocumentType.GROCERY)
+
+    def parse(self, document: DocumentImage) -> List[Dict[str, Any]]:
+        """Parse grocery receipt using existing OCR logic."""
+        return extract_items_from_image(document, document_type=self.document_type.value)
+
+    def parse_text(self, text: str) -> List[Dict[str, Any]]:
+        return extract_items_from_text(text)
@@ -0,0 +1,98 @@
+import re
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from ..document_classifier import DocumentType
+from ..table_extraction import Table
+from .base import BaseParser
+
+if TYPE_CHECKING:
+    from ..document_image import DocumentImage
+
+
+class InvoiceParser(BaseParser):
+    """Parser for general invoices."""
+
+    # Pattern: quantity description price
+    LINE_ITEM_RE = re.compile(r'^(\d+)\s+(.+?)\s+\$?(\d+\.?\d{0,2})')
+    DESCRIPTION_PREFIX_RE = re.compile(r'^(item|product|service)\s*:?\s*', re.IGNORECASE)
+    LEADING_NUMBER_RE = re.compile(r'^\d+\.?\s*')
+    SKIP_WORDS = ['invoice', 'total', 'subtotal', 'tax', 'payment', 'due date', 'bill to']
+
+    def __init__(self):
+        super().__init__(DocumentType.INVOICE)
+
+    def parse(self, document: 'DocumentImage') -> List[Dict[str, Any]]:
+        """Parse invoice and extract line items.
+
+        Line items are read from the invoice's table when it has one, and
+        from the flattened text otherwise.
+        """
+        table = self.extract_table(document)
+        items = self._table_items(table) if table else []
+        if items:
+            return items
+        text = document.ocr().text
+        return self._extract_invoice_items(text)
+
+    def _table_items(self, table: Table) -> List[Dict[str, Any]]:
+        """Items from table rows with a description and an amount."""
+        items = []
+        for row in table.rows:
+            price = row.amount
+            if price is None or any(skip in row.description.lower() for skip in self.SKIP_WORDS):
+                continue
+            qty = row.qty or 1
+            items.append({
+                'name': self._clean_description(row.description),
+                'qty': int(qty) if float(qty).is_integer() else qty,
+                'unit': row.unit or 'item',
+                'price': price,
+                'raw_line': row.raw_line,
+                'category': 'invoice'
+            })
+        return items
+
+    def parse_text(self, text: str) -> List[Dict[str, Any]]:
+        return self._extract_invoice_items(text)
+
+    def _extract_invoice_items(self, text: str) -> List[Dict[str, Any]]:
+        """Extract items from invoice text."""
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        items = []
+
+        for line in lines:
+            line = line.lower().strip()
+
+            # Skip header/footer lines
+            if any(skip in line for skip in self.SKIP_WORDS):
+                continue
+
+            # Look for quantity, description, price pattern
+            # Pattern: quantity description price
+            qty_match = self.LINE_ITEM_RE.search(line)
+            if qty_match:
+                try:
+                    qty = int(qty_match.group(1))
+                    desc = qty_match.group(2).strip()
+                    price = float(qty_match.group(3))
+
+                    items.append({
+                        'name': self._clean_description(desc),
+                        'qty': qty,
+                        'unit': 'item',
+                        'price': price,
+                        'raw_line': line,
+                        'category': 'invoice'
+                    })
+                except (ValueError, IndexError):
+                    continue
+
+        return items
+
+    def _clean_description(self, desc: str) -> str:
+        """Clean and normalize invoice item descriptions."""
+        # Remove common prefixes
+        desc = self.DESCRIPTION_PREFIX_RE.sub('', desc)
+        desc = self.LEADING_NUMBER_RE.sub('', desc)  # Remove leading numbers
+
+        return desc.strip().capitalize()
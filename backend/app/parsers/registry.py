@@ -0,0 +1,132 @@
+"""
+Parsers by document type, imported on first use.
+
+Each document type maps to a "module:Class" path. The built-in parsers are
+listed in BUILTIN_PARSERS; other packages add or replace parsers through
+the ``carbondrop.parsers`` entry point group, named by document type:
+
+    [project.entry-points."carbondrop.parsers"]
+    parking = "carbondrop_parking.parser:ParkingParser"
+
+or at runtime with ``register_parser``. A parser's module (and the OCR
+and imaging libraries it needs) is only imported when a document of its
+type is first parsed, so importing the app stays cheap.
+"""
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import Callable, Dict, Optional, Type, Union
+
+from .base import BaseParser
+
+ENTRY_POINT_GROUP = 'carbondrop.parsers'
+
+BUILTIN_PARSERS: Dict[str, str] = {
+    'grocery': f'{__package__}.grocery:GroceryParser',
+    'restaurant': f'{__package__}.restaurant:RestaurantParser',
+    'utility': f'{__package__}.utility:UtilityParser',
+    'invoice': f'{__package__}.invoice:InvoiceParser',
+    'transport': f'{__package__}.transport:TransportParser',
+}
+
+ParserTarget = Union[str, Type[BaseParser], BaseParser]
+
+
+def _target_path(target: ParserTarget) -> str:
+    if isinstance(target, str):
+        return target
+    cls = target if isinstance(target, type) else type(target)
+    return f'{cls.__module__}:{cls.__qualname__}'
+
+
+class ParserRegistry:
+    """
+    Document type -> parser, instantiated once on first ``get``.
+
+    A target is a "module:Class" path, a parser class or a parser
+    instance. Entry points are read on first use and override the
+    built-in parsers; ``register`` overrides both.
+    """
+
+    def __init__(self, targets: Optional[Dict[str, ParserTarget]] = None,
+                 entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        self._targets: Dict[str, ParserTarget] = dict(BUILTIN_PARSERS if targets is None else targets)
+        self._instances: Dict[str, BaseParser] = {}
+        self._entry_point_group = entry_point_group
+        self._lock = threading.Lock()
+
+    def register(self, document_type: str, target: ParserTarget) -> None:
+        """Use ``target`` for documents of ``document_type`` from now on."""
+        self._load_entry_points()
+        with self._lock:
+            self._targets[document_type] = target
+            self._instances.pop(document_type, None)
+
+    def get(self, document_type: str) -> Optional[BaseParser]:
+        """The parser for ``document_type``, or None when none is registered or it fails to load."""
+        self._load_entry_points()
+        parser = self._instances.get(document_type)
+        if parser is not None:
+            return parser
+        with self._lock:
+            parser = self._instances.get(document_type)
+            target = self._targets.get(document_type)
+            if parser is None and target is not None:
+                parser = self._instantiate(document_type, target)
+                if parser is not None:
+                    self._instances[document_type] = parser
+        return parser
+
+    def describe(self) -> Dict[str, str]:
+        """Document type -> "module:Class" of its parser, without importing any."""
+        self._load_entry_points()
+        return {document_type: _target_path(target) for document_type, target in sorted(self._targets.items())}
+
+    def _instantiate(self, document_type: str, target: ParserTarget) -> Optional[BaseParser]:
+        try:
+            if isinstance(target, str):
+                module_name, _, class_name = target.partition(':')
+                target = getattr(importlib.import_module(module_name), class_name)
+            return target() if isinstance(target, type) else target
+        except Exception as e:
+            print(f"Could not load parser for {document_type} ({_target_path(target)}): {e}")
+            return None
+
+    def _load_entry_points(self) -> None:
+        if self._entry_point_group is None:
+            return
+        with self._lock:
+            group, self._entry_point_group = self._entry_point_group, None
+            if group is None:
+                return
+            try:
+                found = entry_points(group=group)
+            except TypeError:
+                # Python < 3.10 returns a dict of groups
+                found = entry_points().get(group, [])
+            for entry_point in found:
+                self._targets[entry_point.name] = entry_point.value
+
+
+# Global registry used by document_parser
+parser_registry = ParserRegistry()
+
+
+def register_parser(document_type: str, target: Optional[ParserTarget] = None) -> Optional[Callable]:
+    """
+    Register a parser for ``document_type`` in the global registry.
+
+    Without ``target`` it returns a class decorator:
+
+        @register_parser('parking')
+        class ParkingParser(BaseParser): ...
+    """
+    if target is not None:
+        parser_registry.register(document_type, target)
+        return None
+
+    def decorator(cls: Type[BaseParser]) -> Type[BaseParser]:
+        parser_registry.register(document_type, cls)
+        return cls
+
+    return decorator
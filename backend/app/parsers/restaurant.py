@@ -0,0 +1,74 @@
+import re
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from ..document_classifier import DocumentType
+from ..normalization import MENU_CORRECTION_TABLE
+from .base import BaseParser
+
+if TYPE_CHECKING:
+    from ..document_image import DocumentImage
+
+
+class RestaurantParser(BaseParser):
+    """Parser for restaurant receipts."""
+
+    # Restaurant-specific patterns
+    MENU_PATTERNS = [
+        (re.compile(r'(.+?)\s+\$?(\d+\.?\d{0,2})', re.IGNORECASE), 'menu_item'),
+        (re.compile(r'(.+?)\s+(\d+\.?\d{0,2})\s*(?:ea|each)?', re.IGNORECASE), 'item_price'),
+    ]
+    SIZE_PREFIX_RE = re.compile(r'^(small|large|medium|regular)\s+')
+    LEADING_NUMBER_RE = re.compile(r'^\d+\.?\s*')
+
+    def __init__(self):
+        super().__init__(DocumentType.RESTAURANT)
+
+    def parse(self, document: 'DocumentImage') -> List[Dict[str, Any]]:
+        """Parse restaurant receipt with menu item recognition."""
+        text = document.ocr().text
+        return self._extract_restaurant_items(text)
+
+    def parse_text(self, text: str) -> List[Dict[str, Any]]:
+        return self._extract_restaurant_items(text)
+
+    def _extract_restaurant_items(self, text: str) -> List[Dict[str, Any]]:
+        """Extract menu items from restaurant receipt text."""
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        items = []
+
+        for line in lines:
+            line = line.lower().strip()
+
+            # Skip non-item lines
+            if any(skip in line for skip in ['total', 'subtotal', 'tax', 'tip', 'change', 'card', 'cash']):
+                continue
+
+            for pattern, pattern_type in self.MENU_PATTERNS:
+                match = pattern.search(line)
+                if match:
+                    item_name = match.group(1).strip()
+                    try:
+                        price = float(match.group(2))
+                        items.append({
+                            'name': self._clean_menu_item(item_name),
+                            'qty': 1,
+                            'price': price,
+                            'raw_line': line,
+                            'category': 'restaurant'
+                        })
+                    except ValueError:
+                        continue
+                    break
+
+        return items
+
+    def _clean_menu_item(self, item: str) -> str:
+        """Clean and normalize menu item names."""
+        # Remove common prefixes
+        item = self.SIZE_PREFIX_RE.sub('', item)
+        item = self.LEADING_NUMBER_RE.sub('', item)  # Remove leading numbers
+
+        # Common restaurant item corrections
+        item = MENU_CORRECTION_TABLE.apply(item)
+
+        return item.strip().capitalize()
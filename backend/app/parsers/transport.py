@@ -0,0 +1,73 @@
+import re
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from ..document_classifier import DocumentType
+from .base import BaseParser
+
+if TYPE_CHECKING:
+    from ..document_image import DocumentImage
+
+
+class TransportParser(BaseParser):
+    """Parser for transport receipts/tickets."""
+
+    # Transport patterns
+    TRAVEL_PATTERNS = [
+        (re.compile(r'flight.*?([A-Z]{2}\d+).*?([A-Z]{3}).*?([A-Z]{3})', re.IGNORECASE | re.DOTALL), 'flight_route'),
+        (re.compile(r'train.*?(\d+)\s*(km|kilometers?|miles?)', re.IGNORECASE | re.DOTALL), 'train_distance'),
+        (re.compile(r'bus.*?(\d+)\s*(km|kilometers?|miles?)', re.IGNORECASE | re.DOTALL), 'bus_distance'),
+        (re.compile(r'taxi.*?(\d+\.?\d*)\s*(km|kilometers?|miles?)', re.IGNORECASE | re.DOTALL), 'taxi_distance'),
+        (re.compile(r'fuel.*?(\d+\.?\d*)\s*(liters?|gallons?)', re.IGNORECASE | re.DOTALL), 'fuel_volume'),
+    ]
+
+    def __init__(self):
+        super().__init__(DocumentType.TRANSPORT)
+
+    def parse(self, document: 'DocumentImage') -> List[Dict[str, Any]]:
+        """Parse transport receipt and extract travel data."""
+        text = document.ocr().text
+        return self._extract_transport_items(text)
+
+    def parse_text(self, text: str) -> List[Dict[str, Any]]:
+        return self._extract_transport_items(text)
+
+    def _extract_transport_items(self, text: str) -> List[Dict[str, Any]]:
+        """Extract transport data from receipt text."""
+        text = text.lower()
+        items = []
+
+        # Look for transport patterns
+        for pattern, item_type in self.TRAVEL_PATTERNS:
+            matches = pattern.findall(text)
+            for match in matches:
+                if item_type == 'flight_route':
+                    items.append({
+                        'name': f'Flight {match[0]}: {match[1]}-{match[2]}',
+                        'qty': 1,
+                        'unit': 'flight',
+                        'price': 0,
+                        'raw_line': match[0],
+                        'category': 'transport',
+                        'metadata': {
+                            'flight_number': match[0],
+                            'from_airport': match[1],
+                            'to_airport': match[2]
+                        }
+                    })
+                else:
+                    try:
+                        distance = float(match[0])
+                        unit = match[1]
+
+                        items.append({
+                            'name': item_type.replace('_', ' ').title(),
+                            'qty': distance,
+                            'unit': unit,
+                            'price': 0,
+                            'raw_line': match[0],
+                            'category': 'transport'
+                        })
+                    except (ValueError, IndexError):
+                        continue
+
+        return items
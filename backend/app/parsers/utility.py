@@ -0,0 +1,103 @@
+import re
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from ..document_classifier import DocumentType
+from ..table_extraction import Table
+from .base import BaseParser
+
+if TYPE_CHECKING:
+    from ..document_image import DocumentImage
+
+
+class UtilityParser(BaseParser):
+    """Parser for utility bills."""
+
+    # Consumption patterns
+    CONSUMPTION_PATTERNS = [
+        (re.compile(r'electric.*?(\d+\.?\d*)\s*(kwh|kw-h)', re.IGNORECASE | re.DOTALL), 'electricity_kwh'),
+        (re.compile(r'gas.*?(\d+\.?\d*)\s*(therms|cubic.?feet|ccf)', re.IGNORECASE | re.DOTALL), 'gas_therms'),
+        (re.compile(r'water.*?(\d+\.?\d*)\s*(gallons|liters|cubic.?meters)', re.IGNORECASE | re.DOTALL), 'water_volume'),
+    ]
+    TOTAL_RE = re.compile(r'total.*?\$?(\d+\.?\d{0,2})', re.IGNORECASE)
+    # Units of a usage table column and the consumption they measure
+    CONSUMPTION_UNITS = {
+        'kwh': 'electricity_kwh', 'kw-h': 'electricity_kwh',
+        'therm': 'gas_therms', 'therms': 'gas_therms', 'ccf': 'gas_therms',
+        'gallon': 'water_volume', 'gallons': 'water_volume', 'liters': 'water_volume', 'litres': 'water_volume',
+        'm3': 'water_volume', 'm³': 'water_volume',
+    }
+
+    def __init__(self):
+        super().__init__(DocumentType.UTILITY)
+
+    def parse(self, document: 'DocumentImage') -> List[Dict[str, Any]]:
+        """Parse utility bill and extract consumption data.
+
+        Usage is read from the bill's charges table when it has one, and
+        from the flattened text otherwise.
+        """
+        table = self.extract_table(document)
+        items = self._table_items(table) if table else []
+        if items:
+            return items
+        text = document.ocr().text
+        return self._extract_utility_items(text)
+
+    def _table_items(self, table: Table) -> List[Dict[str, Any]]:
+        """Consumption items from table rows whose quantity has a known unit."""
+        items = []
+        for row in table.rows:
+            unit_type = self.CONSUMPTION_UNITS.get(row.unit or '')
+            if unit_type is None or not row.qty:
+                continue
+            items.append({
+                'name': unit_type.replace('_', ' ').title(),
+                'qty': row.qty,
+                'unit': row.unit,
+                'price': 0,  # Will be calculated based on emission factors
+                'raw_line': row.raw_line,
+                'category': 'utility'
+            })
+        return items
+
+    def parse_text(self, text: str) -> List[Dict[str, Any]]:
+        return self._extract_utility_items(text)
+
+    def _extract_utility_items(self, text: str) -> List[Dict[str, Any]]:
+        """Extract utility consumption data from bill text."""
+        text = text.lower()
+        items = []
+
+        # Look for consumption patterns
+        for pattern, unit_type in self.CONSUMPTION_PATTERNS:
+            matches = pattern.findall(text)
+            for match in matches:
+                try:
+                    quantity = float(match[0])
+                    unit = match[1]
+
+                    items.append({
+                        'name': unit_type.replace('_', ' ').title(),
+                        'qty': quantity,
+                        'unit': unit,
+                        'price': 0,  # Will be calculated based on emission factors
+                        'raw_line': match[0],
+                        'category': 'utility'
+                    })
+                except (ValueError, IndexError):
+                    continue
+
+        # If no specific consumption found, look for total amount
+        if not items:
+            total_match = self.TOTAL_RE.search(text)
+            if total_match:
+                items.append({
+                    'name': 'Utility Bill',
+                    'qty': 1,
+                    'unit': 'bill',
+                    'price': float(total_match.group(1)),
+                    'raw_line': total_match.group(0),
+                    'category': 'utility'
+                })
+
+        return items
@@ -0,0 +1,94 @@
+"""
+PDF access for the batch ingestion and digital text paths.
+
+Pages are rendered (or their embedded text read) with pypdfium2, which is
+in requirements.txt, or PyMuPDF when only that is installed. Without either
+``PdfUnavailable`` is raised and PDF uploads are rejected while image uploads
+keep working.
+"""
+import os
+from typing import TYPE_CHECKING, List, Union
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Resolution pages are rasterised at before OCR
+PDF_RENDER_DPI = int(os.environ.get('PDF_RENDER_DPI', 200))
+
+PDF_MAGIC = b'%PDF'
+
+
+class PdfUnavailable(Exception):
+    """Raised when no PDF library is installed."""
+    pass
+
+
+class ScannedPdf(Exception):
+    """Raised when a PDF without a text layer reaches the single-image OCR path."""
+    pass
+
+
+def is_pdf(head: bytes) -> bool:
+    return head.startswith(PDF_MAGIC)
+
+
+class PdfPages:
+    """An open PDF; pages are read and rendered through one document handle."""
+
+    def __init__(self, source: Union[str, bytes]):
+        self._pdf, self._library = _open(source)
+
+    def __len__(self) -> int:
+        return len(self._pdf) if self._library == 'pdfium' else self._pdf.page_count
+
+    def text(self, index: int) -> str:
+        """Embedded text of one page; empty for scanned pages without a text layer."""
+        if self._library == 'pdfium':
+            return self._pdf[index].get_textpage().get_text_range()
+        return self._pdf[index].get_text()
+
+    def render(self, index: int, dpi: int = PDF_RENDER_DPI) -> 'Image.Image':
+        """Rasterise one page to an RGB image."""
+        from PIL import Image
+
+        if self._library == 'pdfium':
+            return self._pdf[index].render(scale=dpi / 72).to_pil().convert('RGB')
+        pixmap = self._pdf[index].get_pixmap(dpi=dpi)
+        return Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+
+    def close(self) -> None:
+        self._pdf.close()
+
+    def __enter__(self) -> 'PdfPages':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def page_texts(source: Union[str, bytes]) -> List[str]:
+    """Embedded text of every page, opening the document once."""
+    with PdfPages(source) as pdf:
+        return [pdf.text(index) for index in range(len(pdf))]
+
+
+def page_count(source: Union[str, bytes]) -> int:
+    """Number of pages in the PDF at ``source`` (a path or the raw bytes)."""
+    with PdfPages(source) as pdf:
+        return len(pdf)
+
+
+def _open(source: Union[str, bytes]):
+    try:
+        import pypdfium2
+        return pypdfium2.PdfDocument(source), 'pdfium'
+    except ImportError:
+        pass
+
+    try:
+        import fitz
+    except ImportError:
+        raise PdfUnavailable("PDF support needs pypdfium2 or PyMuPDF installed")
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype='pdf'), 'mupdf'
+    return fitz.open(source), 'mupdf'
@@ -0,0 +1,111 @@
+import re
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Longest side used for contour detection; the warp runs at full resolution
+DETECTION_SIDE = 800
+
+# A receipt outline must cover this share of the photo to be trusted, and
+# outlines covering nearly all of it are not worth cropping to
+MIN_AREA_RATIO = 0.2
+MAX_AREA_RATIO = 0.95
+
+ITEM_PRICE_RE = re.compile(r'\d{1,5}[\.,]\d{2}\s*(?:$|[€£$]|EUR|USD|GBP)')
+TOTALS_RE = re.compile(r'\b(?:SUB-?TOTAL|TOTAL|BALANCE|AMOUNT DUE)\b')
+
+
+def find_receipt_quad(rgb: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Locate the receipt outline in an RGB or grayscale photo.
+
+    Returns the four corners in full-resolution pixel coordinates, or None
+    when no plausible quadrilateral is found.
+    """
+    height, width = rgb.shape[:2]
+    scale = DETECTION_SIDE / max(height, width)
+    small = cv2.resize(rgb, (int(width*scale), int(height*scale)), interpolation=cv2.INTER_AREA) if scale < 1 else rgb
+    scale = min(scale, 1.0)
+
+    gray = small if small.ndim == 2 else cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+    gray = cv2.GaussianBlur(gray, (5,5), 0)
+    edges = cv2.Canny(gray, 50, 150)
+    edges = cv2.dilate(edges, np.ones((3,3), np.uint8), iterations=2)
+
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    image_area = small.shape[0] * small.shape[1]
+
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+        area_ratio = cv2.contourArea(contour) / image_area
+        if area_ratio < MIN_AREA_RATIO:
+            break
+        if area_ratio > MAX_AREA_RATIO:
+            continue
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(approx) == 4:
+            quad = approx.reshape(4, 2)
+        else:
+            # Curled or torn paper: fall back to the tightest rotated box
+            quad = cv2.boxPoints(cv2.minAreaRect(contour))
+        return (quad / scale).astype(np.float32)
+
+    return None
+
+
+def warp_quad(rgb: np.ndarray, quad: np.ndarray) -> np.ndarray:
+    """Perspective-correct the region inside ``quad`` into an upright rectangle."""
+    tl, tr, br, bl = _order_corners(quad)
+    width = int(max(np.linalg.norm(br - bl), np.linalg.norm(tr - tl)))
+    height = int(max(np.linalg.norm(tr - br), np.linalg.norm(tl - bl)))
+    target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(np.array([tl, tr, br, bl], dtype=np.float32), target)
+    return cv2.warpPerspective(rgb, matrix, (width, height))
+
+
+def crop_receipt(rgb: np.ndarray) -> Optional[np.ndarray]:
+    """Return the perspective-corrected receipt, or None if no outline was found."""
+    quad = find_receipt_quad(rgb)
+    if quad is None:
+        return None
+    return warp_quad(rgb, quad)
+
+
+def find_item_band(ocr_result, pad: int = 10) -> Optional[Tuple[int, int]]:
+    """
+    Find the vertical span of the item list from OCR line boxes.
+
+    The band starts at the first line ending in a price and stops before the
+    first totals line below it. Returns (top, bottom) pixel rows, or None when
+    fewer than two item-like lines were seen.
+    """
+    first_top = None
+    last_bottom = None
+    totals_top = None
+    item_lines = 0
+
+    for line in ocr_result.lines:
+        text = line.text.upper()
+        _, top, _, bottom = line.box
+        if item_lines and TOTALS_RE.search(text):
+            totals_top = top
+            break
+        if ITEM_PRICE_RE.search(text):
+            if first_top is None:
+                first_top = top
+            last_bottom = bottom
+            item_lines += 1
+
+    if item_lines < 2:
+        return None
+
+    bottom = totals_top if totals_top is not None else last_bottom + pad
+    return max(0, first_top - pad), bottom
+
+
+def _order_corners(quad: np.ndarray):
+    """Order four points as top-left, top-right, bottom-right, bottom-left."""
+    pts = np.asarray(quad, dtype=np.float32)
+    sums = pts.sum(axis=1)
+    diffs = np.diff(pts, axis=1).ravel()
+    return pts[np.argmin(sums)], pts[np.argmin(diffs)], pts[np.argmax(sums)], pts[np.argmax(diffs)]
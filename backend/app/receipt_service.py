@@ -0,0 +1,256 @@
+"""
+Receipt processing shared by the upload endpoints and the background job worker.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from . import models, schemas, database
+from .deadline import Deadline
+from .ocr_tiers import TIER_FULL
+from .enhanced_footprint import EnhancedFootprintMatcher
+from .digital_text import extract_text
+from .document_classifier import as_document_type
+from .footprint import load_dataset, calculate_eco_credits
+from .ingest import SpooledUpload
+from .pdf_document import PDF_MAGIC, ScannedPdf, is_pdf
+from .parsers import document_parser
+from .utils import normalize_quantity
+
+matcher = EnhancedFootprintMatcher(load_dataset(database.DATASET_PATH))
+
+
+def analyze_receipt(upload: SpooledUpload, filename: Optional[str] = None, content_type: Optional[str] = None,
+                    deadline: Optional[Deadline] = None, tier: str = TIER_FULL):
+    """
+    CPU-bound part of an upload: OCR, quantity normalization and matching.
+
+    Digital documents (text PDFs, HTML or plain-text receipts) skip OCR and
+    are parsed from their embedded text. OCR is bounded by ``deadline`` and
+    runs at quality ``tier``. Returns (document_type, matched items, total
+    footprint, OCR metadata); the metadata holds the tier actually used
+    (None without OCR) and, with a deadline, the skipped stages. Raises
+    ScannedPdf for PDFs without a text layer, whose pages are only OCR'd
+    by the batch path.
+    """
+    deadline = deadline or Deadline()
+    text = extract_text(upload, filename, content_type)
+    if text is not None:
+        parsed_data = document_parser.parse_text(text)
+    else:
+        with upload.open() as f:
+            if is_pdf(f.read(len(PDF_MAGIC))):
+                raise ScannedPdf("PDF has no text layer")
+        # Use the new document parser system
+        parsed_data = document_parser.parse_document(upload, deadline=deadline, tier=tier)
+    ocr_metadata = {'ocr_tier': parsed_data.get('ocr_tier'), **(deadline.metadata() or {})}
+    return (*match_document(parsed_data), ocr_metadata)
+
+
+def analyze_batch(upload: SpooledUpload, name: str) -> List[Dict[str, Any]]:
+    """
+    Parse a multi-page PDF or receipt archive and match each document.
+
+    Returns one dict per document with its name, page count, document type,
+    matched items and total footprint.
+    """
+    from .batch_ingest import parse_batch
+
+    documents = []
+    for parsed_data in parse_batch(upload, name):
+        document_type, results, total = match_document(parsed_data)
+        documents.append({
+            'name': parsed_data['name'],
+            'pages': parsed_data['pages'],
+            'document_type': document_type,
+            'results': results,
+            'total': total
+        })
+    return documents
+
+
+def match_document(parsed_data: Dict[str, Any]):
+    """Normalize the parsed items' quantities and match them to emission factors."""
+    items_raw = parsed_data['items']
+    document_type = parsed_data['document_type']
+
+    # Items resolved by exact product code lookup need no fuzzy matching
+    coded = [code_result(it) for it in items_raw if 'co2_per_unit' in it]
+
+    # Normalize quantities
+    items = []
+    for it in items_raw:
+        if 'co2_per_unit' in it:
+            continue
+        qty_kg, _ = normalize_quantity(f"{it.get('qty', 1)} {it.get('name', '')}")
+        category = it.get('category', 'food')  # Default to food for backward compatibility
+        items.append({
+            'name': it.get('name', ''),
+            'qty': qty_kg,
+            'category': category,
+            'unit': it.get('unit', 'kg')
+        })
+
+    results, total = matcher.match_and_compute(items) if items else ([], 0.0)
+    if coded:
+        results = coded + results
+        total = round(total + sum(result['footprint'] for result in coded), 4)
+    return document_type, results, total
+
+
+def code_result(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Matcher-shaped result for an item resolved from a QR code or barcode."""
+    qty = float(item.get('qty', 1))
+    return {
+        'name': item['name'],
+        'matched_name': item['matched_name'],
+        'match_score': item.get('match_score', 100),
+        'qty': qty,
+        'unit': item.get('unit', 'item'),
+        'co2_per_unit': item['co2_per_unit'],
+        'footprint': round(qty * item['co2_per_unit'], 4),
+        'category': item.get('category', 'food'),
+    }
+
+
+def save_receipt(db: Session, user_id: int, document_type, results, total, commit: bool = True,
+                 ocr_tier: Optional[str] = None) -> models.Receipt:
+    """
+    Store a processed receipt and its items, and award the user's EcoCredits.
+
+    With ``commit=False`` the rows are only flushed, leaving the transaction
+    to the caller (see ``save_receipts``).
+    """
+    # Create receipt and items in DB linked to user
+    receipt = models.Receipt(
+        user_id=user_id,
+        total_footprint=total,
+        document_type=document_type,
+        date=datetime.utcnow(),
+        ocr_tier=ocr_tier
+    )
+    db.add(receipt)
+    if not commit:
+        db.flush()
+    else:
+        db.commit()
+        db.refresh(receipt)
+        reset_item_sequence(db)
+
+    add_items(db, receipt, results)
+    if commit:
+        db.commit()
+
+    # Award EcoCredits for uploading receipt
+    credits_earned = calculate_eco_credits(total)
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user.eco_credits += credits_earned
+    db.add(user)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
+    return receipt
+
+
+def add_items(db: Session, receipt: models.Receipt, results) -> None:
+    """Add matched items to a receipt without committing."""
+    for item in results:
+        db_item = models.Item(
+            receipt_id=receipt.id,
+            name=item['name'],
+            matched_name=item['matched_name'],
+            qty=item['qty'],
+            unit=item['unit'],
+            footprint=item['footprint'],
+            category=item.get('category', 'food'),
+            match_score=item.get('match_score'),
+            co2_per_unit=item.get('co2_per_unit')
+        )
+        db.add(db_item)
+
+
+def replace_results(db: Session, receipt: models.Receipt, document_type, results, total,
+                    ocr_tier: Optional[str], commit: bool = True) -> models.Receipt:
+    """
+    Replace a receipt's items with those of a more thorough OCR pass.
+
+    The user's EcoCredits are corrected by the difference the new total makes.
+    With ``commit=False`` the changes are only flushed, as in ``save_receipt``.
+    """
+    credits_change = calculate_eco_credits(total) - calculate_eco_credits(receipt.total_footprint)
+    try:
+        db.query(models.Item).filter(models.Item.receipt_id == receipt.id).delete(synchronize_session=False)
+        add_items(db, receipt, results)
+        receipt.total_footprint = total
+        receipt.document_type = document_type
+        receipt.ocr_tier = ocr_tier
+        user = db.query(models.User).filter(models.User.id == receipt.user_id).first()
+        user.eco_credits += credits_change
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+    except Exception:
+        db.rollback()
+        raise
+    if commit:
+        db.refresh(receipt)
+    return receipt
+
+
+def reset_item_sequence(db: Session) -> None:
+    """Reset the items sequence to avoid primary key conflicts (PostgreSQL only)."""
+    try:
+        max_id = db.query(func.max(models.Item.id)).scalar()
+        if max_id:
+            db.execute(text(f"SELECT setval('items_id_seq', {max_id})"))
+            db.commit()
+    except Exception as seq_error:
+        print(f"Warning: Could not reset sequence: {seq_error}")
+
+
+def save_receipts(db: Session, user_id: int, documents: List[Dict[str, Any]]) -> List[models.Receipt]:
+    """Store the documents of a batch upload in a single transaction."""
+    reset_item_sequence(db)
+    try:
+        receipts = [
+            save_receipt(db, user_id, document['document_type'], document['results'], document['total'], commit=False)
+            for document in documents
+        ]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for receipt in receipts:
+        db.refresh(receipt)
+    return receipts
+
+
+def receipt_to_schema(db: Session, receipt: models.Receipt,
+                      ocr_metadata: Optional[Dict[str, Any]] = None) -> schemas.ReceiptBase:
+    receipt_items = db.query(models.Item).filter(models.Item.receipt_id == receipt.id).all()
+    doc_type_value = receipt.document_type if isinstance(receipt.document_type, str) else receipt.document_type.value
+    return schemas.ReceiptBase(
+        id=receipt.id,
+        user_id=receipt.user_id,
+        total_footprint=receipt.total_footprint,
+        document_type=as_document_type(doc_type_value),
+        items=[schemas.ItemBase(
+            name=i.name,
+            matched_name=i.matched_name or "",
+            qty=i.qty,
+            unit=i.unit or "",
+            footprint=i.footprint,
+            category=getattr(i, 'category', 'food'),
+            match_score=getattr(i, 'match_score', None),
+            co2_per_unit=getattr(i, 'co2_per_unit', None)
+        ) for i in receipt_items],
+        date=receipt.date,
+        ocr_tier=receipt.ocr_tier,
+        ocr_metadata=ocr_metadata
+    )
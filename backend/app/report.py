@@ -1,8 +1,5 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import FileResponse
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
 import tempfile, os
 from sqlalchemy.orm import Session
 from . import models, auth, database
@@ -11,6 +8,10 @@ router = APIRouter()
 
 @router.get("/pdf")
 def generate_report(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+    # reportlab loads PIL, so it is imported only when a report is built
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
     tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
     doc = SimpleDocTemplate(tmp.name)
     styles = getSampleStyleSheet()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Tuple
+from typing import Any, List, Optional, Dict, Tuple, Union
 from datetime import datetime
 import enum
 from .document_classifier import DocumentType
@@ -37,9 +37,25 @@ class ReceiptBase(BaseModel):
     id: int
     user_id: int
     total_footprint: float
-    document_type: DocumentType = DocumentType.GROCERY
+    document_type: Union[DocumentType, str] = DocumentType.GROCERY  # types of parser plugins are plain names
     items: List[ItemBase]
     date: datetime
+    ocr_tier: Optional[str] = None
+    ocr_metadata: Optional[Dict[str, Any]] = None  # deadline and skipped OCR stages, uploads only
+
+class JobOut(BaseModel):
+    id: int
+    status: str  # queued, reocr, running, done, failed
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    receipt: Optional[ReceiptBase] = None
+
+class BatchDocument(BaseModel):
+    name: str
+    pages: int
+    receipt: ReceiptBase
 
 # ------------------
 # Dashboard & Leaderboard
@@ -0,0 +1,42 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Sequence
+
+
+class SqliteStore:
+    """
+    Base for the small SQLite files shared by all OCR worker processes.
+
+    Subclasses list their ``CREATE`` statements in ``SCHEMA``; the tables
+    are created, with WAL journaling so readers do not block the writer,
+    on the first connection of each process.
+    """
+
+    SCHEMA: Sequence[str] = ()
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self):
+        """Yield a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            if not self._initialized:
+                self._create_tables(conn)
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._initialized = True
@@ -0,0 +1,157 @@
+"""
+Layout fingerprints for receipts from repeat retailers.
+
+Chains print every receipt from the same template: the same header lines and
+the item names and prices in the same columns. A fingerprint of that layout
+is read from the shared OCR pass (which the classifier runs anyway), and the
+item band, columns and best OCR configuration learned from an earlier
+receipt of the same store are reused, so later receipts only OCR the item
+region with one configuration instead of searching all of them.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .sqlite_store import SqliteStore
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+OCR_STORE_LAYOUTS = os.environ.get('OCR_STORE_LAYOUTS', '1') == '1'
+STORE_LAYOUT_PATH = os.environ.get('STORE_LAYOUT_PATH', os.path.join(BASE_DIR, 'store_layouts.sqlite3'))
+
+# Receipts must yield at least this many items before their layout is learned,
+# and a learned layout must reproduce as many before the search is skipped
+STORE_LAYOUT_MIN_ITEMS = int(os.environ.get('STORE_LAYOUT_MIN_ITEMS', 3))
+
+# ...and at least this share of the items of the receipt it was learned from
+STORE_LAYOUT_MIN_SHARE = float(os.environ.get('STORE_LAYOUT_MIN_SHARE', 0.8))
+
+# Lines at the top of the receipt read as the store header
+HEADER_LINES = 3
+
+# Column edges are compared in steps of this share of the receipt width
+COLUMN_STEP = 0.05
+
+_HEADER_NOISE_RE = re.compile(r'[^A-Z ]+')
+_SPACES_RE = re.compile(r'\s+')
+
+
+@dataclass
+class StoreLayout:
+    """What was learned about a store's receipts, in units of the receipt width."""
+    band_top: float         # top of the item list
+    name_left: float        # left edge of the item names
+    price_right: float      # right edge of the prices
+    config: Dict[str, Any]  # OCR configuration that found the most items
+    items: int = 0          # items the full search found on the receipt it was learned from
+
+    def band(self, width: int, height: int) -> Tuple[int, int]:
+        """(top, bottom) rows from the learned top to the end of the receipt."""
+        return min(int(self.band_top * width), height - 1), height
+
+    def span(self, width: int, pad: float = COLUMN_STEP) -> Tuple[int, int]:
+        """(left, right) columns around the item names and prices."""
+        return max(0, int((self.name_left - pad) * width)), min(width, int((self.price_right + pad) * width))
+
+    def enough_items(self, count: int) -> bool:
+        """
+        Whether ``count`` items read with this layout can stand in for the
+        full search: at least STORE_LAYOUT_MIN_ITEMS and STORE_LAYOUT_MIN_SHARE
+        of the items it was learned from, so a band or columns that cut a
+        long receipt short fall back to the search.
+        """
+        return count >= max(STORE_LAYOUT_MIN_ITEMS, math.ceil(STORE_LAYOUT_MIN_SHARE * self.items))
+
+
+def layout_fingerprint(ocr_result, width: int) -> Optional[Tuple[str, StoreLayout]]:
+    """
+    Fingerprint of a receipt's layout and the geometry it was read from.
+
+    The fingerprint combines the header text (letters only, so dates and
+    receipt numbers do not matter) with the quantized columns of the lines
+    ending in a price. Returns None when no header or item lines were read.
+    The returned layout has no configuration yet.
+    """
+    # receipt_region loads OpenCV, which importing the app should not
+    from .receipt_region import ITEM_PRICE_RE
+
+    lines = ocr_result.lines
+    header = ' '.join(_HEADER_NOISE_RE.sub(' ', line.text.upper()) for line in lines[:HEADER_LINES])
+    header = _SPACES_RE.sub(' ', header).strip()
+
+    item_boxes = [line.box for line in lines[HEADER_LINES:] if ITEM_PRICE_RE.search(line.text)]
+    if not header or not item_boxes or width <= 0:
+        return None
+
+    name_left = _quantize(min(box[0] for box in item_boxes) / width)
+    price_right = _quantize(max(box[2] for box in item_boxes) / width)
+    band_top = min(box[1] for box in item_boxes) / width
+
+    digest = hashlib.sha256(f"{header}|{name_left:.2f}|{price_right:.2f}".encode('utf-8')).hexdigest()
+    return digest, StoreLayout(band_top=band_top, name_left=name_left, price_right=price_right, config={})
+
+
+class StoreLayoutCache(SqliteStore):
+    """
+    Learned layouts keyed by fingerprint, in a local SQLite file.
+
+    Shared by all workers; lookup and update errors are logged and treated
+    as misses so extraction falls back to the full configuration search.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS store_layouts ("
+        "fingerprint TEXT PRIMARY KEY, layout TEXT NOT NULL, hits INTEGER NOT NULL)",
+    )
+
+    def get(self, fingerprint: str) -> Optional[StoreLayout]:
+        if not self.enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT layout FROM store_layouts WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE store_layouts SET hits = hits + 1 WHERE fingerprint = ?", (fingerprint,))
+        except sqlite3.Error as e:
+            print(f"Store layout lookup failed: {e}")
+            return None
+        return StoreLayout(**json.loads(row[0])) if row is not None else None
+
+    def put(self, fingerprint: str, layout: StoreLayout) -> None:
+        if not self.enabled:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO store_layouts (fingerprint, layout, hits) VALUES (?, ?, 0) "
+                    "ON CONFLICT(fingerprint) DO UPDATE SET layout = excluded.layout",
+                    (fingerprint, json.dumps(asdict(layout)))
+                )
+        except sqlite3.Error as e:
+            print(f"Store layout update failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        if not self.enabled:
+            return {'layouts': 0, 'hits': 0}
+        try:
+            with self._connect() as conn:
+                layouts, hits = conn.execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM store_layouts").fetchone()
+        except sqlite3.Error as e:
+            print(f"Store layout stats failed: {e}")
+            return {'layouts': 0, 'hits': 0}
+        return {'layouts': layouts, 'hits': hits}
+
+
+def _quantize(value: float) -> float:
+    return round(round(value / COLUMN_STEP) * COLUMN_STEP, 2)
+
+
+# Global layout cache
+store_layouts = StoreLayoutCache(STORE_LAYOUT_PATH, enabled=OCR_STORE_LAYOUTS)
@@ -0,0 +1,94 @@
+import os
+import re
+from difflib import SequenceMatcher
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from .ocr_backend import get_worker_pool, in_worker
+
+# Split tall receipts into horizontal strips recognised in parallel workers
+OCR_STRIP_PARALLEL = os.environ.get('OCR_STRIP_PARALLEL', '0') == '1'
+OCR_STRIP_MIN_HEIGHT = int(os.environ.get('OCR_STRIP_MIN_HEIGHT', 2400))
+OCR_STRIP_HEIGHT = int(os.environ.get('OCR_STRIP_HEIGHT', 1000))
+OCR_STRIP_OVERLAP = int(os.environ.get('OCR_STRIP_OVERLAP', 40))
+
+# Rows with at most this share of dark pixels count as whitespace
+WHITESPACE_INK_RATIO = 0.005
+
+# How far from the target height a cut may move to land on whitespace
+CUT_SEARCH_RATIO = 0.25
+
+_NORMALIZE_RE = re.compile(r'[^a-z0-9]+')
+
+
+def should_split(img) -> bool:
+    """True when ``img`` is tall enough to be worth recognising in strips."""
+    return OCR_STRIP_PARALLEL and not in_worker() and img.height >= OCR_STRIP_MIN_HEIGHT
+
+
+def find_strips(gray: np.ndarray, strip_height: int = OCR_STRIP_HEIGHT,
+                overlap: int = OCR_STRIP_OVERLAP) -> List[Tuple[int, int]]:
+    """
+    Choose overlapping (top, bottom) row ranges covering the whole image.
+
+    Each cut is moved to the whitespace row closest to the target strip
+    height, so text lines are rarely split; the overlap covers those that are.
+    """
+    height, width = gray.shape[:2]
+    ink = (gray < 128).sum(axis=1)
+    whitespace = np.flatnonzero(ink <= width * WHITESPACE_INK_RATIO)
+    window = int(strip_height * CUT_SEARCH_RATIO)
+
+    cuts = [0]
+    while height - cuts[-1] > strip_height + window:
+        target = cuts[-1] + strip_height
+        nearby = whitespace[(whitespace >= target - window) & (whitespace <= target + window)]
+        cuts.append(int(nearby[np.argmin(np.abs(nearby - target))]) if nearby.size else target)
+    cuts.append(height)
+
+    return [(max(0, top - overlap), min(height, bottom + overlap)) for top, bottom in zip(cuts, cuts[1:])]
+
+
+def ocr_strips(img, config: str, lang: str, recognize: Callable, timeout: float = 0) -> Tuple[List[str], float]:
+    """
+    Recognise ``img`` strip by strip in the OCR worker pool.
+
+    ``recognize(image, config, lang, timeout)`` must be a module-level
+    function returning (lines, mean confidence). Returns the stitched lines
+    and the mean confidence over all strips.
+    """
+    strips = find_strips(np.asarray(img.convert('L')))
+    pool = get_worker_pool()
+    futures = [pool.submit(recognize, img.crop((0, top, img.width, bottom)), config, lang, timeout)
+               for top, bottom in strips]
+    results = [future.result() for future in futures]
+
+    confidences = [confidence for lines, confidence in results if lines]
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return stitch_lines([lines for lines, _ in results]), confidence
+
+
+def stitch_lines(strip_lines: List[List[str]], lookback: int = 3) -> List[str]:
+    """
+    Concatenate per-strip lines, dropping lines repeated across an overlap.
+
+    A line at the top of a strip is a duplicate when it closely matches one
+    of the last ``lookback`` lines of the previous strip.
+    """
+    stitched: List[str] = []
+    for lines in strip_lines:
+        tail = [_normalize(line) for line in stitched[-lookback:]]
+        start = 0
+        while start < min(lookback, len(lines)) and _is_repeat(_normalize(lines[start]), tail):
+            start += 1
+        stitched.extend(lines[start:])
+    return stitched
+
+
+def _normalize(line: str) -> str:
+    return _NORMALIZE_RE.sub('', line.lower())
+
+
+def _is_repeat(line: str, tail: List[str]) -> bool:
+    return any(line == seen or SequenceMatcher(None, line, seen).ratio() > 0.9 for seen in tail)
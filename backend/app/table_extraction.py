@@ -0,0 +1,323 @@
+"""
+Table structure from OCR word boxes.
+
+Invoices and utility bills print their line items as a table: a header row
+(qty, description, unit price, amount, ...) over aligned columns. Flattening
+the OCR to text loses that alignment, so multi-column rows run together.
+``extract_table`` works on the word boxes of an OcrResult instead:
+
+1. Each line is split into cells where the gap between two words is wider
+   than a space.
+2. The first line naming at least two known columns is the header.
+3. The horizontal spans of the cells below the header are merged where
+   they overlap into columns, which are labelled from the header cells
+   above them, or by position when there is none.
+4. Every line is then read into a typed row in one pass: item rows,
+   continuation lines of a long description, and summary rows (subtotal,
+   tax, total) which end the table.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .ocr_result import OcrLine, OcrResult
+
+# Cells are split where words are further apart than this share of the line height
+CELL_GAP = 0.9
+
+# A wrapped description starts within this share of the table width of its column
+COLUMN_TOLERANCE = 0.03
+
+QTY = 'qty'
+DESCRIPTION = 'description'
+UNIT = 'unit'
+UNIT_PRICE = 'unit_price'
+LINE_TOTAL = 'line_total'
+
+# Header words per column role, longest phrases first
+HEADER_WORDS: List[Tuple[str, str]] = [
+    ('unit price', UNIT_PRICE), ('unit cost', UNIT_PRICE), ('price each', UNIT_PRICE),
+    ('line total', LINE_TOTAL), ('total price', LINE_TOTAL),
+    ('quantity', QTY), ('qty', QTY), ('usage', QTY), ('consumption', QTY), ('units used', QTY),
+    ('description', DESCRIPTION), ('item', DESCRIPTION), ('product', DESCRIPTION), ('service', DESCRIPTION),
+    ('details', DESCRIPTION), ('charge', DESCRIPTION),
+    ('unit', UNIT), ('uom', UNIT),
+    ('rate', UNIT_PRICE), ('price', UNIT_PRICE), ('each', UNIT_PRICE),
+    ('amount', LINE_TOTAL), ('total', LINE_TOTAL), ('ext', LINE_TOTAL),
+]
+
+# Rows starting with these words are totals below the items
+SUMMARY_WORDS = ('subtotal', 'sub total', 'total', 'tax', 'vat', 'gst', 'balance', 'amount due', 'discount',
+                 'shipping')
+
+# A number with an optional currency sign and an optional short unit: "$1,200.50", "350 kWh"
+_NUMBER_RE = re.compile(r'^[\$£€]?\s*(-?\d[\d,]*(?:\.\d+)?)\s*([a-zA-Z][a-zA-Z\-/³]{0,9})?$')
+_HEADER_NOISE_RE = re.compile(r'[^a-z ]+')
+
+
+@dataclass
+class Cell:
+    """Adjacent words of one line that belong to the same column."""
+    text: str
+    left: int
+    right: int
+
+    @property
+    def number(self) -> Optional[Tuple[float, Optional[str]]]:
+        """(value, unit) when the cell is a number, else None."""
+        match = _NUMBER_RE.match(self.text)
+        if not match:
+            return None
+        try:
+            return float(match.group(1).replace(',', '')), match.group(2)
+        except ValueError:
+            return None
+
+
+@dataclass
+class Column:
+    left: int
+    right: int
+    numeric: bool          # mostly numbers
+    role: Optional[str] = None
+
+    def distance(self, cell: 'Cell') -> float:
+        """Negative overlap with ``cell``, or the gap between them when they don't overlap."""
+        overlap = min(self.right, cell.right) - max(self.left, cell.left)
+        return -overlap if overlap > 0 else -overlap + 0.5
+
+
+@dataclass
+class TableRow:
+    """One line item with its typed cells."""
+    description: str
+    qty: Optional[float] = None
+    unit: Optional[str] = None
+    unit_price: Optional[float] = None
+    line_total: Optional[float] = None
+    raw_line: str = ''
+    cells: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def amount(self) -> Optional[float]:
+        """The line total, or quantity times unit price when only those were printed."""
+        if self.line_total is not None:
+            return self.line_total
+        if self.unit_price is not None:
+            return round(self.unit_price * (self.qty or 1), 2)
+        return None
+
+
+@dataclass
+class Table:
+    columns: List[Column]
+    header: Optional[str]
+    rows: List[TableRow]
+    totals: Dict[str, float] = field(default_factory=dict)  # summary label -> amount
+
+
+def split_cells(line: OcrLine, gap: float = CELL_GAP) -> List[Cell]:
+    """Split a line into cells at gaps wider than ``gap`` times its height."""
+    words = line.words
+    if not words:
+        return []
+    height = max(w.height for w in words)
+    cells = []
+    current = [words[0]]
+    for word in words[1:]:
+        if word.left - current[-1].right > gap * height:
+            cells.append(_cell(current))
+            current = []
+        current.append(word)
+    cells.append(_cell(current))
+    return cells
+
+
+def _cell(words) -> Cell:
+    return Cell(' '.join(w.text for w in words), words[0].left, words[-1].right)
+
+
+def header_roles(cells: List[Cell]) -> List[Tuple[Cell, str]]:
+    """The cells of a line that name a column, with their roles."""
+    roles = []
+    for cell in cells:
+        text = ' '.join(_HEADER_NOISE_RE.sub(' ', cell.text.lower()).split())
+        for phrase, role in HEADER_WORDS:
+            if text == phrase or text.startswith(phrase + ' '):
+                roles.append((cell, role))
+                break
+    return roles
+
+
+def cluster_columns(cells: List[Cell]) -> List[Column]:
+    """Merge the horizontal spans of cells that overlap into columns, left to right."""
+    columns: List[Column] = []
+    numbers = 0
+    count = 0
+    for cell in sorted(cells, key=lambda c: c.left):
+        if columns and cell.left < columns[-1].right:
+            columns[-1].right = max(columns[-1].right, cell.right)
+        else:
+            if columns:
+                columns[-1].numeric = numbers * 2 >= count
+            columns.append(Column(cell.left, cell.right, False))
+            numbers = count = 0
+        numbers += cell.number is not None
+        count += 1
+    if columns:
+        columns[-1].numeric = numbers * 2 >= count
+    return columns
+
+
+def _nearest(columns: List[Column], cell: Cell) -> Column:
+    return min(columns, key=lambda column: column.distance(cell))
+
+
+def _label_from_header(columns: List[Column], header: List[Tuple[Cell, str]], tolerance: int) -> None:
+    """
+    Give each column the role of the header cell above it, or of the nearest
+    one within ``tolerance``. A header cell labels at most one column (the
+    closest); header cells with no column beneath them are dropped.
+    """
+    claimed: Dict[int, Tuple[float, Column]] = {}
+    for column in columns:
+        index = min(range(len(header)), key=lambda i: column.distance(header[i][0]))
+        distance = column.distance(header[index][0])
+        if distance > tolerance:
+            continue
+        if index not in claimed or distance < claimed[index][0]:
+            claimed[index] = (distance, column)
+    for index, (_, column) in claimed.items():
+        column.role = header[index][1]
+
+
+def _label_by_position(columns: List[Column]) -> None:
+    """
+    Roles without a header: the leftmost text column is the description,
+    numbers to its left are quantities, and the numbers to its right are
+    the unit price and line total (a single one is the line total).
+    """
+    text_columns = [c for c in columns if not c.numeric]
+    if not text_columns:
+        return
+    description = text_columns[0]
+    description.role = DESCRIPTION
+    left = [c for c in columns if c.numeric and c.right <= description.left]
+    right = [c for c in columns if c.numeric and c.left >= description.right]
+    if left:
+        left[-1].role = QTY
+    if right:
+        right[-1].role = LINE_TOTAL
+    if len(right) >= 2:
+        right[-2].role = UNIT_PRICE if left else QTY
+    if len(right) >= 3 and right[-2].role == QTY:
+        right[-3].role = QTY
+        right[-2].role = UNIT_PRICE
+
+
+def _summary_label(text: str) -> Optional[str]:
+    lowered = text.lower()
+    for word in SUMMARY_WORDS:
+        if lowered.startswith(word):
+            return word
+    return None
+
+
+def extract_table(ocr_result: OcrResult, width: Optional[int] = None) -> Optional[Table]:
+    """
+    The line-item table of a document, or None when no rows were found.
+
+    ``width`` is the width of the OCR'd image; column tolerance is a share
+    of it (the extent of the words is used when not given).
+    """
+    lines = [line for line in ocr_result.lines if line.words]
+    if not lines:
+        return None
+    width = width or max(line.box[2] for line in lines) - min(line.box[0] for line in lines)
+    tolerance = max(1, int(COLUMN_TOLERANCE * width))
+
+    line_cells = [split_cells(line) for line in lines]
+
+    # Header: first line naming two different columns
+    start, header, header_text = 0, [], None
+    for index, cells in enumerate(line_cells):
+        roles = header_roles(cells)
+        if len({role for _, role in roles}) >= 2:
+            start, header, header_text = index + 1, roles, lines[index].text
+            break
+
+    # Columns are clustered from the multi-cell lines above the totals
+    body: List[Cell] = []
+    for cells in line_cells[start:]:
+        if _summary_label(cells[0].text) is not None and body:
+            break
+        if len(cells) > 1:
+            body.extend(cells)
+    columns = cluster_columns(body)
+    if not columns:
+        return None
+    if header:
+        _label_from_header(columns, header, tolerance)
+    if not any(c.role == DESCRIPTION for c in columns):
+        for column in columns:
+            column.role = None
+        _label_by_position(columns)
+
+    rows: List[TableRow] = []
+    totals: Dict[str, float] = {}
+    for line, cells in zip(lines[start:], line_cells[start:]):
+        summary = _summary_label(cells[0].text)
+        if summary is not None:
+            # Summary lines above the first item belong to the document header
+            if rows:
+                numbers = [cell.number for cell in cells if cell.number is not None]
+                if numbers:
+                    totals[summary] = numbers[-1][0]
+            continue
+        if totals:
+            # Nothing after the totals is a line item
+            break
+
+        row = _read_row(columns, cells, line.text)
+        if row is not None:
+            rows.append(row)
+        elif rows and len(cells) == 1 and _continues_description(columns, cells[0], tolerance):
+            rows[-1].description = f"{rows[-1].description} {cells[0].text}"
+
+    if not rows:
+        return None
+    return Table(columns, header_text, rows, totals)
+
+
+def _continues_description(columns: List[Column], cell: Cell, tolerance: int) -> bool:
+    """Whether a lone text cell is a wrapped line of the description above."""
+    column = _nearest(columns, cell)
+    return cell.number is None and column.role == DESCRIPTION and abs(cell.left - column.left) <= tolerance
+
+
+def _read_row(columns: List[Column], cells: List[Cell], raw_line: str) -> Optional[TableRow]:
+    """Typed row from one line's cells, or None unless it has a description and an amount or quantity."""
+    values: Dict[str, str] = {}
+    for cell in cells:
+        role = _nearest(columns, cell).role or DESCRIPTION
+        values[role] = f"{values[role]} {cell.text}" if role in values else cell.text
+
+    description = values.get(DESCRIPTION, '').strip()
+    row = TableRow(description=description, raw_line=raw_line, cells=values)
+    for role in (QTY, UNIT_PRICE, LINE_TOTAL):
+        if role not in values:
+            continue
+        number = Cell(values[role], 0, 0).number
+        if number is None:
+            continue
+        setattr(row, role, number[0])
+        if role == QTY and number[1]:
+            row.unit = number[1].lower()
+    if UNIT in values:
+        row.unit = values[UNIT].strip().lower()
+
+    if not description or description.replace(' ', '').isdigit():
+        return None
+    if row.qty is None and row.unit_price is None and row.line_total is None:
+        return None
+    return row
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for document classification by keywords.
+
+Compares the compiled keyword scorer used by app.document_classifier, which
+scores every document type in one regex pass, against the previous
+implementation, which ran one substring search per keyword and then three
+more regex passes. Both are run over the same synthetic OCR texts and must
+classify every text identically.
+
+Run from the backend directory:
+    python bench_classifier.py [--texts 5000]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from app.document_classifier import DocumentType, classify_document, get_keyword_scorer
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation, kept verbatim for comparison
+# ---------------------------------------------------------------------------
+
+def legacy_classify_document(text: str) -> DocumentType:
+    """
+    Classify document type based on extracted text patterns.
+
+    This classifier uses keyword matching and pattern recognition to identify
+    different types of carbon footprint documents.
+    """
+
+    # Grocery receipt patterns
+    grocery_keywords = [
+        'grocery', 'supermarket', 'groceries', 'produce', 'dairy', 'bakery',
+        'meat', 'vegetables', 'fruit', 'milk', 'bread', 'eggs', 'cheese',
+        'kg', 'lb', 'lbs', 'grams', 'litre', 'liter', 'ml', 'pack', 'packet'
+    ]
+
+    # Restaurant receipt patterns
+    restaurant_keywords = [
+        'restaurant', 'cafe', 'diner', 'bistro', 'table', 'seat', 'server',
+        'tip', 'gratuity', 'service', 'dining', 'menu', 'dish', 'course',
+        'appetizer', 'entree', 'dessert', 'beverage', 'drink'
+    ]
+
+    # Utility bill patterns
+    utility_keywords = [
+        'electric', 'electricity', 'power', 'energy', 'gas', 'water', 'utility',
+        'bill', 'invoice', 'statement', 'account', 'meter', 'reading', 'usage',
+        'kwh', 'kw-h', 'therms', 'cubic', 'meter', 'gallon', 'consumption',
+        'utility company', 'electric company', 'power company'
+    ]
+
+    # Invoice patterns
+    invoice_keywords = [
+        'invoice', 'bill', 'statement', 'payment', 'due', 'amount', 'total',
+        'tax', 'vat', 'shipping', 'handling', 'discount', 'subtotal',
+        'item', 'description', 'quantity', 'unit price', 'line total'
+    ]
+
+    # Transport patterns
+    transport_keywords = [
+        'transport', 'travel', 'flight', 'train', 'bus', 'taxi', 'uber', 'lyft',
+        'ticket', 'boarding', 'passenger', 'trip', 'journey', 'distance',
+        'fuel', 'gasoline', 'diesel', 'electric vehicle', 'charging'
+    ]
+
+    # Count keyword matches for each category
+    grocery_score = sum(1 for keyword in grocery_keywords if keyword in text)
+    restaurant_score = sum(1 for keyword in restaurant_keywords if keyword in text)
+    utility_score = sum(1 for keyword in utility_keywords if keyword in text)
+    invoice_score = sum(1 for keyword in invoice_keywords if keyword in text)
+    transport_score = sum(1 for keyword in transport_keywords if keyword in text)
+
+    # Additional pattern matching for better accuracy
+
+    # Check for currency patterns (common in receipts)
+    currency_patterns = re.findall(r'\$\d+\.?\d{0,2}|£\d+\.?\d{0,2}|€\d+\.?\d{0,2}', text)
+    has_currency = len(currency_patterns) > 0
+
+    # Check for date patterns
+    date_patterns = re.findall(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', text)
+    has_dates = len(date_patterns) > 0
+
+    # Check for typical receipt structure (multiple items with prices)
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    price_lines = sum(1 for line in lines if re.search(r'\d+\.?\d{0,2}', line))
+
+    # Boost scores based on structural patterns
+    if has_currency and price_lines > 3:
+        if utility_score > 0:
+            utility_score += 2
+        elif restaurant_score > 0:
+            restaurant_score += 2
+        elif grocery_score > 0:
+            grocery_score += 2
+
+    # Determine document type based on highest score
+    scores = {
+        DocumentType.GROCERY: grocery_score,
+        DocumentType.RESTAURANT: restaurant_score,
+        DocumentType.UTILITY: utility_score,
+        DocumentType.INVOICE: invoice_score,
+        DocumentType.TRANSPORT: transport_score
+    }
+
+    # If no clear winner and we have typical receipt patterns, default to grocery
+    if max(scores.values()) == 0 and (has_currency or price_lines > 2):
+        return DocumentType.GROCERY
+
+    return max(scores, key=scores.get)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+FILLER = ['thank', 'you', 'store', 'no', 'ref', 'cashier', 'visa', 'ending', 'welcome', 'back',
+          'billing', 'tipping', 'multiple', 'html', 'residue', 'kwh/day', 'electrical', 'powered']
+PRICES = ['$4.99', '£12.50', '€3', '7.25', '1,200.00', '12/03/2024', 'qty 2']
+
+
+def make_texts(count, seed=42):
+    """Synthetic lowercased OCR texts mixing keywords of several types, filler and prices."""
+    rng = random.Random(seed)
+    keywords = list(get_keyword_scorer().weights)
+    texts = []
+    for _ in range(count):
+        lines = []
+        for _ in range(rng.randint(0, 25)):
+            words = rng.sample(keywords, rng.randint(0, 2)) + rng.sample(FILLER, rng.randint(0, 3))
+            rng.shuffle(words)
+            if rng.random() < 0.6:
+                words.append(rng.choice(PRICES))
+            # Glue words together at times so keywords overlap inside longer tokens
+            lines.append(('' if rng.random() < 0.2 else ' ').join(words))
+        texts.append('\n'.join(lines))
+    return texts
+
+
+def bench(label, func, texts, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    rate = len(texts) / best
+    print(f"{label:<34} {rate:>12,.0f} texts/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--texts', type=int, default=5000)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+
+    # The classifiers must agree on every text before timing means anything
+    mismatches = [t for t in texts if legacy_classify_document(t) != classify_document(t)]
+    if mismatches:
+        print(f"❌ {len(mismatches)} texts differ, e.g. {mismatches[0]!r}")
+        return 1
+    print(f"✅ Identical output on {len(texts)} texts")
+    print("-" * 60)
+
+    before = bench('classify_document (per keyword)', legacy_classify_document, texts)
+    after = bench('classify_document (compiled)', classify_document, texts)
+    print(f"{'speedup':<34} {after / before:>12.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
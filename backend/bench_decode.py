@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark for image decoding and preprocessing.
+
+Times DocumentImage from the raw upload to the thresholded OCR input, once
+with the default pipeline (PIL RGB decode, PIL resize, OpenCV grayscale)
+and once with OCR_FAST_DECODE (grayscale decode with JPEG draft mode,
+OpenCV resize). Runs over every image in sample_receipts unless files are
+given. No OCR is performed.
+
+Run from the backend directory:
+    python bench_decode.py [--repeat 5] [--no-crop] [files ...]
+"""
+
+import argparse
+import os
+import time
+
+from app.document_image import DocumentImage
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_receipts')
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp'}
+
+
+def bench(data, fast_decode, crop_receipt, repeat):
+    """Best wall time in ms and the OCR input shape for one upload."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        document = DocumentImage(data, crop_receipt=crop_receipt, fast_decode=fast_decode)
+        thresholded = document.thresholded
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, thresholded.shape
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-crop', action='store_true', help="skip receipt outline detection")
+    args = parser.parse_args()
+
+    files = args.files or sorted(
+        os.path.join(SAMPLES_DIR, name) for name in os.listdir(SAMPLES_DIR)
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+    )
+    crop_receipt = not args.no_crop
+
+    print(f"{'file':<40} {'default':>10} {'fast':>10} {'speedup':>8}  OCR input")
+    print("-" * 96)
+    total_before = total_after = 0.0
+    for path in files:
+        with open(path, 'rb') as f:
+            data = f.read()
+        before, shape_before = bench(data, False, crop_receipt, args.repeat)
+        after, shape_after = bench(data, True, crop_receipt, args.repeat)
+        total_before += before
+        total_after += after
+        name = os.path.basename(path)
+        name = name if len(name) <= 40 else name[:37] + '...'
+        print(f"{name:<40} {before:>8.1f}ms {after:>8.1f}ms {before / after:>7.1f}x  "
+              f"{shape_before[1]}x{shape_before[0]} -> {shape_after[1]}x{shape_after[0]}")
+
+    if files:
+        print("-" * 96)
+        print(f"{'total':<40} {total_before:>8.1f}ms {total_after:>8.1f}ms {total_before / total_after:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
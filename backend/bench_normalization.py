@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for item-name normalisation and receipt line parsing.
+
+Compares the compiled normalisation engine used by app.ocr against the
+previous implementation, which rebuilt one regex per correction and per
+price/quantity pattern on every line. Both are run over the same synthetic
+OCR lines and must produce identical output.
+
+Run from the backend directory:
+    python bench_normalization.py [--lines 20000]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from app.normalization import ITEM_CORRECTIONS
+from app.ocr import clean_item_name, _parse_line
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation, kept verbatim for comparison
+# ---------------------------------------------------------------------------
+
+def legacy_clean_item_name(raw: str) -> str:
+    """Enhanced item name cleaning with better normalization."""
+    text = raw.lower().strip()
+
+    # Remove common OCR artifacts and noise
+    text = re.sub(r'[^\w\s\-.,]', ' ', text)  # Replace non-alphanumeric with spaces
+    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+
+    # Common OCR typo corrections and standardizations
+    corrections = {
+        # Common OCR errors
+        'mi1k': 'milk', 'mil': 'milk', 'mik': 'milk',
+        'brea': 'bread', 'bre': 'bread',
+        'chic': 'chicken', 'chick': 'chicken', 'chi': 'chicken',
+        'chee': 'cheese', 'ches': 'cheese',
+        'toma': 'tomato', 'tomat': 'tomato',
+        'pota': 'potato', 'potat': 'potato',
+        'appl': 'apple', 'app': 'apple',
+        'bana': 'banana', 'ban': 'banana',
+        'eggi': 'eggs', 'egg': 'eggs',
+        'beef': 'beef', 'bee': 'beef',
+        'rice': 'rice', 'ric': 'rice',
+        'past': 'pasta', 'pas': 'pasta',
+
+        # Common variations and abbreviations
+        'whole milk': 'milk', 'semi skimmed': 'milk', 'skim milk': 'milk',
+        'white bread': 'bread', 'brown bread': 'bread', 'wholemeal': 'bread',
+        'free range eggs': 'eggs', 'large eggs': 'eggs', 'medium eggs': 'eggs',
+        'chicken breast': 'chicken', 'chicken thigh': 'chicken',
+        'ground beef': 'beef', 'minced beef': 'beef', 'steak': 'beef',
+        'cheddar cheese': 'cheese', 'mozzarella': 'cheese', 'parmesan': 'cheese',
+        'cherry tomato': 'tomato', 'plum tomato': 'tomato',
+        'baking potato': 'potato', 'new potato': 'potato',
+        'braeburn apple': 'apple', 'granny smith': 'apple', 'gala apple': 'apple',
+        'fairtrade banana': 'banana',
+        'white rice': 'rice', 'brown rice': 'rice', 'basmati': 'rice', 'jasmine rice': 'rice',
+        'spaghetti': 'pasta', 'penne': 'pasta', 'fusilli': 'pasta', 'macaroni': 'pasta',
+
+        # Units and quantities (remove these)
+        'kg': '', 'kilo': '', 'kilogram': '', 'kilograms': '',
+        'g': '', 'gram': '', 'grams': '',
+        'l': '', 'liter': '', 'litre': '', 'liters': '', 'litres': '',
+        'ml': '', 'milliliter': '', 'millilitre': '', 'milliliters': '', 'millilitres': '',
+        'lb': '', 'lbs': '', 'pound': '', 'pounds': '',
+        'oz': '', 'ounce': '', 'ounces': '',
+        'pack': '', 'packet': '', 'pack of': '', 'pk': '',
+        'pc': '', 'piece': '', 'pieces': '', 'pcs': '',
+        'ea': '', 'each': '', 'item': '',
+    }
+
+    # Apply corrections
+    for wrong, correct in corrections.items():
+        text = re.sub(r'\b' + re.escape(wrong) + r'\b', correct, text)
+
+    # Remove numbers and units that weren't caught above
+    text = re.sub(r'\d+(\.\d+)?', '', text)  # Remove numbers
+    text = re.sub(r'\b(?:kg|g|lb|oz|l|ml|liter|gram|pound|ounce|pack|piece|item|each)\b', '', text)
+
+    # Clean up extra spaces and normalize
+    text = re.sub(r'\s+', ' ', text).strip()
+
+    # Skip if it's a total/subtotal keyword
+    skip_keywords = ['total', 'subtotal', 'tax', 'vat', 'change', 'cash', 'card', 'balance', 'pay', 'amount', 'discount', 'tip', 'service', 'gratuity']
+    if text in skip_keywords:
+        return ""
+
+    return text.capitalize()
+
+
+def legacy_parse_line(line: str):
+    """Enhanced line parsing with better price and quantity detection."""
+    raw = line.strip()
+    if not raw:
+        return None
+
+    # Skip non-item lines more aggressively
+    up = re.sub(r'[^A-Z ]+', '', raw.upper())
+    extended_skip_keywords = {
+        'TOTAL','SUBTOTAL','SUB-TOTAL','TAX','VAT','CHANGE','CASH','CARD','BALANCE','PAY',
+        'AMOUNT','DISCOUNT','TIP','SERVICE','GRATUITY','TABLE','SEAT','SERVER','BILL',
+        'INVOICE','RECEIPT','THANK','YOU','WELCOME','CUSTOMER','GUEST','ORDER','ITEM',
+        'QTY','QUANTITY','PRICE','UNIT','RATE','DESCRIPTION','PRODUCT','NAME','NUMBER'
+    }
+
+    if any(k in up for k in extended_skip_keywords):
+        return None
+
+    # Enhanced price regex patterns
+    price_patterns = [
+        r'(\d{1,5}(?:[\.,]\d{2})?)\s*(?:$|[€£$]|EUR|USD|GBP)',  # Price at end
+        r'(?:€|£|\$|EUR|USD|GBP)\s*(\d{1,5}(?:[\.,]\d{2})?)',    # Currency at start
+        r'(\d{1,5}(?:[\.,]\d{2})?)\s*(?:€|£|\$)',                # Price with currency
+    ]
+
+    price = None
+    for pattern in price_patterns:
+        m = re.search(pattern, raw)
+        if m:
+            price_str = m.group(1).replace(',', '.')
+            try:
+                price = float(price_str)
+                break
+            except:
+                continue
+
+    if not price:
+        return None
+
+    # Extract item name (everything before the price)
+    name_part = raw[:raw.find(m.group(0))].strip(' -:')
+
+    # Enhanced quantity detection
+    qty_patterns = [
+        r'^(\d+)\s*[xX]\s*',  # 2x, 3x format
+        r'(\d+)\s*(?:pcs?|PK|pack|pieces?|items?)',  # 2 pcs, 3 pack
+        r'\((\d+)\)',  # (2) format
+        r'qty[:\s]*(\d+)',  # qty: 2 format
+        r'quantity[:\s]*(\d+)',  # quantity: 2 format
+    ]
+
+    qty = 1
+    for pattern in qty_patterns:
+        q_match = re.search(pattern, raw, re.IGNORECASE)
+        if q_match:
+            try:
+                qty = int(q_match.group(1))
+                break
+            except:
+                continue
+
+    # Clean the item name
+    name = legacy_clean_item_name(name_part)
+    if not name or len(name) < 2:
+        return None
+
+    # Additional validation - skip if name is too short or looks like a code
+    if len(name) < 2 or re.match(r'^[A-Z0-9]{1,3}$', name.upper()):
+        return None
+
+    return {
+        'name': name,
+        'qty': qty,
+        'raw_line': raw,
+        'price': price,
+        'confidence': 'high' if qty > 1 else 'medium'
+    }
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+NOISE_WORDS = ['fresh', 'organic', 'value', 'whole', 'mil', 'x2', 'pack of', 'tesco', '500g', '1kg', '2 pcs', '(3)']
+PRICES = ['1.99', '2,50', '£3.20', '$4', '12.00 EUR', '0.89']
+SKIP_LINES = ['TOTAL 12.99', 'VAT 1.20', 'THANK YOU', 'CARD **** 1234']
+
+
+def make_lines(count, seed=42):
+    """Synthetic OCR lines mixing table entries, noise, prices and skip lines."""
+    rng = random.Random(seed)
+    keys = list(ITEM_CORRECTIONS)
+    lines = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            lines.append(rng.choice(SKIP_LINES))
+            continue
+        words = rng.sample(keys, 2) + rng.sample(NOISE_WORDS, 2)
+        rng.shuffle(words)
+        lines.append(' '.join(words) + ' ' + rng.choice(PRICES))
+    return lines
+
+
+def bench(label, func, lines, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    rate = len(lines) / best
+    print(f"{label:<34} {rate:>12,.0f} lines/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=20000)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines)
+
+    # The engines must agree on every line before timing means anything
+    mismatches = [ln for ln in lines if legacy_parse_line(ln) != _parse_line(ln)]
+    mismatches += [ln for ln in lines if legacy_clean_item_name(ln) != clean_item_name(ln)]
+    if mismatches:
+        print(f"❌ {len(mismatches)} lines differ, e.g. {mismatches[0]!r}")
+        return 1
+    print(f"✅ Identical output on {len(lines)} lines")
+    print("-" * 60)
+
+    before = bench('clean_item_name (per-entry re.sub)', legacy_clean_item_name, lines)
+    after = bench('clean_item_name (compiled engine)', clean_item_name, lines)
+    print(f"{'speedup':<34} {after / before:>12.1f}x")
+    print("-" * 60)
+
+    before = bench('_parse_line (per-entry re.sub)', legacy_parse_line, lines)
+    after = bench('_parse_line (compiled engine)', _parse_line, lines)
+    print(f"{'speedup':<34} {after / before:>12.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
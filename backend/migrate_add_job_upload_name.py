@@ -0,0 +1,53 @@
+"""
+Database migration script to keep the upload name on receipt jobs.
+
+This script adds:
+- filename column to receipt_jobs table (name of the uploaded file)
+- content_type column to receipt_jobs table (declared content type)
+
+Workers pass both to the digital-text detection, so deferred text, HTML and
+e-mail receipts are recognised like direct uploads. Jobs queued before the
+migration keep NULL and are handled as before.
+
+Run this script before starting the application with the new models.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from app import database
+
+
+def add_upload_name_to_jobs():
+    """Add filename and content_type columns to receipt_jobs table."""
+    try:
+        inspector = inspect(database.engine)
+        if not inspector.has_table('receipt_jobs'):
+            print("✓ receipt_jobs table does not exist yet; it is created with the new columns")
+            return True
+        columns = [column['name'] for column in inspector.get_columns('receipt_jobs')]
+
+        with database.engine.connect() as conn:
+            for column in ('filename', 'content_type'):
+                if column in columns:
+                    print(f"✓ {column} column already exists in receipt_jobs table")
+                    continue
+                conn.execute(text(f"ALTER TABLE receipt_jobs ADD COLUMN {column} VARCHAR"))
+                print(f"✓ Added {column} column to receipt_jobs table")
+            conn.commit()
+
+    except Exception as e:
+        print(f"✗ Error adding upload name columns: {e}")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    print("Running receipt job upload name migration...")
+    if add_upload_name_to_jobs():
+        print("✅ Migration completed successfully!")
+    else:
+        print("❌ Migration failed")
+        sys.exit(1)
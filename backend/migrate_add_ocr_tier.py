@@ -0,0 +1,47 @@
+"""
+Database migration script to add the OCR quality tier to receipts.
+
+This script adds:
+- ocr_tier column to receipts table (full, single or fast; NULL for receipts
+  stored before tiers existed, digital documents and batch uploads)
+
+The receipt_jobs table needs no change: re-OCR jobs use the new 'reocr'
+status and set receipt_id up front.
+
+Run this script before starting the application with the new models.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+from app import database
+
+
+def add_ocr_tier_to_receipts():
+    """Add ocr_tier column to receipts table."""
+    try:
+        columns = [column['name'] for column in inspect(database.engine).get_columns('receipts')]
+        if 'ocr_tier' in columns:
+            print("✓ ocr_tier column already exists in receipts table")
+            return True
+
+        with database.engine.connect() as conn:
+            conn.execute(text("ALTER TABLE receipts ADD COLUMN ocr_tier VARCHAR(10)"))
+            conn.commit()
+        print("✓ Added ocr_tier column to receipts table")
+
+    except Exception as e:
+        print(f"✗ Error adding ocr_tier column: {e}")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    print("Running OCR tier migration...")
+    if add_ocr_tier_to_receipts():
+        print("✅ Migration completed successfully!")
+    else:
+        print("❌ Migration failed")
+        sys.exit(1)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Checks for reading line items from structured receipt QR payloads."""
+
+import json
+
+from app.code_reader import DecodedCode, ProductCodeTable, items_from_codes, normalize_code, parse_payload
+
+
+def test_receipt_payloads_are_accepted():
+    items = parse_payload(json.dumps([
+        {'name': 'Oat milk', 'qty': 2, 'unit': 'l', 'price': 3.5},
+        {'ean': '5000112637922', 'qty': 1},
+    ]))
+    assert [(item['name'], item['code'], item['qty'], item['price']) for item in items] == [
+        ('Oat milk', '', 2.0, 3.5), ('', '5000112637922', 1.0, 0.0)]
+    assert items[0]['unit'] == 'l' and items[1]['unit'] == 'item'
+
+    wrapped = parse_payload(json.dumps({'store': 'Fresh Mart', 'items': [{'code': '123', 'name': 'Eggs'}]}))
+    assert [item['code'] for item in wrapped] == ['123']
+
+
+def test_other_payloads_are_rejected():
+    assert parse_payload('https://example.com/loyalty?id=42') == []
+    assert parse_payload(json.dumps({'member': 'A-1001', 'points': 120})) == []
+    assert parse_payload(json.dumps(['coupon', 'SAVE10'])) == []
+    # Every item needs an EAN, or a name and a price
+    assert parse_payload(json.dumps([{'name': 'Milk', 'price': 1.2}, {'name': 'Bread'}])) == []
+    assert parse_payload(json.dumps([{'name': 'Milk', 'price': 'free'}])) == []
+
+
+def test_items_from_codes_without_known_products():
+    table = ProductCodeTable('no_such_table.csv')
+    codes = [
+        DecodedCode('qr', 'QRCODE', json.dumps([{'name': 'Milk', 'price': 1.2}])),
+        DecodedCode('qr', 'QRCODE', 'https://example.com'),
+        DecodedCode('barcode', 'EAN_13', '5000112637922'),
+    ]
+    items = items_from_codes(codes, table)
+    assert [(item['name'], item['source']) for item in items] == [('Milk', 'qr')]
+    assert normalize_code('0-12345-67890-5') == '0012345678905'
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Checks for the per-request OCR deadline."""
+
+import time
+
+from app.deadline import MIN_STAGE_SECONDS, Deadline
+
+
+def test_unlimited_deadline():
+    deadline = Deadline()
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert deadline.timeout() == 0  # no timeout for tesseract
+    assert deadline.metadata() is None
+    assert Deadline(0).remaining() is None
+
+
+def test_deadline_counts_down_and_expires():
+    deadline = Deadline(0.2)
+    assert 0 < deadline.remaining() <= 0.2
+    assert not deadline.expired()
+    assert MIN_STAGE_SECONDS <= deadline.timeout() <= 0.2
+
+    time.sleep(0.2)
+    assert deadline.remaining() == 0.0
+    assert deadline.expired()
+    # Calls that still start get the minimum stage time rather than no timeout
+    assert deadline.timeout() == MIN_STAGE_SECONDS
+
+
+def test_skipped_stages_are_recorded_once():
+    deadline = Deadline(5)
+    deadline.skip('classify')
+    deadline.skip('ocr --oem 3 --psm 3')
+    deadline.skip('classify')
+    metadata = deadline.metadata()
+    assert metadata['skipped_stages'] == ['classify', 'ocr --oem 3 --psm 3']
+    assert metadata['deadline_exceeded'] is True
+    assert metadata['deadline_seconds'] == 5
+    assert Deadline(5).metadata()['deadline_exceeded'] is False
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
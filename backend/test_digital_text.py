@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Checks for reading the text of born-digital receipts without OCR."""
+
+import io
+
+from app.digital_text import extract_text, pdf_text
+
+PNG_HEAD = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR'
+
+HTML = b"""<!DOCTYPE html><html><head><style>td { color: red }</style></head>
+<body><h1>Fresh Mart</h1><table>
+<tr><td>Milk</td><td>2.49</td></tr>
+<tr><td>Bread</td><td>1.20</td></tr>
+</table><script>track()</script></body></html>"""
+
+EMAIL = b"""From: receipts@freshmart.example
+To: customer@example.com
+Subject: Your Fresh Mart receipt
+MIME-Version: 1.0
+Content-Type: text/plain; charset=utf-8
+
+Milk   2.49
+Bread  1.20
+Total  3.69
+"""
+
+
+def make_pdf(pages):
+    """PDF with one page per entry; None makes a blank page."""
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for lines in pages:
+        for row, line in enumerate(lines or []):
+            pdf.drawString(72, 760 - 18 * row, line)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_binary_uploads_need_ocr():
+    assert extract_text(PNG_HEAD + bytes(range(256)) * 8, 'receipt.png', 'image/png') is None
+    # Not text even when declared as such
+    assert extract_text(b'\x00\x01\x02' * 100, 'receipt.txt', 'text/plain') is None
+
+
+def test_html_receipt():
+    assert extract_text(HTML, 'receipt.html') == "Fresh Mart\nMilk 2.49\nBread 1.20"
+
+
+def test_email_receipt():
+    assert extract_text(EMAIL) == "Your Fresh Mart receipt\nMilk 2.49\nBread 1.20\nTotal 3.69"
+
+
+def test_plain_text_receipt():
+    assert extract_text(b"\xef\xbb\xbfMilk\t2.49\r\n\r\nBread  1.20\r\n") == "Milk 2.49\nBread 1.20"
+    # Legacy encodings are accepted when the upload says it is text
+    assert extract_text("Caf\xe9 au lait 2.80".encode('cp1252'), 'receipt.txt') == "Caf\xe9 au lait 2.80"
+
+
+def test_pdf_blank_pages_are_skipped():
+    receipt = ["Fresh Mart Supermarket", "Milk 2.49", "Bread 1.20", "Total 3.69"]
+    text = pdf_text(make_pdf([None, receipt, ["p. 3"]]))
+    assert text == "\n".join(receipt)
+    assert extract_text(make_pdf([receipt])) == "\n".join(receipt)
+    # Without any text layer the PDF goes to OCR
+    assert pdf_text(make_pdf([None, None])) is None
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
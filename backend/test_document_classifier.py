@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Checks for the compiled keyword scorer behind classify_document."""
+
+import json
+
+from app.document_classifier import DOCUMENT_KEYWORDS_PATH, DocumentType, KeywordScorer, classify_document
+
+CONFIG = {
+    'types': {
+        'grocery': ['grocery', 'supermarket', 'milk'],
+        'utility': ['electric', 'electricity', 'kwh'],
+        'invoice': ['invoice', 'bill'],
+    },
+    'structure_boost': {'types': ['utility', 'grocery'], 'points': 2, 'min_price_lines': 3},
+    'fallback': {'type': 'grocery', 'min_price_lines': 2},
+}
+
+SAMPLES = [
+    "fresh mart supermarket\nmilk 2.49\nbread 1.20\ntotal 3.69",
+    "city power electricity bill\nusage 350 kwh\namount due $52.50",
+    "invoice no 1001\nconsulting services 500.00\ntotal due 500.00",
+    "the grand cafe restaurant\n2 coffee 5.00\ntip 1.00\ntotal $6.00",
+    "train ticket london to leeds\nstandard class\nfare $45.00",
+    "",
+]
+
+
+def test_keyword_scores_and_margin():
+    scorer = KeywordScorer(CONFIG)
+    scores = scorer.score("monthly electricity bill: 350 kwh")
+    # "electricity" also credits the "electric" it contains
+    assert scores.scores == {'grocery': 0, 'utility': 3, 'invoice': 1}
+    assert scores.document_type == 'utility'
+    assert scores.margin == 2
+
+
+def test_ties_go_to_the_first_listed_type():
+    scores = KeywordScorer(CONFIG).score("supermarket invoice")
+    assert scores.scores['grocery'] == scores.scores['invoice'] == 1
+    assert scores.document_type == 'grocery'
+    assert scores.margin == 0
+
+
+def test_fallback_and_structure_boost():
+    scorer = KeywordScorer(CONFIG)
+    # Nothing scored, but the text looks like a receipt
+    assert scorer.score("item a $1.00\nitem b 2.00\nitem c 3.00").document_type == 'grocery'
+    assert scorer.score("hello there").scores == {'grocery': 0, 'utility': 0, 'invoice': 0}
+    # Currency and enough price lines boost the first boost type that scored
+    text = "electric co\nline 1\nline 2\nline 3\nline 4 $10.00"
+    assert scorer.score(text).scores['utility'] == 1 + 2
+
+
+def test_compiled_scorer_matches_substring_scoring():
+    with open(DOCUMENT_KEYWORDS_PATH, encoding='utf-8') as f:
+        config = json.load(f)
+    # Without boost and fallback the scores are plain keyword counts
+    scorer = KeywordScorer({'types': config['types']})
+    for text in SAMPLES:
+        expected = {
+            name: sum(1 for keyword in keywords if keyword.lower() in text)
+            for name, keywords in config['types'].items()
+        }
+        assert scorer.score(text).scores == expected, text
+        assert isinstance(classify_document(text), DocumentType)
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
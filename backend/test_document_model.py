@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Checks for the trainable document-type model."""
+
+import os
+import tempfile
+
+from app.document_model import DocumentTypeModel, hash_ngrams
+
+
+def test_hash_ngrams_is_deterministic():
+    first = hash_ngrams("Fresh Mart 12.50", (2, 3), 12)
+    assert (first == hash_ngrams("fresh   mart 99.99", (2, 3), 12)).all()  # case, spacing and digits fold
+    assert first.max() < 2 ** 12
+    assert len(hash_ngrams("", (2, 3), 12)) == 1  # just the padding spaces
+
+
+def test_unigrams_are_hashed():
+    text = "milk"
+    unigrams = hash_ngrams(text, (1,), 12)
+    bigrams = hash_ngrams(text, (2,), 12)
+    assert len(unigrams) == len(bigrams) + 1
+    assert len(hash_ngrams(text, (1, 2), 12)) == len(unigrams) + len(bigrams)
+    try:
+        hash_ngrams(text, (0, 2), 12)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("n-gram size 0 was accepted")
+
+
+def test_model_train_predict_and_round_trip():
+    texts = [
+        "supermarket milk bread eggs total", "grocery store bananas apples milk",
+        "fresh mart supermarket cheese butter", "electricity bill kwh usage meter",
+        "power company electric kwh meter reading", "gas and electric utility bill kwh",
+    ]
+    labels = ['grocery'] * 3 + ['utility'] * 3
+    model = DocumentTypeModel.train(texts, labels, bits=14)
+    assert model.types == ['grocery', 'utility']
+    assert model.documents == 6
+
+    prediction = model.predict("supermarket receipt milk and bread")
+    assert prediction.document_type == 'grocery'
+    assert abs(sum(prediction.probabilities.values()) - 1.0) < 1e-6
+    assert model.predict("electric meter kwh").document_type == 'utility'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.npz')
+        model.save(path)
+        loaded = DocumentTypeModel.load(path)
+    assert loaded.digest and loaded.describe()['bits'] == 14
+    again = loaded.predict("supermarket receipt milk and bread")
+    assert again.document_type == prediction.document_type
+    assert abs(again.confidence - prediction.confidence) < 1e-4
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Importing the app must not load the OCR and imaging stack."""
+
+import ast
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ('cv2', 'PIL.Image', 'pytesseract')
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Imports app.main and, should that stop early on an unrelated error, every
+# app module it imports, then reports which heavy modules got loaded
+CHECK = """
+import importlib, json, sys
+error = None
+try:
+    import app.main
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+for name in MODULES:
+    try:
+        importlib.import_module(name)
+    except Exception:
+        pass
+print(json.dumps({'error': error, 'loaded': [m for m in HEAVY_MODULES if m in sys.modules]}))
+"""
+
+
+def main_imports():
+    """The app modules app/main.py imports."""
+    with open(os.path.join(BACKEND_DIR, 'app', 'main.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1:
+            if node.module:
+                modules.append(f'app.{node.module}')
+            else:
+                modules.extend(f'app.{alias.name}' for alias in node.names)
+    return modules
+
+
+def test_app_main_does_not_load_ocr_stack():
+    code = f"MODULES = {main_imports()!r}\nHEAVY_MODULES = {HEAVY_MODULES!r}\n{CHECK}"
+    output = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True,
+                            check=True).stdout
+    report = json.loads(output.strip().splitlines()[-1])
+    if report['error']:
+        print(f"⚠ app.main did not import ({report['error']}); checked its imports one by one")
+    assert report['loaded'] == [], f"importing app.main loaded {report['loaded']}"
+
+
+if __name__ == "__main__":
+    test_app_main_does_not_load_ocr_stack()
+    print("✅ app.main imports without cv2, PIL.Image or pytesseract")
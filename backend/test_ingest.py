@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Checks for size-bounded upload ingestion."""
+
+import asyncio
+import hashlib
+import os
+import pickle
+import tempfile
+from tempfile import SpooledTemporaryFile
+
+from fastapi import UploadFile
+
+from app.ingest import SpooledUpload, UploadTooLarge, ingest_upload
+
+
+def make_upload(data, spool_size=1024, declare_size=True):
+    """UploadFile as Starlette builds it: spooled to disk past ``spool_size``."""
+    file = SpooledTemporaryFile(max_size=spool_size)
+    file.write(data)
+    file.seek(0)
+    return UploadFile(file, size=len(data) if declare_size else None, filename='receipt.jpg')
+
+
+def ingest(upload, **kwargs):
+    return asyncio.run(ingest_upload(upload, **kwargs))
+
+
+def test_oversized_uploads_are_rejected():
+    for declare_size in (True, False):
+        try:
+            ingest(make_upload(b'x' * 5000, declare_size=declare_size), max_bytes=4096, chunk_size=1000)
+        except UploadTooLarge as e:
+            assert e.max_bytes == 4096
+        else:
+            raise AssertionError("upload over the limit was accepted")
+
+
+def test_uploads_reuse_the_request_file():
+    for size in (100, 50_000):  # kept in memory, rolled over to disk
+        data = os.urandom(size)
+        upload = make_upload(data)
+        spooled = ingest(upload, chunk_size=4096)
+        assert spooled.file is upload.file
+        assert upload.file._rolled == (size > 1024)
+        assert spooled.size == size
+        assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+        assert spooled.read() == data
+
+
+def test_streams_read_independently():
+    data = bytes(range(256)) * 40
+    spooled = ingest(make_upload(data))
+    with spooled.open() as first, spooled.open() as second:
+        assert first.read(10) == data[:10]
+        assert second.read(300) == data[:300]
+        assert first.read(10) == data[10:20]
+        second.seek(-6, os.SEEK_END)
+        assert second.read() == data[-6:]
+
+
+def test_copies_and_pickles_carry_the_bytes():
+    data = os.urandom(5000)
+    spooled = ingest(make_upload(data))
+    with tempfile.TemporaryDirectory() as tmp:
+        dest = os.path.join(tmp, 'job.upload')
+        spooled.move_to(dest)
+        with open(dest, 'rb') as f:
+            assert f.read() == data
+    # Worker processes get the bytes rather than the request's file
+    copy = pickle.loads(pickle.dumps(spooled))
+    assert copy.file is None and copy.read() == data and copy.sha256 == spooled.sha256
+    assert SpooledUpload.coerce(data).read() == data
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
@@ -1,8 +1,6 @@
-import sys
 import os
-sys.path.append('app')
 
-from ocr import extract_items_from_image
+from app.ocr import extract_items_from_image
 
 def test_ocr_with_sample_receipt():
     # Read the sample receipt image
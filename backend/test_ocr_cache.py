@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Checks for the content-addressed OCR result cache."""
+
+import os
+import tempfile
+import time
+
+from app.ocr_cache import OcrCache
+
+
+def make_cache(tmp, max_bytes=1024 * 1024, enabled=True):
+    return OcrCache(os.path.join(tmp, 'cache.sqlite3'), max_bytes, enabled=enabled)
+
+
+def test_hits_and_misses():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        key = OcrCache.make_key('abc', 'parse_document', {'psm': 6})
+        assert cache.get(key) is None
+        cache.put(key, {'items': [{'name': 'milk', 'price': 2.49}]})
+        assert cache.get(key) == {'items': [{'name': 'milk', 'price': 2.49}]}
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+        # Counters live in the file, so a second instance reports the same totals
+        assert make_cache(tmp).stats()['hits'] == 1
+
+
+def test_keys_depend_on_content_and_config():
+    key = OcrCache.make_key('abc', 'ocr', {'psm': 6, 'oem': 3})
+    assert key == OcrCache.make_key('abc', 'ocr', {'oem': 3, 'psm': 6})
+    assert key.startswith('abc:')
+    assert key != OcrCache.make_key('abd', 'ocr', {'psm': 6, 'oem': 3})
+    assert key != OcrCache.make_key('abc', 'ocr', {'psm': 4, 'oem': 3})
+    assert key != OcrCache.make_key('abc', 'parse', {'psm': 6, 'oem': 3})
+
+
+def test_least_recently_used_entries_are_evicted_past_the_size_cap():
+    value = {'text': 'x' * 90}  # about 100 bytes of JSON
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_bytes=350)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, value)
+            time.sleep(0.01)
+        cache.get('a')  # now more recent than b and c
+        time.sleep(0.01)
+        cache.put('d', value)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == value and cache.get('c') == value and cache.get('d') == value
+        stats = cache.stats()
+        assert stats['evictions'] == 1
+        assert stats['entries'] == 3 and stats['bytes'] <= 350
+
+
+def test_disabled_cache_stores_nothing():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, enabled=False)
+        cache.put('a', {'text': 'milk'})
+        assert cache.get('a') is None
+        assert cache.stats()['entries'] == 0
+        assert not os.path.exists(cache.path)
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
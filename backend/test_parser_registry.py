@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Checks for the parser registry and routing by document type name."""
+
+import json
+
+from app import document_classifier
+from app.document_classifier import KeywordScorer
+from app.parsers import BaseParser, DocumentParser, ParserRegistry
+
+KEYWORDS_PATH = document_classifier.DOCUMENT_KEYWORDS_PATH
+
+
+class StubParser(BaseParser):
+    def __init__(self, document_type='grocery'):
+        super().__init__(document_type)
+
+    def parse(self, document):
+        return []
+
+    def parse_text(self, text):
+        return [{'name': 'stub item', 'qty': 1, 'price': 1.0}]
+
+
+class ParkingParser(StubParser):
+    def __init__(self):
+        super().__init__('parking')
+
+    def parse_text(self, text):
+        return [{'name': 'parking 2h', 'qty': 2, 'unit': 'hour', 'price': 6.0}]
+
+
+class GroceryStub(StubParser):
+    pass
+
+
+def with_keywords(extra_types):
+    """Keyword scorer of the shipped keyword file plus ``extra_types``."""
+    with open(KEYWORDS_PATH, encoding='utf-8') as f:
+        config = json.load(f)
+    config['types'].update(extra_types)
+    return KeywordScorer(config)
+
+
+def test_registry_imports_on_first_get():
+    registry = ParserRegistry({'stub': f'{__name__}:StubParser', 'broken': 'app.no_such_module:Parser'},
+                              entry_point_group=None)
+    assert registry.describe() == {'broken': 'app.no_such_module:Parser', 'stub': f'{__name__}:StubParser'}
+    parser = registry.get('stub')
+    assert isinstance(parser, StubParser)
+    assert registry.get('stub') is parser
+    assert registry.get('broken') is None
+    assert registry.get('missing') is None
+
+    registry.register('stub', ParkingParser)
+    assert isinstance(registry.get('stub'), ParkingParser)
+
+
+def test_plugin_type_is_routed_to_its_parser():
+    registry = ParserRegistry({'grocery': GroceryStub}, entry_point_group=None)
+    registry.register('parking', ParkingParser)
+    parser = DocumentParser(registry)
+
+    original = document_classifier._scorer
+    document_classifier._scorer = with_keywords({'parking': ['parking', 'car park', 'pay and display']})
+    try:
+        result = parser.parse_text("City Car Park\nPay and display parking\n2 hours  $6.00")
+        assert result['document_type'] == 'parking'
+        assert result['parser_used'] == 'ParkingParser'
+        assert result['items'][0]['name'] == 'parking 2h'
+
+        # A type without a registered parser is still reported as "other"
+        document_classifier._scorer = with_keywords({'laundry': ['laundry', 'dry cleaning']})
+        result = parser.parse_text("Laundry and dry cleaning service")
+        assert result['document_type'] == 'other'
+        assert result['parser_used'] == 'GroceryStub'
+    finally:
+        document_classifier._scorer = original
+
+
+def test_builtin_type_without_parser_falls_back_to_grocery():
+    parser = DocumentParser(ParserRegistry({'grocery': GroceryStub}, entry_point_group=None))
+    assert parser.route('restaurant')[0] == 'restaurant'
+    assert isinstance(parser.route('restaurant')[1], GroceryStub)
+
+
+def test_scores_are_keyed_by_candidate_type():
+    from app.parser_selection import parser_selection
+
+    parser = DocumentParser(ParserRegistry({'grocery': GroceryStub}, entry_point_group=None))
+    recorded = []
+    original = parser_selection.record
+    parser_selection.record = lambda *args: recorded.append(args)
+    try:
+        doc_type, chosen, items, scores = parser._select(
+            ['grocery', 'other'], lambda p: p.parse_text(''), "stub item 1.00")
+    finally:
+        parser_selection.record = original
+    # Both types use the grocery parser and keep a score each
+    assert set(scores) == {'grocery', 'other'}
+    assert doc_type == 'grocery' and isinstance(chosen, GroceryStub)
+    assert recorded == [('grocery', scores, 'grocery')]
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
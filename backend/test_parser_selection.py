@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Checks for scoring parser output and the parser selection statistics."""
+
+import os
+import tempfile
+
+from app.parser_selection import ParserSelection, document_total, score_items
+
+TEXT = "fresh mart\nmilk 2.49\nbread 1.20\nsubtotal 3.69\ntotal 3.69"
+
+
+def test_document_total_ignores_subtotals():
+    assert document_total(TEXT) == 3.69
+    assert document_total("Total: 1,50\nTOTAL DUE 12.00") == 12.0
+    assert document_total("no amounts here") is None
+
+
+def test_score_items():
+    assert score_items([], TEXT) == 0.0
+
+    consistent = [{'name': 'milk', 'price': 2.49}, {'name': 'bread', 'price': 1.20}]
+    off_total = [{'name': 'milk', 'price': 24.90}, {'name': 'bread', 'price': 1.20}]
+    noisy = [{'name': '|~ 3', 'price': 2.49}, {'name': 'br', 'price': 1.20}]
+    assert 0 < score_items(off_total, TEXT) < score_items(consistent, TEXT) <= 1.0
+    assert score_items(noisy, TEXT) < score_items(consistent, TEXT)
+
+    # Without a printed total, priced or measured items count as consistent
+    usage = [{'name': 'electricity', 'qty': 350, 'unit': 'kwh', 'price': 0}]
+    unmeasured = [{'name': 'electricity', 'qty': 1, 'unit': 'item', 'price': 0}]
+    assert score_items(usage, "power bill") > score_items(unmeasured, "power bill")
+
+
+def test_selection_statistics():
+    with tempfile.TemporaryDirectory() as tmp:
+        selection = ParserSelection(os.path.join(tmp, 'selection.sqlite3'))
+        selection.record('grocery', {'grocery': 0.8, 'restaurant': 0.5}, 'grocery')
+        selection.record('grocery', {'grocery': 0.4, 'restaurant': 0.6}, 'restaurant')
+        stats = {row['candidate']: row for row in selection.stats()}
+    assert stats['grocery']['runs'] == 2 and stats['grocery']['wins'] == 1
+    assert stats['restaurant']['wins'] == 1
+    assert stats['grocery']['mean_score'] == 0.6
+    assert ParserSelection('unused', enabled=False).stats() == []
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Checks for receipt outline cropping and item band detection."""
+
+import cv2
+import numpy as np
+
+from app.ocr_result import OcrResult, OcrWord
+from app.receipt_region import crop_receipt, find_item_band, find_receipt_quad
+
+
+def photo(corners, size=(1000, 800)):
+    """Dark background with a white receipt filling the polygon ``corners``."""
+    height, width = size
+    img = np.full((height, width, 3), 40, np.uint8)
+    cv2.fillPoly(img, [np.array(corners, np.int32)], (250, 250, 250))
+    return img
+
+
+def make_result(lines):
+    """OcrResult with one word per line at the given top row."""
+    words = [OcrWord(text, 90.0, 20, top, 200, 20, (1, 1, 1, n)) for n, (text, top) in enumerate(lines, 1)]
+    return OcrResult(words)
+
+
+def test_receipt_quad_is_cropped_and_straightened():
+    # A receipt about 300 x 700 px, slightly rotated
+    img = photo([(260, 140), (560, 160), (540, 860), (240, 840)])
+    quad = find_receipt_quad(img)
+    assert quad is not None and quad.shape == (4, 2)
+
+    region = crop_receipt(img)
+    assert region is not None
+    height, width = region.shape[:2]
+    assert 650 <= height <= 760 and 270 <= width <= 340
+    # Nothing of the dark background is left in the middle of the crop
+    assert region[height // 4:3 * height // 4, width // 4:3 * width // 4].min() > 200
+
+
+def test_photo_without_outline_passes_through():
+    assert crop_receipt(np.full((600, 400, 3), 250, np.uint8)) is None
+
+
+def test_outlines_outside_the_area_ratios_are_rejected():
+    # Covers about 3% of the photo: a label, not the receipt
+    assert crop_receipt(photo([(100, 100), (260, 100), (260, 260), (100, 260)])) is None
+    # Covers nearly the whole photo: nothing worth cropping
+    assert crop_receipt(photo([(5, 5), (795, 5), (795, 995), (5, 995)])) is None
+
+
+def test_item_band_stops_before_the_totals():
+    result = make_result([
+        ('FRESH MART', 10), ('MILK 2.49', 100), ('BREAD 1.20', 140),
+        ('EGGS 3.10', 180), ('TOTAL 6.79', 230), ('THANK YOU', 300),
+    ])
+    assert find_item_band(result, pad=10) == (90, 230)
+
+
+def test_item_band_needs_two_item_lines():
+    assert find_item_band(make_result([('FRESH MART', 10), ('MILK 2.49', 100), ('TOTAL 2.49', 140)])) is None
+    # Without a totals line the band ends below the last item
+    assert find_item_band(make_result([('MILK 2.49', 100), ('BREAD 1.20', 140)]), pad=10) == (90, 170)
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
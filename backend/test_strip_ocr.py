@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Checks for splitting tall receipts into strips and stitching their lines."""
+
+import numpy as np
+
+from app.strip_ocr import find_strips, stitch_lines
+
+
+def receipt(height=3000, width=400, line_every=50, line_height=20):
+    """White image with a dark text line every ``line_every`` rows."""
+    gray = np.full((height, width), 255, np.uint8)
+    for top in range(10, height, line_every):
+        gray[top:top + line_height, 20:width - 20] = 0
+    return gray
+
+
+def test_strips_cover_the_image_and_cut_on_whitespace():
+    gray = receipt()
+    strips = find_strips(gray, strip_height=1000, overlap=40)
+    assert strips[0][0] == 0 and strips[-1][1] == gray.shape[0]
+    assert len(strips) == 3
+    for (_, bottom), (top, _) in zip(strips, strips[1:]):
+        cut = top + 40
+        assert bottom - top == 80  # both strips reach over the cut
+        assert not (gray[cut] == 0).any()  # the cut row is blank
+
+
+def test_short_image_is_one_strip():
+    assert find_strips(receipt(height=1100), strip_height=1000, overlap=40) == [(0, 1100)]
+
+
+def test_overlapping_lines_are_dropped():
+    strips = [
+        ['FRESH MART', 'MILK 2.49', 'BREAD 1.20'],
+        ['BREAD 1.20', 'CHEDDAR CHEESE 3.10'],
+        ['CHEDDAR CHEESE 3.1O', 'TOTAL 6.79'],  # OCR noise in the repeated line
+    ]
+    assert stitch_lines(strips) == ['FRESH MART', 'MILK 2.49', 'BREAD 1.20', 'CHEDDAR CHEESE 3.10', 'TOTAL 6.79']
+
+
+def test_new_lines_at_a_strip_top_are_kept():
+    strips = [['MILK 2.49', 'BREAD 1.20'], ['APPLES 0.99', 'BREAD 1.20'], [], ['TOTAL 4.68']]
+    assert stitch_lines(strips) == ['MILK 2.49', 'BREAD 1.20', 'APPLES 0.99', 'BREAD 1.20', 'TOTAL 4.68']
+
+
+def test_only_the_lookback_is_searched():
+    strips = [['MILK 2.49', 'BREAD 1.20', 'EGGS 3.10', 'TEA 1.50'], ['MILK 2.49', 'TOTAL 8.29']]
+    assert stitch_lines(strips, lookback=3)[-2:] == ['MILK 2.49', 'TOTAL 8.29']
+    assert stitch_lines(strips, lookback=4)[-2:] == ['TEA 1.50', 'TOTAL 8.29']
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Checks for reading line-item tables from OCR word boxes."""
+
+from app.ocr_result import OcrResult, OcrWord
+from app.table_extraction import DESCRIPTION, LINE_TOTAL, QTY, UNIT, UNIT_PRICE, extract_table
+
+CHAR_WIDTH = 10
+LINE_HEIGHT = 20
+
+
+def make_result(lines):
+    """OcrResult from lines of (cell text, left) pairs; words in a cell are one space apart."""
+    words = []
+    for line_num, cells in enumerate(lines, 1):
+        for text, left in cells:
+            for word in text.split():
+                words.append(OcrWord(word, 95.0, left, line_num * 30, len(word) * CHAR_WIDTH, LINE_HEIGHT,
+                                     (1, 1, 1, line_num)))
+                left += (len(word) + 1) * CHAR_WIDTH
+    return OcrResult(words)
+
+
+def test_invoice_table_with_wrapped_description_and_totals():
+    result = make_result([
+        [('ACME Supplies Ltd', 20)],
+        [('Qty', 20), ('Description', 100), ('Unit Price', 500), ('Amount', 650)],
+        [('2', 20), ('Printer paper A4', 100), ('$4.50', 500), ('$9.00', 650)],
+        [('1', 20), ('Toner cartridge', 100), ('$60.00', 500), ('$60.00', 650)],
+        [('black, high yield', 100)],
+        [('Subtotal', 500), ('$69.00', 650)],
+        [('Total', 500), ('$69.00', 650)],
+    ])
+    table = extract_table(result, 800)
+    assert table is not None
+    assert [c.role for c in table.columns] == [QTY, DESCRIPTION, UNIT_PRICE, LINE_TOTAL]
+    assert [row.description for row in table.rows] == [
+        'Printer paper A4', 'Toner cartridge black, high yield']
+    assert [(row.qty, row.unit_price, row.line_total) for row in table.rows] == [(2, 4.5, 9.0), (1, 60.0, 60.0)]
+    assert table.totals == {'subtotal': 69.0, 'total': 69.0}
+
+
+def test_header_column_empty_in_body_does_not_shift_roles():
+    # The Unit column is blank on every row, so no body column sits below its header
+    result = make_result([
+        [('Qty', 20), ('Description', 100), ('Unit', 400), ('Price', 500), ('Amount', 620)],
+        [('2', 20), ('Widget', 100), ('$5.00', 500), ('$10.00', 620)],
+        [('3', 20), ('Gadget', 100), ('$1.00', 500), ('$3.00', 620)],
+    ])
+    table = extract_table(result, 800)
+    assert table is not None
+    assert [c.role for c in table.columns] == [QTY, DESCRIPTION, UNIT_PRICE, LINE_TOTAL]
+    assert UNIT not in [c.role for c in table.columns]
+    first = table.rows[0]
+    assert (first.description, first.qty, first.unit, first.unit_price, first.line_total) == \
+        ('Widget', 2, None, 5.0, 10.0)
+
+    from app.parsers.invoice import InvoiceParser
+    items = InvoiceParser()._table_items(table)
+    assert [(item['name'].lower(), item['unit'], item['price']) for item in items] == [
+        ('widget', 'item', 10.0), ('gadget', 'item', 3.0)]
+
+
+def test_utility_usage_with_units_and_no_header():
+    result = make_result([
+        [('Electricity', 20), ('350 kWh', 300), ('$52.50', 500)],
+        [('Gas', 20), ('40 therms', 300), ('$38.00', 500)],
+        [('Amount due', 20), ('$90.50', 500)],
+    ])
+    table = extract_table(result, 800)
+    assert table is not None
+    assert [(row.description, row.qty, row.unit, row.line_total) for row in table.rows] == [
+        ('Electricity', 350, 'kwh', 52.5), ('Gas', 40, 'therms', 38.0)]
+    assert table.totals == {'amount due': 90.5}
+
+
+def test_plain_text_has_no_table():
+    result = make_result([[('Thank you for shopping', 20)], [('See you soon', 20)]])
+    assert extract_table(result) is None
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_'):
+            check()
+            print(f"✅ {name}")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Train and evaluate the document-type model.
+
+The labelled corpus is either a directory with one subdirectory per
+document type holding OCR texts (corpus/grocery/0001.txt, ...) or a JSONL
+file of {"text": ..., "label": ...} records. Labels are document type
+names as in app/data/document_keywords.json; types added for a parser
+plugin are routed to the parser registered under the same name.
+
+    python train_document_model.py train corpus/ [--holdout 0.2] [--out app/data/document_model.npz]
+    python train_document_model.py eval corpus/ [--model app/data/document_model.npz]
+
+``train`` holds out a share of every type and prints the evaluation
+report for it before fitting the saved model on the whole corpus.
+``eval`` reports on a corpus with an existing model file: accuracy of the
+model, of the keyword classifier and of the two combined as in the app
+(keywords below the confidence threshold), per-type precision and recall,
+the confusion matrix and the time per document.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+from app.document_classifier import score_document
+from app.document_model import (DEFAULT_BITS, DEFAULT_NGRAMS, DOCUMENT_MODEL_MIN_CONFIDENCE,
+                                DOCUMENT_MODEL_PATH, DocumentTypeModel)
+
+
+def load_corpus(path):
+    """(texts, labels) from a directory of <label>/*.txt or a JSONL file."""
+    texts, labels = [], []
+    if os.path.isdir(path):
+        for label in sorted(os.listdir(path)):
+            folder = os.path.join(path, label)
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                with open(os.path.join(folder, name), encoding='utf-8', errors='replace') as f:
+                    texts.append(f.read())
+                labels.append(label)
+    else:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    texts.append(record['text'])
+                    labels.append(record['label'])
+    return texts, labels
+
+
+def split_corpus(texts, labels, holdout, seed=42):
+    """Stratified split: ``holdout`` of every type goes to the evaluation set."""
+    by_label = defaultdict(list)
+    for text, label in zip(texts, labels):
+        by_label[label].append(text)
+    rng = random.Random(seed)
+    train, test = ([], []), ([], [])
+    for label, group in sorted(by_label.items()):
+        rng.shuffle(group)
+        cut = int(round(len(group) * holdout))
+        for i, text in enumerate(group):
+            target = test if i < cut else train
+            target[0].append(text)
+            target[1].append(label)
+    return train, test
+
+
+def report(model, texts, labels, min_confidence):
+    """Print the evaluation report of ``model`` on a labelled corpus."""
+    start = time.perf_counter()
+    predictions = [model.predict(text) for text in texts]
+    per_document = (time.perf_counter() - start) / max(len(texts), 1)
+    keywords = [score_document(text.lower()).document_type for text in texts]
+
+    confident = [p.confidence >= min_confidence for p in predictions]
+    model_types = [p.document_type for p in predictions]
+    combined = [p.document_type if ok else k for p, ok, k in zip(predictions, confident, keywords)]
+
+    def accuracy(predicted):
+        return sum(p == t for p, t in zip(predicted, labels)) / max(len(labels), 1)
+
+    print(f"Documents:              {len(texts)}")
+    print(f"Model accuracy:         {accuracy(model_types):.1%}")
+    print(f"Keyword accuracy:       {accuracy(keywords):.1%}")
+    print(f"Combined accuracy:      {accuracy(combined):.1%}  "
+          f"(model used for {sum(confident) / max(len(texts), 1):.1%} at confidence >= {min_confidence})")
+    print(f"Model time per document: {per_document * 1e6:.0f} us")
+    print("-" * 60)
+
+    types = sorted(set(labels) | set(model_types))
+    print(f"{'type':<12} {'precision':>10} {'recall':>8} {'support':>8}")
+    for name in types:
+        predicted = sum(p == name for p in model_types)
+        actual = sum(t == name for t in labels)
+        correct = sum(p == t == name for p, t in zip(model_types, labels))
+        precision = correct / predicted if predicted else 0.0
+        recall = correct / actual if actual else 0.0
+        print(f"{name:<12} {precision:>10.1%} {recall:>8.1%} {actual:>8}")
+    print("-" * 60)
+
+    confusion = Counter(zip(labels, model_types))
+    print("Confusion (rows: label, columns: model)")
+    print(f"{'':<12}" + ''.join(f"{name[:9]:>10}" for name in types))
+    for actual in types:
+        print(f"{actual:<12}" + ''.join(f"{confusion[(actual, name)]:>10}" for name in types))
+
+
+def ngram_sizes(value: str) -> tuple:
+    """Parse ``--ngrams``: comma-separated sizes of at least 1."""
+    try:
+        sizes = tuple(int(n) for n in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {value!r}")
+    if min(sizes) < 1:
+        raise argparse.ArgumentTypeError(f"n-gram sizes must be at least 1, got {value!r}")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train = commands.add_parser('train', help="fit a model and save it")
+    train.add_argument('corpus')
+    train.add_argument('--out', default=DOCUMENT_MODEL_PATH)
+    train.add_argument('--holdout', type=float, default=0.2, help="share held out for the report (0 skips it)")
+    train.add_argument('--ngrams', type=ngram_sizes, default=DEFAULT_NGRAMS, help="character n-gram sizes")
+    train.add_argument('--bits', type=int, default=DEFAULT_BITS, help="log2 of the number of feature buckets")
+    train.add_argument('--alpha', type=float, default=0.1, help="additive smoothing")
+    train.add_argument('--min-confidence', type=float, default=DOCUMENT_MODEL_MIN_CONFIDENCE)
+
+    evaluate = commands.add_parser('eval', help="report on a corpus with a saved model")
+    evaluate.add_argument('corpus')
+    evaluate.add_argument('--model', default=DOCUMENT_MODEL_PATH)
+    evaluate.add_argument('--min-confidence', type=float, default=DOCUMENT_MODEL_MIN_CONFIDENCE)
+
+    args = parser.parse_args()
+    texts, labels = load_corpus(args.corpus)
+    if not texts:
+        print(f"❌ No labelled documents in {args.corpus}")
+        return 1
+
+    if args.command == 'eval':
+        report(DocumentTypeModel.load(args.model), texts, labels, args.min_confidence)
+        return 0
+
+    ngrams = args.ngrams
+    if args.holdout > 0:
+        (train_texts, train_labels), (test_texts, test_labels) = split_corpus(texts, labels, args.holdout)
+        if test_texts and train_texts:
+            print(f"Held-out evaluation ({args.holdout:.0%} of every type)")
+            print("=" * 60)
+            model = DocumentTypeModel.train(train_texts, train_labels, ngrams, args.bits, args.alpha)
+            report(model, test_texts, test_labels, args.min_confidence)
+            print()
+
+    model = DocumentTypeModel.train(texts, labels, ngrams, args.bits, args.alpha)
+    model.save(args.out)
+    print(f"✅ Trained on {len(texts)} documents ({', '.join(f'{k}: {v}' for k, v in sorted(Counter(labels).items()))})")
+    print(f"   Saved {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())